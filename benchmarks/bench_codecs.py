@@ -0,0 +1,125 @@
+"""
+Codec Benchmark
+
+Measures save time, load time and file size of each data file codec.
+
+Runs against the server data files in data/ when there are any, otherwise
+against a synthetic dataset shaped like billing and client data.
+
+Usage:
+    python benchmarks/bench_codecs.py
+    python benchmarks/bench_codecs.py --records 50000 --repeat 5
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.codecs import CODECS, decode
+from core.config import Config
+
+
+def synthetic_dataset(records: int) -> dict:
+    """Build a data store with invoices, clients and communications."""
+    rng = random.Random(42)
+    start = date(2024, 1, 1)
+    
+    clients = {
+        f"client-{i:06d}": {
+            "id": f"client-{i:06d}",
+            "name": f"Client {i}",
+            "email": f"contact{i}@example.com",
+            "company": f"Company {i} LLC",
+            "status": rng.choice(["active", "inactive", "prospect"]),
+            "health_score": rng.randint(40, 100),
+            "notes": "Prefers email. Quarterly check-ins.",
+            "created_at": "2024-01-01T09:00:00"
+        }
+        for i in range(max(records // 20, 1))
+    }
+    client_ids = list(clients)
+    
+    invoices = {}
+    for i in range(records):
+        issue_date = start + timedelta(days=rng.randint(0, 365))
+        line_items = [
+            {"description": f"Development work {n}", "quantity": rng.randint(1, 40), "rate": 150.0}
+            for n in range(rng.randint(1, 4))
+        ]
+        subtotal = sum(item["quantity"] * item["rate"] for item in line_items)
+        invoices[f"inv-{i:07d}"] = {
+            "id": f"inv-{i:07d}",
+            "invoice_number": f"INV-{i:07d}",
+            "client_id": rng.choice(client_ids),
+            "status": rng.choice(["draft", "sent", "paid", "overdue"]),
+            "issue_date": issue_date.isoformat(),
+            "due_date": (issue_date + timedelta(days=30)).isoformat(),
+            "line_items": line_items,
+            "subtotal": subtotal,
+            "tax_amount": round(subtotal * 0.08, 2),
+            "total": round(subtotal * 1.08, 2),
+            "paid_amount": 0.0,
+            "created_at": f"{issue_date.isoformat()}T10:00:00",
+            "updated_at": f"{issue_date.isoformat()}T10:00:00"
+        }
+    
+    communications = {
+        f"comm-{i:07d}": {
+            "id": f"comm-{i:07d}",
+            "client_id": rng.choice(client_ids),
+            "type": rng.choice(["email", "call", "meeting"]),
+            "subject": "Project update",
+            "notes": "Discussed milestones, next sprint scope and the open invoice.",
+            "timestamp": f"{(start + timedelta(days=rng.randint(0, 365))).isoformat()}T14:30:00"
+        }
+        for i in range(records // 2)
+    }
+    
+    return {"clients": clients, "invoices": invoices, "communications": communications}
+
+
+def time_median(func, repeat: int) -> float:
+    """Median wall time of func over repeat runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def benchmark(name: str, data: dict, repeat: int) -> None:
+    """Print save/load time and size of one dataset for every codec."""
+    print(f"\n{name}")
+    print(f"{'codec':<10} {'save ms':>10} {'load ms':>10} {'size KB':>10}")
+    
+    for codec_name, codec_cls in CODECS.items():
+        if not codec_cls.available():
+            print(f"{codec_name:<10} {'skipped':>10}   ({codec_cls.requires} not installed)")
+            continue
+        
+        codec = codec_cls()
+        encoded = codec.encode(data)
+        save_ms = time_median(lambda: codec.encode(data), repeat)
+        load_ms = time_median(lambda: decode(encoded), repeat)
+        print(f"{codec_name:<10} {save_ms:>10.1f} {load_ms:>10.1f} {len(encoded) / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark data file codecs")
+    parser.add_argument("--records", type=int, default=20000, help="Synthetic invoice count")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args()
+    
+    data_files = sorted(Config.DATA_DIR.glob("*_data.json"))
+    for path in data_files:
+        benchmark(path.name, decode(path.read_bytes()), args.repeat)
+    
+    if not data_files:
+        benchmark(f"synthetic ({args.records:,} invoices)", synthetic_dataset(args.records), args.repeat)
@@ -0,0 +1,98 @@
+"""
+Server Host Benchmark
+
+Compares running each MCP server in its own process with running all of
+them in one ServerHost process. Each setup is started, answers one read
+tool call per server over stdio, and reports wall time to the last
+answer and total resident memory (Linux /proc only).
+
+Usage:
+    python benchmarks/bench_host.py
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# One cheap read tool per server
+PROBES = {
+    "work": "list_tasks",
+    "client": "list_clients",
+    "billing": "list_invoices",
+    "llc_ops": "get_entity_info",
+    "onboarding": "list_onboarding_workflows",
+    "career": "get_skills_inventory",
+}
+
+# Points the servers at a scratch data directory, then serves
+BOOTSTRAP = """
+import sys
+from pathlib import Path
+from core.config import Config
+Config.DATA_DIR = Path(sys.argv[1])
+Config.LOG_FILE = Config.DATA_DIR / "app.log"
+from core.mcp.host import ServerHost
+ServerHost(sys.argv[2].split(",")).run()
+"""
+
+
+def rss_kb(pid: int) -> int:
+    """Resident set size of a process in KB, or 0 if unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def start(namespaces: list[str], data_dir: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-c", BOOTSTRAP, data_dir, ",".join(namespaces)],
+        cwd=ROOT,
+        env={"VAULT_PATH": str(Path(data_dir) / "vault"), "PATH": ""},
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True
+    )
+
+
+def call(process: subprocess.Popen, request_id: int, tool: str) -> dict:
+    request = {"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+               "params": {"name": tool, "arguments": {}}}
+    process.stdin.write(json.dumps(request) + "\n")
+    process.stdin.flush()
+    return json.loads(process.stdout.readline())
+
+
+def bench(name: str, groups: list[list[str]]) -> None:
+    """Start one process per group, probe every server, report time and RSS."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        start_time = time.perf_counter()
+        processes = [(start(group, data_dir), group) for group in groups]
+        errors = 0
+        for process, group in processes:
+            for i, namespace in enumerate(group):
+                response = call(process, i, f"{namespace}_{PROBES[namespace]}")
+                errors += response.get("result", {}).get("isError", True)
+        elapsed = time.perf_counter() - start_time
+        
+        rss = sum(rss_kb(process.pid) for process, _ in processes)
+        for process, _ in processes:
+            process.stdin.close()
+            process.wait()
+    
+    print(f"{name:<24} {len(groups)} process(es)   {elapsed * 1000:>8.0f} ms   {rss / 1024:>8.1f} MB RSS   errors={errors}")
+
+
+if __name__ == "__main__":
+    bench("one process per server", [[namespace] for namespace in PROBES])
+    bench("single host", [list(PROBES)])
@@ -0,0 +1,97 @@
+"""
+ID Generator Benchmark
+
+Measures generate_id throughput and checks that IDs stay unique and
+ordered: within one process, across threads, and across processes.
+Finally creates records in bulk through a server inside one transaction,
+which used to fail on the second record created in the same second.
+
+Usage:
+    python benchmarks/bench_ids.py
+    python benchmarks/bench_ids.py --count 500000 --workers 8
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.config import Config
+from core.utils import generate_id
+
+
+def generate(count: int) -> list[str]:
+    """Generate count invoice IDs."""
+    return [generate_id("inv") for _ in range(count)]
+
+
+def report(name: str, ids: list[str], elapsed: float, ordered: bool = True) -> None:
+    """Print throughput, collisions and ordering of a batch of IDs."""
+    collisions = len(ids) - len(set(ids))
+    line = f"{name:<28} {len(ids) / elapsed:>12,.0f} ids/s   collisions={collisions}"
+    if ordered:
+        line += f"   sorted={ids == sorted(ids)}"
+    print(line)
+
+
+def bench_single(count: int) -> None:
+    start = time.perf_counter()
+    ids = generate(count)
+    report("single process", ids, time.perf_counter() - start)
+
+
+def bench_threads(count: int, workers: int) -> None:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        batches = list(pool.map(generate, [count // workers] * workers))
+    elapsed = time.perf_counter() - start
+    report(f"{workers} threads", [i for batch in batches for i in batch], elapsed, ordered=False)
+
+
+def bench_processes(count: int, workers: int) -> None:
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        batches = list(pool.map(generate, [count // workers] * workers))
+    elapsed = time.perf_counter() - start
+    report(f"{workers} processes", [i for batch in batches for i in batch], elapsed, ordered=False)
+
+
+def bench_records(count: int) -> None:
+    """Create count expenses through a server in one transaction."""
+    from core.mcp.base_server import BaseMCPServer
+    
+    class BenchServer(BaseMCPServer):
+        def get_info(self) -> dict:
+            return {"name": "bench-server", "tools": []}
+    
+    with tempfile.TemporaryDirectory() as data_dir:
+        Config.DATA_DIR = Path(data_dir)
+        server = BenchServer("bench")
+        
+        start = time.perf_counter()
+        failures = 0
+        with server.transaction():
+            for _ in range(count):
+                expense_id = generate_id("expense")
+                result = server._create_record("expenses", expense_id, {"amount": 1.0})
+                failures += "error" in result
+        elapsed = time.perf_counter() - start
+        
+        created = len(server._get_collection("expenses"))
+        print(f"{'create_record (1 txn)':<28} {count / elapsed:>12,.0f} records/s   created={created:,} failed={failures}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the ID generator")
+    parser.add_argument("--count", type=int, default=100000, help="IDs per benchmark")
+    parser.add_argument("--workers", type=int, default=4, help="Threads/processes")
+    args = parser.parse_args()
+    
+    bench_single(args.count)
+    bench_threads(args.count, args.workers)
+    bench_processes(args.count, args.workers)
+    bench_records(args.count)
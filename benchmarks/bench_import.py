@@ -0,0 +1,83 @@
+"""
+Import-Time Benchmark
+
+Runs each target in a fresh interpreter under ``python -X importtime``
+and reports the total import time, the wall time of the whole snippet
+(interpreter start included) and the slowest modules it pulled in.
+
+Usage:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --repeat 10 --top 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+TARGETS = {
+    "import core": "import core",
+    "import core.mcp": "import core.mcp",
+    "get_all_servers()": "import core.mcp; core.mcp.get_all_servers()",
+    "import core.mcp.host": "import core.mcp.host",
+    "import work_server": "import core.mcp.work_server",
+    "import billing_server": "import core.mcp.billing_server",
+}
+
+
+def importtime(code: str) -> tuple[float, float, dict[str, int]]:
+    """
+    Run code under -X importtime.
+    
+    Returns:
+        Wall time in ms, total import time in ms and cumulative import
+        time in us per module
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    
+    cumulative = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package", where
+        # nested imports are indented under the module importing them
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(us)
+        if not name[1:].startswith(" "):
+            total += int(us)
+    return elapsed, total / 1000, cumulative
+
+
+def bench(label: str, code: str, repeat: int, top: int) -> None:
+    runs = [importtime(code) for _ in range(repeat)]
+    wall = statistics.median(elapsed for elapsed, _, _ in runs)
+    imports = statistics.median(total for _, total, _ in runs)
+    modules = runs[-1][2]
+    
+    print(f"{label:<24} imports: {imports:>7.1f} ms   wall: {wall:>7.1f} ms   modules: {len(modules)}")
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:top]
+    for name, us in slowest:
+        print(f"    {us / 1000:>7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark package import time")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per target (median reported)")
+    parser.add_argument("--top", type=int, default=3, help="Slowest modules to list per target")
+    args = parser.parse_args()
+    
+    for label, code in TARGETS.items():
+        bench(label, code, args.repeat, args.top)
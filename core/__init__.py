@@ -7,22 +7,26 @@ Provides core functionality including:
 - MCP server infrastructure
 """
 
-from .config import Config
-from .utils import (
-    setup_logging,
-    load_json,
-    save_json,
-    format_date,
-    format_datetime,
-    format_currency,
-    generate_id,
-    get_quarter,
-    validate_email,
-    validate_phone,
-)
+import importlib
 
 __version__ = "0.1.0"
 
+# Public names, imported from their module on first access so that
+# importing a subpackage does not load configuration or utilities
+_LAZY_ATTRIBUTES = {
+    "Config": "config",
+    "setup_logging": "utils",
+    "load_json": "utils",
+    "save_json": "utils",
+    "format_date": "utils",
+    "format_datetime": "utils",
+    "format_currency": "utils",
+    "generate_id": "utils",
+    "get_quarter": "utils",
+    "validate_email": "utils",
+    "validate_phone": "utils",
+}
+
 __all__ = [
     "Config",
     "setup_logging",
@@ -36,3 +40,11 @@ __all__ = [
     "validate_email",
     "validate_phone",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,206 @@
+"""
+Serialization Codecs for Data Files
+
+Encodes and decodes the data files written by the storage engines:
+- json: indented JSON, the original format (readable and diff-friendly)
+- compact: JSON without whitespace
+- orjson: compact JSON encoded with orjson (optional dependency)
+- msgpack: binary MessagePack (optional dependency)
+
+JSON files are read with orjson when it is installed, whatever codec wrote
+them. Binary files start with a magic header, so the format of an existing
+file is detected on load and changing codecs needs no migration.
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Prefix of binary MessagePack data files; a JSON document never starts with NUL
+MSGPACK_MAGIC = b"\x00FDOS-MP\x01"
+
+
+def _loads_json(raw: bytes) -> Any:
+    """Parse JSON with the fastest available parser."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class Codec(ABC):
+    """Base class for data file codecs."""
+    
+    name = ""
+    requires: Optional[str] = None
+    
+    @classmethod
+    def available(cls) -> bool:
+        """Check whether the codec's optional dependency is installed."""
+        return True
+    
+    @abstractmethod
+    def encode(self, data: Any) -> bytes:
+        """
+        Serialize data for writing to a file.
+        
+        Args:
+            data: Data to serialize (unsupported types are written with str())
+        
+        Returns:
+            Encoded file contents
+        """
+        pass
+    
+    def decode(self, raw: bytes) -> Any:
+        """
+        Deserialize file contents.
+        
+        Args:
+            raw: File contents
+        
+        Returns:
+            Decoded data
+        """
+        return _loads_json(raw)
+
+
+class JSONCodec(Codec):
+    """Indented JSON, as written by the standard library."""
+    
+    name = "json"
+    
+    def __init__(self, indent: int = 2):
+        self.indent = indent
+    
+    def encode(self, data: Any) -> bytes:
+        return json.dumps(data, indent=self.indent, default=str).encode("utf-8")
+
+
+class CompactJSONCodec(Codec):
+    """JSON without insignificant whitespace."""
+    
+    name = "compact"
+    
+    def encode(self, data: Any) -> bytes:
+        return json.dumps(
+            data,
+            default=str,
+            ensure_ascii=False,
+            separators=(",", ":")
+        ).encode("utf-8")
+
+
+class OrjsonCodec(Codec):
+    """Compact JSON encoded with orjson."""
+    
+    name = "orjson"
+    requires = "orjson"
+    
+    @classmethod
+    def available(cls) -> bool:
+        return orjson is not None
+    
+    def encode(self, data: Any) -> bytes:
+        # Pass datetimes to default=str so output matches the stdlib codecs
+        return orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+
+
+class MsgpackCodec(Codec):
+    """Binary MessagePack with a magic header."""
+    
+    name = "msgpack"
+    requires = "msgpack"
+    
+    @classmethod
+    def available(cls) -> bool:
+        return msgpack is not None
+    
+    def encode(self, data: Any) -> bytes:
+        return MSGPACK_MAGIC + msgpack.packb(data, default=str, use_bin_type=True)
+    
+    def decode(self, raw: bytes) -> Any:
+        if msgpack is None:
+            raise ValueError("msgpack is not installed - cannot read binary data file")
+        return msgpack.unpackb(raw[len(MSGPACK_MAGIC):], raw=False, strict_map_key=False)
+
+
+CODECS = {
+    "json": JSONCodec,
+    "compact": CompactJSONCodec,
+    "orjson": OrjsonCodec,
+    "msgpack": MsgpackCodec,
+}
+
+
+def get_codec(name: str) -> Codec:
+    """
+    Create a codec by name.
+    
+    A codec whose optional dependency is missing falls back to compact JSON
+    with a warning, so a config meant for another machine still works.
+    
+    Args:
+        name: Codec name (see CODECS)
+    
+    Returns:
+        Codec instance
+    """
+    name = name.lower()
+    
+    if name not in CODECS:
+        raise ValueError(f"Unknown codec '{name}'. Must be one of: {', '.join(CODECS)}")
+    
+    codec_cls = CODECS[name]
+    if not codec_cls.available():
+        logger.warning("%s is not installed - using compact JSON instead of '%s'", codec_cls.requires, name)
+        return CompactJSONCodec()
+    
+    return codec_cls()
+
+
+def detect_codec(raw: bytes) -> Codec:
+    """
+    Pick the codec that can read some file contents.
+    
+    Args:
+        raw: File contents
+    
+    Returns:
+        Codec for the detected format
+    """
+    if raw.startswith(MSGPACK_MAGIC):
+        return MsgpackCodec()
+    return JSONCodec()
+
+
+def decode(raw: bytes) -> Any:
+    """
+    Decode file contents in whichever format they were written.
+    
+    Args:
+        raw: File contents
+    
+    Returns:
+        Decoded data
+    
+    Raises:
+        ValueError: If the contents are malformed or need a missing dependency
+    """
+    return detect_codec(raw).decode(raw)
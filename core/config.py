@@ -7,10 +7,26 @@ Handles environment variables, defaults, and validation for all MCP servers.
 import os
 from pathlib import Path
 from typing import Optional
-from dotenv import load_dotenv
+
+
+def _load_env_file() -> None:
+    """
+    Load the nearest .env file at or above this package into os.environ.
+    
+    Searches the same directories as python-dotenv's find_dotenv() but only
+    imports dotenv when there is a file to load.
+    """
+    here = Path(__file__).parent.absolute()
+    for directory in (here, *here.parents):
+        env_file = directory / ".env"
+        if env_file.is_file():
+            from dotenv import load_dotenv
+            load_dotenv(env_file)
+            return
+
 
 # Load environment variables from .env file
-load_dotenv()
+_load_env_file()
 
 
 class Config:
@@ -47,16 +63,61 @@ class Config:
     SMTP_PASSWORD: Optional[str] = os.getenv("SMTP_PASSWORD")
     EMAIL_FROM: Optional[str] = os.getenv("EMAIL_FROM")
     
+    # Storage
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "json")
+    # Per-server overrides, e.g. "billing=sqlite,client=journal"
+    STORAGE_BACKEND_OVERRIDES: dict[str, str] = {
+        name.strip(): backend.strip()
+        for name, _, backend in (
+            item.partition("=") for item in os.getenv("STORAGE_BACKEND_OVERRIDES", "").split(",")
+        )
+        if name.strip() and backend.strip()
+    }
+    JOURNAL_COMPACT_THRESHOLD: int = int(os.getenv("JOURNAL_COMPACT_THRESHOLD", "500"))
+    # Data file format: json, compact, orjson or msgpack
+    DATA_CODEC: str = os.getenv("DATA_CODEC", "json")
+    # When mutations reach storage: sync (before the tool returns), group
+    # (batched by a background thread every WRITE_BEHIND_INTERVAL_MS or
+    # WRITE_BEHIND_MAX_PENDING records) or deferred (at WRITE_BEHIND_MAX_PENDING
+    # records or exit); see core.storage.write_behind
+    WRITE_MODE: str = os.getenv("WRITE_MODE", "sync")
+    WRITE_BEHIND_INTERVAL_MS: float = float(os.getenv("WRITE_BEHIND_INTERVAL_MS", "100"))
+    WRITE_BEHIND_MAX_PENDING: int = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "100"))
+    
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE: Path = DATA_DIR / "app.log"
     
+    # Tool metrics: Prometheus text file, rewritten at most every METRICS_INTERVAL seconds
+    METRICS_FILE: Optional[str] = os.getenv("METRICS_FILE")
+    METRICS_INTERVAL: float = float(os.getenv("METRICS_INTERVAL", "15"))
+    
+    # Tool profiling (off by default): tools to always profile, as "tool" or
+    # "server.tool" separated by commas, and the percentage of other calls to sample
+    PROFILE_TOOLS: str = os.getenv("PROFILE_TOOLS", "")
+    PROFILE_SAMPLE_PERCENT: float = float(os.getenv("PROFILE_SAMPLE_PERCENT", "0"))
+    PROFILE_DIR: Optional[str] = os.getenv("PROFILE_DIR")  # default: DATA_DIR / "profiles"
+    PROFILE_MAX_MB: float = float(os.getenv("PROFILE_MAX_MB", "50"))
+    
     @classmethod
     def ensure_directories(cls) -> None:
         """Create necessary directories if they don't exist."""
         cls.DATA_DIR.mkdir(parents=True, exist_ok=True)
         Path(cls.VAULT_PATH).mkdir(parents=True, exist_ok=True)
     
+    @classmethod
+    def get_storage_backend(cls, server_name: str) -> str:
+        """
+        Get the storage backend for a server.
+        
+        Args:
+            server_name: Server name (e.g., 'billing', 'client')
+        
+        Returns:
+            Backend name from STORAGE_BACKEND_OVERRIDES, else STORAGE_BACKEND
+        """
+        return cls.STORAGE_BACKEND_OVERRIDES.get(server_name, cls.STORAGE_BACKEND)
+    
     @classmethod
     def validate(cls) -> dict[str, list[str]]:
         """
@@ -83,6 +144,25 @@ class Config:
         if not cls.LLC_STATE:
             warnings.append("LLC_STATE not set - needed for compliance tracking")
         
+        # Check storage configuration
+        from .storage import BACKENDS
+        if cls.STORAGE_BACKEND.lower() not in BACKENDS:
+            errors.append(f"Unknown STORAGE_BACKEND '{cls.STORAGE_BACKEND}'")
+        for server_name, backend in cls.STORAGE_BACKEND_OVERRIDES.items():
+            if backend.lower() not in BACKENDS:
+                errors.append(f"Unknown storage backend '{backend}' for server '{server_name}'")
+        
+        from .storage.write_behind import WRITE_MODES
+        if cls.WRITE_MODE.lower() not in WRITE_MODES:
+            errors.append(f"Unknown WRITE_MODE '{cls.WRITE_MODE}'")
+        
+        from .codecs import CODECS
+        codec_cls = CODECS.get(cls.DATA_CODEC.lower())
+        if codec_cls is None:
+            errors.append(f"Unknown DATA_CODEC '{cls.DATA_CODEC}'")
+        elif not codec_cls.available():
+            warnings.append(f"DATA_CODEC '{cls.DATA_CODEC}' needs {codec_cls.requires} - using compact JSON")
+        
         # Check email configuration
         if cls.SMTP_HOST and not cls.SMTP_USER:
             warnings.append("SMTP_HOST set but SMTP_USER missing")
@@ -103,10 +183,10 @@ class Config:
             "default_rate": cls.DEFAULT_HOURLY_RATE,
             "currency": cls.DEFAULT_CURRENCY,
             "tax_year": cls.TAX_YEAR,
+            "storage_backend": cls.STORAGE_BACKEND,
+            "storage_backend_overrides": dict(cls.STORAGE_BACKEND_OVERRIDES),
+            "data_codec": cls.DATA_CODEC,
+            "write_mode": cls.WRITE_MODE,
             "stripe_configured": bool(cls.STRIPE_API_KEY),
             "email_configured": bool(cls.SMTP_HOST and cls.SMTP_USER),
         }
-
-
-# Initialize directories on import
-Config.ensure_directories()
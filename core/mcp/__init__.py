@@ -9,18 +9,32 @@ Servers:
     - llc_ops_server: LLC operations dashboard
     - onboarding_server: Setup wizard
     - career_server: Career/skill tracking
+
+Server modules are imported on first use, so importing this package is
+cheap and does not load any data.
 """
 
-from .base_server import BaseMCPServer
-from .work_server import get_server_info as work_info
-from .client_server import ClientServer, get_server_info as client_info
-from .billing_server import BillingServer, get_server_info as billing_info
-from .llc_ops_server import LLCOpsServer, get_server_info as llc_ops_info
-from .onboarding_server import OnboardingServer, get_server_info as onboarding_info
-from .career_server import CareerServer, get_server_info as career_info
+import importlib
+from typing import Optional
 
 __version__ = "0.1.0"
 
+# Namespace -> (module, server class); the work server is module functions
+SERVERS: dict[str, tuple[str, Optional[str]]] = {
+    "work": ("work_server", None),
+    "client": ("client_server", "ClientServer"),
+    "billing": ("billing_server", "BillingServer"),
+    "llc_ops": ("llc_ops_server", "LLCOpsServer"),
+    "onboarding": ("onboarding_server", "OnboardingServer"),
+    "career": ("career_server", "CareerServer"),
+}
+
+# Public classes, imported from their module on first access
+_LAZY_CLASSES = {
+    "BaseMCPServer": "base_server",
+    **{class_name: module for module, class_name in SERVERS.values() if class_name},
+}
+
 __all__ = [
     "BaseMCPServer",
     "ClientServer",
@@ -30,13 +44,28 @@ __all__ = [
     "CareerServer",
 ]
 
+
+def __getattr__(name: str):
+    if name in _LAZY_CLASSES:
+        value = getattr(importlib.import_module(f".{_LAZY_CLASSES[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_server_module(namespace: str):
+    """
+    Import a server's module. Defines the server; does not start it.
+    
+    Args:
+        namespace: Key of SERVERS
+    
+    Returns:
+        The server module
+    """
+    return importlib.import_module(f".{SERVERS[namespace][0]}", __name__)
+
+
 def get_all_servers() -> dict:
-    """Get information about all available MCP servers."""
-    return {
-        "work": work_info(),
-        "client": client_info(),
-        "billing": billing_info(),
-        "llc_ops": llc_ops_info(),
-        "onboarding": onboarding_info(),
-        "career": career_info()
-    }
\ No newline at end of file
+    """Get information about all available MCP servers, without starting any."""
+    return {namespace: get_server_module(namespace).get_server_info() for namespace in SERVERS}
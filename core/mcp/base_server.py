@@ -2,26 +2,83 @@
 Base MCP Server Class
 
 Provides shared functionality for all MCP servers including:
-- JSON-based data persistence
+- Pluggable data persistence (JSON snapshot, journaled or SQLite)
 - Logging configuration
 - Error handling
 - Common utilities
 """
 
+import base64
+import functools
+import heapq
 import json
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime
+from collections.abc import Callable, Iterator, MutableMapping
 from pathlib import Path
 from typing import Any, Optional, Union
 
 from ..config import Config
-from ..utils import load_json, save_json, setup_logging
+from ..metrics import instrument, record_save, registry
+from ..storage import get_storage_engine
+from ..storage.base import LazyCollections
+from ..storage.write_behind import WriteBehindFlusher
+from ..storage.indexes import DateIndex, HashIndex, TextIndex, UniqueIndex, date_ordinal
+from ..utils import setup_logging
+
+
+def _serialized(method: Callable) -> Callable:
+    """Wrap a tool method so it runs under its server's call lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._call_lock:
+            return method(self, *args, **kwargs)
+    
+    return wrapper
 
 
 class BaseMCPServer(ABC):
     """Base class for all MCP servers with shared functionality."""
     
+    # Fields with equality indexes, per collection. Subclasses override,
+    # e.g. {"invoices": ("client_id", "status")}. Indexed and searched fields
+    # must only be changed through _update_record or by replacing the
+    # collection with _set_collection.
+    INDEXED_FIELDS: dict[str, tuple[str, ...]] = {}
+    
+    # ISO date fields with sorted range indexes, per collection, e.g.
+    # {"invoices": ("issue_date",)}. Used by the between= filter.
+    DATE_INDEXED_FIELDS: dict[str, tuple[str, ...]] = {}
+    
+    # Unique constraints per collection, as UniqueIndex arguments, e.g.
+    # {"clients": ({"fields": ("email",), "case_insensitive": True},)}.
+    # Enforced by _create_record and _update_record.
+    UNIQUE_CONSTRAINTS: dict[str, tuple[dict, ...]] = {}
+    
+    # Static metadata (name, version, description) and the names of the
+    # methods exposed as MCP tools, available without constructing the
+    # server through describe().
+    INFO: dict[str, str] = {}
+    TOOLS: tuple[str, ...] = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        """
+        Wrap the tool methods each server class defines.
+        
+        Every tool call is timed (see core.metrics) and holds the server's
+        call lock however it is reached (call_tool, the module functions,
+        direct method calls), so calls never interleave with each other or
+        with a write-behind flush.
+        """
+        super().__init_subclass__(**kwargs)
+        for name in cls.TOOLS:
+            if name in cls.__dict__:
+                setattr(cls, name, instrument(None, _serialized(cls.__dict__[name]), name))
+    
     def __init__(self, server_name: str, data_file: Optional[str] = None):
         """
         Initialize the base server.
@@ -45,36 +102,282 @@ class BaseMCPServer(ABC):
         Config.ensure_directories()
         
         # Initialize data storage
-        self._data: dict[str, Any] = {}
+        self._storage = get_storage_engine(
+            Config.get_storage_backend(server_name),
+            self.data_path
+        )
+        self._data: MutableMapping[str, Any] = {}
+        self._indexes: dict[str, dict[str, HashIndex]] = {}
+        self._text_indexes: dict[str, dict[tuple[str, ...], TextIndex]] = {}
+        self._date_indexes: dict[str, dict[str, DateIndex]] = {}
+        self._unique_indexes: dict[str, list[UniqueIndex]] = {}
         self._load_data()
         
-        self.logger.info(f"{server_name} server initialized")
+        # Changes buffered by an open transaction(), in first-touched order
+        self._transaction: Optional[dict[tuple[str, str], None]] = None
+        self._transaction_needs_full_save = False
+        
+        # Serializes counter allocation in _next_sequence
+        self._sequence_lock = threading.Lock()
+        
+        # Outcome of the latest storage engine write, for health_check
+        self._last_save: Optional[dict] = None
+        
+        # Write-behind: mutations buffered for the background flusher
+        self._pending_writes: dict[tuple[str, str], None] = {}
+        self._pending_full_save = False
+        self._flusher: Optional[WriteBehindFlusher] = None
+        write_mode = Config.WRITE_MODE.lower()
+        if write_mode != "sync":
+            self._flusher = WriteBehindFlusher(
+                server_name,
+                self.flush,
+                write_mode,
+                Config.WRITE_BEHIND_INTERVAL_MS,
+                Config.WRITE_BEHIND_MAX_PENDING
+            )
+        
+        # Serializes tool calls, batches and write-behind flushes
+        self._call_lock = threading.RLock()
+        
+        self.logger.info("%s server initialized", server_name)
     
     def _load_data(self) -> None:
-        """Load data from JSON file."""
+        """Load data from the storage engine."""
         try:
-            self._data = load_json(self.data_path, default={})
-            self.logger.debug(f"Loaded data from {self.data_path}")
+            self._data = self._storage.load()
+            self._indexes = {}
+            self._text_indexes = {}
+            self._date_indexes = {}
+            self._unique_indexes = {}
+            self.logger.debug("Loaded data from %s", self.data_path)
         except Exception as e:
-            self.logger.error(f"Failed to load data: {e}")
+            self.logger.error("Failed to load data: %s", e)
             self._data = {}
     
     def _save_data(self) -> bool:
         """
-        Save data to JSON file.
+        Save the full data store.
         
         Returns:
             True if successful, False otherwise
         """
+        if self._transaction is not None:
+            self._transaction_needs_full_save = True
+            return True
+        
+        if self._flusher is not None:
+            self._pending_full_save = True
+            self._flusher.notify(len(self._pending_writes) + 1)
+            return True
+        
         try:
-            success = save_json(self.data_path, self._data)
+            success = self._write_storage(self._storage.save, self._data)
             if success:
-                self.logger.debug(f"Saved data to {self.data_path}")
+                self.logger.debug("Saved data to %s", self.data_path)
             return success
         except Exception as e:
-            self.logger.error(f"Failed to save data: {e}")
+            self.logger.error("Failed to save data: %s", e)
             return False
     
+    def _save_record(self, collection_name: str, record_id: str) -> bool:
+        """
+        Persist a single created, updated or deleted record.
+        
+        Journaled storage appends just this record; snapshot storage falls
+        back to a full save.
+        
+        Args:
+            collection_name: Collection containing the record
+            record_id: Record identifier
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if self._transaction is not None:
+            self._transaction[(collection_name, record_id)] = None
+            return True
+        
+        if self._flusher is not None:
+            self._pending_writes[(collection_name, record_id)] = None
+            self._flusher.notify(len(self._pending_writes))
+            return True
+        
+        try:
+            return self._write_storage(self._storage.record_changed, self._data, collection_name, record_id)
+        except Exception as e:
+            self.logger.error("Failed to save %s record %s: %s", collection_name, record_id, e)
+            return False
+    
+    def _write_storage(self, write: Callable[..., bool], *args) -> bool:
+        """
+        Run a storage engine write, counting it and timing it for health_check.
+        
+        Args:
+            write: Storage engine method
+            *args: Its arguments
+        
+        Returns:
+            The write's result
+        """
+        record_save()
+        success = False
+        start = time.perf_counter()
+        try:
+            success = write(*args)
+            return success
+        finally:
+            self._last_save = {
+                "at": datetime.now().isoformat(),
+                "ms": round((time.perf_counter() - start) * 1000, 3),
+                "success": bool(success)
+            }
+    
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group several mutations into one atomic write.
+        
+        Inside the block, _save_record and _save_data only note what changed;
+        the storage engine is written once when the block exits. If the block
+        raises, nothing is written and in-memory data is reloaded from
+        storage, discarding the partial changes. Nested transactions join the
+        outermost one.
+        
+        In write-behind modes the committed changes join the buffered
+        mutations instead of being written at once. Mutations buffered
+        before the block are written when it starts, so a rollback cannot
+        discard them.
+        
+        Raises:
+            IOError: If the changes could not be written on commit
+        
+        Example:
+            with self.transaction():
+                self._create_record("payments", payment_id, payment)
+                self._update_record("invoices", invoice_id, {"status": "paid"})
+        """
+        if self._transaction is not None:
+            yield
+            return
+        
+        with self._call_lock:
+            if not self.flush():
+                raise IOError(f"Failed to write buffered changes to {self.data_path}")
+            
+            self._transaction = {}
+            self._transaction_needs_full_save = False
+            try:
+                yield
+            except BaseException:
+                self._transaction = None
+                self.logger.warning("Transaction rolled back")
+                self._load_data()
+                raise
+            
+            changes = list(self._transaction)
+            self._transaction = None
+            self._commit(changes)
+    
+    def _commit(self, changes: list[tuple[str, str]]) -> None:
+        """
+        Write the changes of a finished transaction.
+        
+        Args:
+            changes: (collection_name, record_id) pairs the transaction touched
+        
+        Raises:
+            IOError: If the changes could not be written
+        """
+        if self._flusher is not None:
+            self._pending_full_save |= self._transaction_needs_full_save
+            self._pending_writes.update(dict.fromkeys(changes))
+            if self._pending_full_save or self._pending_writes:
+                self._flusher.notify(len(self._pending_writes))
+            return
+        
+        if self._transaction_needs_full_save:
+            success = self._save_data()
+        elif changes:
+            try:
+                success = self._write_storage(self._storage.records_changed, self._data, changes)
+            except Exception as e:
+                self.logger.error("Failed to save transaction: %s", e)
+                success = False
+        else:
+            success = True
+        
+        if not success:
+            self._load_data()
+            raise IOError(f"Failed to commit transaction to {self.data_path}")
+    
+    def flush(self) -> bool:
+        """
+        Write mutations buffered by write-behind mode now.
+        
+        Waits for the running tool call (or batch) to finish, so the write
+        never sees half-applied changes. A failed write keeps the
+        mutations buffered for the next flush.
+        
+        Returns:
+            True if nothing was buffered or the write succeeded
+        """
+        with self._call_lock:
+            if self._transaction is not None or not (self._pending_writes or self._pending_full_save):
+                return True
+            
+            changes = list(self._pending_writes)
+            try:
+                if self._pending_full_save:
+                    success = self._write_storage(self._storage.save, self._data)
+                else:
+                    success = self._write_storage(self._storage.records_changed, self._data, changes)
+            except Exception as e:
+                self.logger.error("Failed to flush buffered changes: %s", e)
+                success = False
+            
+            if success:
+                self._pending_writes = {}
+                self._pending_full_save = False
+                self.logger.debug("Flushed %s buffered change(s) to %s", len(changes), self.data_path)
+            else:
+                self.logger.error("Failed to flush %s buffered change(s); will retry", len(changes))
+            return success
+    
+    def call_tool(self, name: str, arguments: dict) -> dict:
+        """
+        Run a tool method, one call at a time per server.
+        
+        Args:
+            name: Tool name (one of TOOLS)
+            arguments: Keyword arguments for the tool
+        
+        Returns:
+            The tool's result
+        
+        Raises:
+            KeyError: If the server has no such tool
+        """
+        if name not in self.TOOLS:
+            raise KeyError(f"Unknown tool: {name}")
+        with self._call_lock:
+            return getattr(self, name)(**arguments)
+    
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Run several tool calls against one consistent state and commit once.
+        
+        Holds the call lock, so no other call interleaves, inside a
+        transaction(), so all writes reach storage in a single commit when
+        the block exits.
+        
+        Raises:
+            IOError: If the changes could not be written on commit
+        """
+        with self._call_lock, self.transaction():
+            yield
+    
     def _get_collection(self, collection_name: str) -> dict:
         """
         Get a collection from data store.
@@ -98,6 +401,151 @@ class BaseMCPServer(ABC):
             data: Collection data
         """
         self._data[collection_name] = data
+        self._indexes.pop(collection_name, None)
+        self._text_indexes.pop(collection_name, None)
+        self._date_indexes.pop(collection_name, None)
+        self._unique_indexes.pop(collection_name, None)
+    
+    def _get_indexes(self, collection_name: str) -> dict[str, HashIndex]:
+        """
+        Get the equality indexes for a collection, building them on first use.
+        
+        Args:
+            collection_name: Name of the collection
+        
+        Returns:
+            Indexes keyed by field name (empty if none are declared)
+        """
+        fields = self.INDEXED_FIELDS.get(collection_name)
+        if not fields:
+            return {}
+        
+        indexes = self._indexes.get(collection_name)
+        if indexes is None:
+            collection = self._get_collection(collection_name)
+            indexes = {}
+            for field in fields:
+                index = HashIndex(field)
+                index.build(collection)
+                indexes[field] = index
+            self._indexes[collection_name] = indexes
+        
+        return indexes
+    
+    def _get_date_index(self, collection_name: str, field: str) -> Optional[DateIndex]:
+        """
+        Get the sorted date index for a field, building it on first use.
+        
+        Args:
+            collection_name: Name of the collection
+            field: Date field
+        
+        Returns:
+            Date index, or None if the field is not in DATE_INDEXED_FIELDS
+        """
+        if field not in self.DATE_INDEXED_FIELDS.get(collection_name, ()):
+            return None
+        
+        indexes = self._date_indexes.setdefault(collection_name, {})
+        index = indexes.get(field)
+        if index is None:
+            index = DateIndex(field)
+            index.build(self._get_collection(collection_name))
+            indexes[field] = index
+        
+        return index
+    
+    def _get_unique_indexes(self, collection_name: str) -> list[UniqueIndex]:
+        """
+        Get the unique constraint indexes for a collection, building them on first use.
+        
+        Args:
+            collection_name: Name of the collection
+        
+        Returns:
+            Indexes in declaration order (empty if none are declared)
+        """
+        constraints = self.UNIQUE_CONSTRAINTS.get(collection_name)
+        if not constraints:
+            return []
+        
+        indexes = self._unique_indexes.get(collection_name)
+        if indexes is None:
+            collection = self._get_collection(collection_name)
+            indexes = []
+            for constraint in constraints:
+                index = UniqueIndex(**constraint)
+                index.build(collection)
+                indexes.append(index)
+            self._unique_indexes[collection_name] = indexes
+        
+        return indexes
+    
+    def _unique_conflict(
+        self,
+        collection_name: str,
+        record: dict,
+        record_id: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Check a record against the collection's unique constraints.
+        
+        Args:
+            collection_name: Collection to check
+            record: Record, or just the constrained field values
+            record_id: ID of the record itself when updating
+        
+        Returns:
+            The first conflicting record, or None
+        """
+        for index in self._get_unique_indexes(collection_name):
+            owner = index.conflict(record, record_id)
+            if owner is not None:
+                return self._get_collection(collection_name)[owner]
+        return None
+    
+    def _index_record(
+        self,
+        collection_name: str,
+        record_id: str,
+        new_record: Optional[dict]
+    ) -> None:
+        """
+        Move a record between index buckets after a mutation.
+        
+        Every index remembers what it last recorded for each record, so the
+        record's previous values are not needed (callers may already have
+        changed it in place). Indexes that have not been built yet are left
+        alone; they will see the current state when they are built.
+        
+        Args:
+            collection_name: Collection containing the record
+            record_id: Record identifier
+            new_record: Record after the change (None if deleted)
+        """
+        for text_index in self._text_indexes.get(collection_name, {}).values():
+            if new_record is None:
+                text_index.remove(record_id)
+            else:
+                text_index.add(record_id, new_record)
+        
+        for unique_index in self._unique_indexes.get(collection_name, ()):
+            if new_record is None:
+                unique_index.discard(record_id)
+            else:
+                unique_index.add(record_id, new_record)
+        
+        for field, date_index in self._date_indexes.get(collection_name, {}).items():
+            if new_record is None:
+                date_index.discard(record_id)
+            else:
+                date_index.add(record_id, new_record.get(field))
+        
+        for field, index in self._indexes.get(collection_name, {}).items():
+            if new_record is None:
+                index.discard(record_id)
+            else:
+                index.add(record_id, new_record.get(field))
     
     def _create_record(
         self,
@@ -113,7 +561,7 @@ class BaseMCPServer(ABC):
             collection_name: Collection to add record to
             record_id: Unique record identifier
             data: Record data
-            validate: Whether to validate before saving
+            validate: Whether to enforce unique constraints
         
         Returns:
             Response dictionary with status and data
@@ -125,6 +573,13 @@ class BaseMCPServer(ABC):
                 "error": f"Record '{record_id}' already exists in {collection_name}"
             }
         
+        if validate:
+            duplicate = self._unique_conflict(collection_name, data)
+            if duplicate is not None:
+                return {
+                    "error": f"Record '{duplicate['id']}' in {collection_name} has the same unique fields"
+                }
+        
         # Add metadata
         record = {
             **data,
@@ -134,10 +589,10 @@ class BaseMCPServer(ABC):
         }
         
         collection[record_id] = record
-        self._set_collection(collection_name, collection)
+        self._index_record(collection_name, record_id, record)
         
-        if self._save_data():
-            self.logger.info(f"Created {collection_name} record: {record_id}")
+        if self._save_record(collection_name, record_id):
+            self.logger.info("Created %s record: %s", collection_name, record_id)
             return {
                 "success": True,
                 "id": record_id,
@@ -196,14 +651,22 @@ class BaseMCPServer(ABC):
             }
         
         record = collection[record_id]
+        
+        if self.UNIQUE_CONSTRAINTS.get(collection_name):
+            duplicate = self._unique_conflict(collection_name, {**record, **updates}, record_id)
+            if duplicate is not None:
+                return {
+                    "error": f"Record '{duplicate['id']}' in {collection_name} has the same unique fields"
+                }
+        
         record.update(updates)
         record["updated_at"] = datetime.now().isoformat()
         
         collection[record_id] = record
-        self._set_collection(collection_name, collection)
+        self._index_record(collection_name, record_id, record)
         
-        if self._save_data():
-            self.logger.info(f"Updated {collection_name} record: {record_id}")
+        if self._save_record(collection_name, record_id):
+            self.logger.info("Updated %s record: %s", collection_name, record_id)
             return {
                 "success": True,
                 "record": record
@@ -232,10 +695,10 @@ class BaseMCPServer(ABC):
             }
         
         deleted_record = collection.pop(record_id)
-        self._set_collection(collection_name, collection)
+        self._index_record(collection_name, record_id, None)
         
-        if self._save_data():
-            self.logger.info(f"Deleted {collection_name} record: {record_id}")
+        if self._save_record(collection_name, record_id):
+            self.logger.info("Deleted %s record: %s", collection_name, record_id)
             return {
                 "success": True,
                 "deleted": deleted_record
@@ -245,72 +708,393 @@ class BaseMCPServer(ABC):
                 "error": f"Failed to save after deleting {collection_name} record"
             }
     
+    def _next_sequence(self, name: str, seed: Optional[Callable[[], int]] = None) -> int:
+        """
+        Allocate the next value of a named counter stored with the server data.
+        
+        Counters are records of the "sequences" collection, so allocating a
+        number is O(1) instead of a scan of the records that carry numbers.
+        Call it inside transaction() together with the write that uses the
+        value: if that write fails, the counter rolls back with it and the
+        sequence has no gaps.
+        
+        Args:
+            name: Counter name, e.g. "invoice-2024"
+            seed: Returns the last value already in use; called once, when
+                the counter does not exist yet
+        
+        Returns:
+            Next value, starting at 1
+        
+        Raises:
+            IOError: If the counter could not be saved
+        """
+        with self._sequence_lock:
+            sequences = self._get_collection("sequences")
+            counter = sequences.get(name)
+            value = (counter["value"] if counter else (seed() if seed else 0)) + 1
+            
+            now = datetime.now().isoformat()
+            sequences[name] = {
+                "id": name,
+                "value": value,
+                "created_at": counter["created_at"] if counter else now,
+                "updated_at": now
+            }
+            
+            if not self._save_record("sequences", name):
+                if counter:
+                    sequences[name] = counter
+                else:
+                    del sequences[name]
+                raise IOError(f"Failed to save sequence {name}")
+            
+            return value
+    
+    def _iter_records(
+        self,
+        collection_name: str,
+        filter_func: Optional[callable] = None,
+        where: Optional[dict] = None,
+        between: Optional[dict] = None
+    ) -> Iterator[dict]:
+        """
+        Lazily yield the records of a collection that match the filters.
+        
+        Args:
+            collection_name: Collection to iterate
+            filter_func: Optional function to filter records
+            where: Optional field equality filters; None values are ignored.
+                Fields listed in INDEXED_FIELDS are resolved through their
+                index instead of scanning the collection.
+            between: Optional inclusive date ranges, {field: (start, end)};
+                either bound may be None. Records without a valid date in
+                the field never match. Fields listed in DATE_INDEXED_FIELDS
+                are resolved with a binary search.
+        
+        Yields:
+            Matching records, in date order when narrowed by a date index
+            and collection order otherwise
+        
+        Raises:
+            ValueError: If a between bound is not a date
+        """
+        collection = self._get_collection(collection_name)
+        conditions = {
+            field: value for field, value in (where or {}).items()
+            if value is not None
+        }
+        
+        ranges = self._date_ranges(between)
+        
+        # Narrow candidates with the most selective indexed condition
+        candidate_ids = None
+        if conditions:
+            indexes = self._get_indexes(collection_name)
+            for field, value in conditions.items():
+                if field not in indexes:
+                    continue
+                ids = indexes[field].lookup(value)
+                if ids is not None and (candidate_ids is None or len(ids) < len(candidate_ids)):
+                    candidate_ids = ids
+        
+        for field in ranges:
+            date_index = self._get_date_index(collection_name, field)
+            if date_index is None:
+                continue
+            start, end = between[field]
+            if candidate_ids is None or date_index.count(start, end) < len(candidate_ids):
+                candidate_ids = date_index.range(start, end)
+        
+        if candidate_ids is None:
+            records = iter(collection.values())
+        else:
+            records = (collection[rid] for rid in candidate_ids if rid in collection)
+        
+        if conditions:
+            records = (
+                r for r in records
+                if all(r.get(field) == value for field, value in conditions.items())
+            )
+        
+        if ranges:
+            records = (r for r in records if self._in_ranges(r, ranges))
+        
+        if filter_func:
+            records = filter(filter_func, records)
+        
+        yield from records
+    
+    @staticmethod
+    def _date_ranges(between: Optional[dict]) -> dict[str, tuple[Optional[int], Optional[int]]]:
+        """
+        Convert between= date bounds to inclusive day-ordinal ranges.
+        
+        Args:
+            between: {field: (start, end)} with dates or ISO strings;
+                either bound may be None
+        
+        Returns:
+            {field: (start_ordinal, end_ordinal)}, skipping unbounded fields
+        
+        Raises:
+            ValueError: If a bound is not a date
+        """
+        ranges = {}
+        for field, (start, end) in (between or {}).items():
+            if start is None and end is None:
+                continue
+            start_ordinal = date_ordinal(start) if start is not None else None
+            end_ordinal = date_ordinal(end) if end is not None else None
+            if (start is not None and start_ordinal is None) or (end is not None and end_ordinal is None):
+                raise ValueError(f"Invalid date range for {field}: {start!r} to {end!r}")
+            ranges[field] = (start_ordinal, end_ordinal)
+        return ranges
+    
+    @staticmethod
+    def _in_ranges(record: dict, ranges: dict[str, tuple[Optional[int], Optional[int]]]) -> bool:
+        """Check a record's date fields against inclusive ordinal ranges."""
+        for field, (start, end) in ranges.items():
+            ordinal = date_ordinal(record.get(field))
+            if ordinal is None:
+                return False
+            if start is not None and ordinal < start:
+                return False
+            if end is not None and ordinal > end:
+                return False
+        return True
+    
+    @staticmethod
+    def _order_key(field: Optional[str], descending: bool) -> Callable[[dict], tuple]:
+        """
+        Build a total ordering key for listing records.
+        
+        Records are ordered by field, then by ID so that ties have a stable
+        order. Records without a value for field sort last either way.
+        
+        Args:
+            field: Field to order by (None orders by ID only)
+            descending: Whether the caller sorts in reverse
+        
+        Returns:
+            Function mapping a record to its sort key
+        """
+        if field is None:
+            return lambda r: (r.get("id", ""),)
+        if descending:
+            return lambda r: (r.get(field) is not None, r.get(field), r.get("id", ""))
+        return lambda r: (r.get(field) is None, r.get(field), r.get("id", ""))
+    
+    @staticmethod
+    def _encode_cursor(order_by: str, key: tuple) -> str:
+        """Encode the sort key of the last record on a page as a cursor."""
+        payload = json.dumps([order_by, list(key)], default=str, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+    
+    @staticmethod
+    def _decode_cursor(cursor: str, order_by: str) -> Optional[tuple]:
+        """Decode a cursor, or return None if it is malformed or for another ordering."""
+        try:
+            cursor_order, key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except (ValueError, TypeError):
+            return None
+        if cursor_order != order_by or not isinstance(key, list):
+            return None
+        return tuple(key)
+    
     def _list_records(
         self,
         collection_name: str,
         filter_func: Optional[callable] = None,
         sort_key: Optional[str] = None,
-        reverse: bool = False
+        reverse: bool = False,
+        where: Optional[dict] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        between: Optional[dict] = None
     ) -> dict:
         """
-        List records in a collection with optional filtering and sorting.
+        List records in a collection with optional filtering, sorting and paging.
+        
+        Without limit or cursor every matching record is returned. With
+        them, records come back in pages ordered by (field, id), and
+        next_cursor continues after the last record of the page. Cursors
+        stay valid while records are added or removed: no record is
+        skipped or repeated.
         
         Args:
             collection_name: Collection to list
             filter_func: Optional function to filter records
             sort_key: Optional key to sort by
             reverse: Reverse sort order
+            where: Optional field equality filters; None values are ignored.
+                Fields listed in INDEXED_FIELDS are resolved through their
+                index instead of scanning the collection.
+            limit: Maximum records to return
+            cursor: next_cursor from the previous page
+            order_by: Field to order by, prefixed with "-" for descending;
+                overrides sort_key and reverse
+            between: Optional inclusive date ranges, {field: (start, end)}
+                (see _iter_records)
         
         Returns:
-            List of records
+            List of records, plus next_cursor when paging
         """
-        collection = self._get_collection(collection_name)
-        records = list(collection.values())
+        if order_by:
+            sort_key = order_by.lstrip("-")
+            reverse = order_by.startswith("-")
         
-        # Apply filter
-        if filter_func:
-            records = [r for r in records if filter_func(r)]
+        try:
+            self._date_ranges(between)
+        except ValueError as e:
+            return {"error": str(e)}
         
-        # Apply sort
-        if sort_key:
-            try:
-                records.sort(key=lambda r: r.get(sort_key, ""), reverse=reverse)
-            except Exception as e:
-                self.logger.warning(f"Failed to sort by {sort_key}: {e}")
+        records = self._iter_records(collection_name, filter_func, where, between)
+        
+        if limit is None and cursor is None:
+            records = list(records)
+            if sort_key:
+                try:
+                    records.sort(key=self._order_key(sort_key, reverse), reverse=reverse)
+                except Exception as e:
+                    self.logger.warning("Failed to sort by %s: %s", sort_key, e)
+            
+            return {
+                "success": True,
+                "records": records,
+                "count": len(records)
+            }
+        
+        if limit is not None and limit < 1:
+            return {"error": "limit must be a positive integer"}
+        
+        ordering = ("-" if reverse else "") + (sort_key or "id")
+        key = self._order_key(sort_key, reverse)
+        
+        if cursor is not None:
+            after = self._decode_cursor(cursor, ordering)
+            if after is None:
+                return {"error": f"Invalid cursor for ordering '{ordering}'"}
+            if reverse:
+                records = (r for r in records if key(r) < after)
+            else:
+                records = (r for r in records if key(r) > after)
+        
+        # Fetch one extra record to learn whether another page exists
+        try:
+            if limit is None:
+                page = sorted(records, key=key, reverse=reverse)
+            elif reverse:
+                page = heapq.nlargest(limit + 1, records, key=key)
+            else:
+                page = heapq.nsmallest(limit + 1, records, key=key)
+        except TypeError as e:
+            return {"error": f"Cannot order {collection_name} by {sort_key}: {e}"}
+        
+        next_cursor = None
+        if limit is not None and len(page) > limit:
+            page = page[:limit]
+            next_cursor = self._encode_cursor(ordering, key(page[-1]))
         
         return {
             "success": True,
-            "records": records,
-            "count": len(records)
+            "records": page,
+            "count": len(page),
+            "next_cursor": next_cursor
         }
     
+    def _top_records(
+        self,
+        collection_name: str,
+        limit: int,
+        order_by: str,
+        filter_func: Optional[callable] = None,
+        where: Optional[dict] = None,
+        between: Optional[dict] = None
+    ) -> list[dict]:
+        """
+        Get the first records of an ordering, e.g. the 10 most recent.
+        
+        Uses a bounded heap instead of sorting the collection, so "recent N"
+        queries cost O(n log k) rather than O(n log n).
+        
+        Args:
+            collection_name: Collection to select from
+            limit: Number of records to return
+            order_by: Field to order by, prefixed with "-" for descending
+            filter_func: Optional function to filter records
+            where: Optional field equality filters (see _list_records)
+            between: Optional inclusive date ranges (see _list_records)
+        
+        Returns:
+            Up to limit records in order
+        """
+        result = self._list_records(
+            collection_name,
+            filter_func,
+            where=where,
+            limit=limit,
+            order_by=order_by,
+            between=between
+        )
+        return result.get("records", [])
+    
+    def _get_text_index(self, collection_name: str, search_fields: list[str]) -> TextIndex:
+        """
+        Get the full-text index for a collection's fields, building it on first use.
+        
+        Once built, the index is kept up to date by record mutations for the
+        life of the server.
+        
+        Args:
+            collection_name: Name of the collection
+            search_fields: Fields covered by the index
+        
+        Returns:
+            Text index
+        """
+        fields = tuple(search_fields)
+        indexes = self._text_indexes.setdefault(collection_name, {})
+        
+        index = indexes.get(fields)
+        if index is None:
+            index = TextIndex(fields)
+            index.build(self._get_collection(collection_name))
+            indexes[fields] = index
+        
+        return index
+    
     def _search_records(
         self,
         collection_name: str,
         search_fields: list[str],
-        query: str
+        query: str,
+        limit: Optional[int] = None
     ) -> dict:
         """
         Search records in a collection.
         
+        Matches whole words and word prefixes ("acme" finds "Acme Corp",
+        "dev" finds "developer"); every word of the query must match. Results
+        are ranked by relevance. An empty query matches every record.
+        
         Args:
             collection_name: Collection to search
             search_fields: Fields to search in
             query: Search query
+            limit: Maximum records to return
         
         Returns:
-            Matching records
+            Matching records, best match first
         """
         collection = self._get_collection(collection_name)
-        query_lower = query.lower()
         
-        matches = []
-        for record in collection.values():
-            for field in search_fields:
-                field_value = str(record.get(field, "")).lower()
-                if query_lower in field_value:
-                    matches.append(record)
-                    break
+        if query.strip():
+            record_ids = self._get_text_index(collection_name, search_fields).search(query, limit)
+            matches = [collection[record_id] for record_id in record_ids]
+        else:
+            matches = list(collection.values())[:limit]
         
         return {
             "success": True,
@@ -321,22 +1105,76 @@ class BaseMCPServer(ABC):
     
     def get_stats(self) -> dict:
         """
-        Get statistics about the data store.
+        Get statistics about the data store and per-tool call metrics.
         
         Returns:
-            Statistics dictionary
+            Statistics dictionary; "tools" holds call counts, latency
+            percentiles, bytes read/written and saves per tool
         """
         stats = {
             "server": self.server_name,
             "data_file": str(self.data_path),
-            "collections": {}
+            "collections": self._collection_counts(),
+            "tools": registry.snapshot(self.server_name)
         }
         
-        for collection_name, collection in self._data.items():
+        return stats
+    
+    def _collection_counts(self) -> dict[str, int]:
+        """Records per collection; collections not loaded yet are counted by the storage engine."""
+        counts = {}
+        for collection_name in list(self._data):
+            if isinstance(self._data, LazyCollections) and not self._data.is_loaded(collection_name):
+                counts[collection_name] = self._storage.count_records(collection_name)
+                continue
+            collection = self._data.get(collection_name)
             if isinstance(collection, dict):
-                stats["collections"][collection_name] = len(collection)
+                counts[collection_name] = len(collection)
+        return counts
+    
+    def _storage_file_stats(self) -> dict:
+        """Total size and latest modification time of the storage engine's files."""
+        size = 0
+        modified = None
+        for path in self._storage.files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            size += stat.st_size
+            modified = max(modified or stat.st_mtime, stat.st_mtime)
+        return {
+            "size_bytes": size,
+            "modified": datetime.fromtimestamp(modified).isoformat() if modified else None
+        }
+    
+    def _check_writable(self) -> float:
+        """
+        Write and remove a small sentinel file next to the data file.
         
-        return stats
+        Returns:
+            Milliseconds the round trip took
+        
+        Raises:
+            OSError: If the data directory is not writable
+        """
+        sentinel = self.data_path.with_name(f".{self.server_name}.health")
+        start = time.perf_counter()
+        try:
+            sentinel.write_bytes(datetime.now().isoformat().encode())
+        finally:
+            sentinel.unlink(missing_ok=True)
+        return round((time.perf_counter() - start) * 1000, 3)
+    
+    @classmethod
+    def describe(cls) -> dict:
+        """
+        Get the server's static metadata without constructing it.
+        
+        Returns:
+            INFO plus the tool names
+        """
+        return {**cls.INFO, "tools": list(cls.TOOLS)}
     
     @abstractmethod
     def get_info(self) -> dict:
@@ -351,19 +1189,27 @@ class BaseMCPServer(ABC):
     
     def health_check(self) -> dict:
         """
-        Check server health.
+        Check server health without writing the data store.
+        
+        Writability is tested with a sentinel file next to the data file.
+        The report also includes record counts, the size and modification
+        time of the storage files, and the outcome of the last save.
         
         Returns:
             Health status
         """
         try:
-            # Test data persistence
-            test_write = self._save_data()
+            write_ms = self._check_writable()
+            last_save = self._last_save
             
             return {
-                "healthy": test_write,
+                "healthy": last_save is None or last_save["success"],
                 "server": self.server_name,
                 "data_file": str(self.data_path),
+                "storage": self._storage_file_stats(),
+                "collections": self._collection_counts(),
+                "last_save": last_save,
+                "write_check_ms": write_ms,
                 "timestamp": datetime.now().isoformat()
             }
         except Exception as e:
@@ -12,7 +12,7 @@ Features:
 
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import Optional, List
+from typing import Iterable, List, Optional
 from ..config import Config
 from ..utils import (
     generate_id,
@@ -22,12 +22,44 @@ from ..utils import (
     get_quarter,
     get_quarter_dates
 )
+from ..storage.indexes import date_ordinal
 from .base_server import BaseMCPServer
 
 
 class BillingServer(BaseMCPServer):
     """Billing and payment management server with Stripe integration."""
     
+    INDEXED_FIELDS = {
+        "invoices": ("client_id", "status"),
+        "expenses": ("category",),
+        "payments": ("invoice_id",)
+    }
+    
+    DATE_INDEXED_FIELDS = {
+        "invoices": ("issue_date",),
+        "expenses": ("expense_date",)
+    }
+    
+    INFO = {
+        "name": "billing-server",
+        "version": "0.1.0",
+        "description": "Billing and Stripe integration MCP server"
+    }
+    
+    TOOLS = (
+        "create_invoice",
+        "get_invoice",
+        "update_invoice_status",
+        "list_invoices",
+        "record_payment",
+        "create_expense",
+        "list_expenses",
+        "get_revenue_report",
+        "get_profit_margin",
+        "send_payment_reminder",
+        "get_overdue_invoices"
+    )
+    
     def __init__(self):
         super().__init__("billing")
         
@@ -55,25 +87,7 @@ class BillingServer(BaseMCPServer):
     
     def get_info(self) -> dict:
         """Return server metadata."""
-        return {
-            "name": "billing-server",
-            "version": "0.1.0",
-            "description": "Billing and Stripe integration MCP server",
-            "stripe_enabled": self._stripe_enabled,
-            "tools": [
-                "create_invoice",
-                "get_invoice",
-                "update_invoice_status",
-                "list_invoices",
-                "record_payment",
-                "create_expense",
-                "list_expenses",
-                "get_revenue_report",
-                "get_profit_margin",
-                "send_payment_reminder",
-                "get_overdue_invoices"
-            ]
-        }
+        return {**self.describe(), "stripe_enabled": self._stripe_enabled}
     
     def create_invoice(
         self,
@@ -109,7 +123,6 @@ class BillingServer(BaseMCPServer):
         
         # Generate invoice ID
         invoice_id = generate_id("inv")
-        invoice_number = self._generate_invoice_number()
         
         # Calculate line items and totals
         line_items = []
@@ -136,7 +149,6 @@ class BillingServer(BaseMCPServer):
         total = round_currency(subtotal + tax_amount - discount_amount)
         
         invoice_data = {
-            "invoice_number": invoice_number,
             "client_id": client_id,
             "client_name": client_name,
             "line_items": line_items,
@@ -157,10 +169,24 @@ class BillingServer(BaseMCPServer):
             "last_reminder": None
         }
         
-        result = self._create_record("invoices", invoice_id, invoice_data)
+        # Allocate the number in the same commit as the invoice, so a failed
+        # write cannot leave a gap in the sequence; raising rolls back the
+        # counter when the invoice is not created
+        try:
+            with self.transaction():
+                invoice_number = self._generate_invoice_number()
+                result = self._create_record(
+                    "invoices",
+                    invoice_id,
+                    {"invoice_number": invoice_number, **invoice_data}
+                )
+                if not result.get("success"):
+                    raise ValueError(result.get("error", "Failed to create invoice"))
+        except (IOError, ValueError) as e:
+            return {"error": str(e)}
         
         if result.get("success"):
-            self.logger.info(f"Created invoice {invoice_number} for {client_name}: {format_currency(total)}")
+            self.logger.info("Created invoice %s for %s: %s", invoice_number, client_name, format_currency(total))
             return {
                 "invoice_id": invoice_id,
                 "invoice_number": invoice_number,
@@ -172,14 +198,18 @@ class BillingServer(BaseMCPServer):
         return result
     
     def _generate_invoice_number(self) -> str:
-        """Generate sequential invoice number."""
+        """Allocate the next sequential invoice number (YYYY-NNNN) from the yearly counter."""
+        year_prefix = str(date.today().year)
+        number = self._next_sequence(
+            f"invoice-{year_prefix}",
+            seed=lambda: self._highest_invoice_number(year_prefix)
+        )
+        return f"{year_prefix}-{number:04d}"
+    
+    def _highest_invoice_number(self, year_prefix: str) -> int:
+        """Find the highest invoice number issued in a year, seeding its counter."""
         invoices = self._get_collection("invoices")
         
-        # Get current year
-        year = date.today().year
-        year_prefix = str(year)
-        
-        # Find highest number for this year
         highest = 0
         for inv in invoices.values():
             inv_num = inv.get("invoice_number", "")
@@ -190,8 +220,7 @@ class BillingServer(BaseMCPServer):
                 except (IndexError, ValueError):
                     continue
         
-        next_num = highest + 1
-        return f"{year_prefix}-{next_num:04d}"
+        return highest
     
     def get_invoice(self, invoice_id: str) -> dict:
         """
@@ -254,24 +283,27 @@ class BillingServer(BaseMCPServer):
         self,
         client_id: Optional[str] = None,
         status: Optional[str] = None,
-        overdue_only: bool = False
+        overdue_only: bool = False,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: str = "-issue_date"
     ) -> dict:
         """
-        List invoices with optional filters.
+        List invoices with optional filters, paged when limit or cursor is given.
         
         Args:
             client_id: Filter by client
             status: Filter by status
             overdue_only: Show only overdue invoices
+            limit: Maximum invoices per page (default None: all of them)
+            cursor: next_cursor from the previous page
+            order_by: Field to order by, "-" prefix for descending
         
         Returns:
-            List of invoices with summary
+            Page of invoices, next_cursor, and a summary of all matching
+            invoices on the first page
         """
         def filter_func(invoice: dict) -> bool:
-            if client_id and invoice.get("client_id") != client_id:
-                return False
-            if status and invoice.get("status") != status:
-                return False
             if overdue_only:
                 due_date_str = invoice.get("due_date")
                 if due_date_str and invoice.get("status") not in ["paid", "cancelled"]:
@@ -285,41 +317,70 @@ class BillingServer(BaseMCPServer):
                     return False
             return True
         
-        result = self._list_records("invoices", filter_func, sort_key="issue_date", reverse=True)
+        where = {"client_id": client_id, "status": status}
+        result = self._list_records(
+            "invoices",
+            filter_func,
+            where=where,
+            limit=limit,
+            cursor=cursor,
+            order_by=order_by
+        )
         
         if result.get("success"):
-            invoices = result["records"]
-            
-            summary = {
-                "total_invoices": len(invoices),
-                "by_status": {},
-                "total_billed": 0.0,
-                "total_paid": 0.0,
-                "total_outstanding": 0.0
+            response = {
+                "invoices": result["records"],
+                "count": result["count"],
+                "next_cursor": result.get("next_cursor")
             }
             
-            for invoice in invoices:
-                # Status breakdown
-                inv_status = invoice.get("status", "unknown")
-                summary["by_status"][inv_status] = summary["by_status"].get(inv_status, 0) + 1
-                
-                # Financial totals
-                total = invoice.get("total", 0.0)
-                paid = invoice.get("paid_amount", 0.0)
-                
-                summary["total_billed"] += total
-                summary["total_paid"] += paid
-                
-                if inv_status not in ["paid", "cancelled"]:
-                    summary["total_outstanding"] += (total - paid)
+            # Summarize every matching invoice once, on the first page
+            if cursor is None:
+                response["summary"] = self._summarize_invoices(
+                    self._iter_records("invoices", filter_func, where)
+                )
             
-            return {
-                "invoices": invoices,
-                "summary": summary
-            }
+            return response
         
         return result
     
+    def _summarize_invoices(self, invoices: Iterable[dict]) -> dict:
+        """
+        Compute status counts and financial totals for invoices.
+        
+        Args:
+            invoices: Invoices to summarize
+        
+        Returns:
+            Invoice summary
+        """
+        summary = {
+            "total_invoices": 0,
+            "by_status": {},
+            "total_billed": 0.0,
+            "total_paid": 0.0,
+            "total_outstanding": 0.0
+        }
+        
+        for invoice in invoices:
+            summary["total_invoices"] += 1
+            
+            # Status breakdown
+            inv_status = invoice.get("status", "unknown")
+            summary["by_status"][inv_status] = summary["by_status"].get(inv_status, 0) + 1
+            
+            # Financial totals
+            total = invoice.get("total", 0.0)
+            paid = invoice.get("paid_amount", 0.0)
+            
+            summary["total_billed"] += total
+            summary["total_paid"] += paid
+            
+            if inv_status not in ["paid", "cancelled"]:
+                summary["total_outstanding"] += (total - paid)
+        
+        return summary
+    
     def record_payment(
         self,
         invoice_id: str,
@@ -366,32 +427,36 @@ class BillingServer(BaseMCPServer):
             "notes": notes
         }
         
-        payment_result = self._create_record("payments", payment_id, payment_data)
-        
-        if payment_result.get("success"):
-            # Update invoice
-            paid_amount = invoice.get("paid_amount", 0.0) + amount
-            total = invoice.get("total", 0.0)
-            
-            updates = {
-                "paid_amount": paid_amount,
-                "last_payment_date": payment_date
-            }
-            
-            if paid_amount >= total:
-                updates["status"] = "paid"
-                updates["paid_date"] = payment_date
-            
-            self._update_record("invoices", invoice_id, updates)
-            
-            return {
-                "payment_id": payment_id,
-                "status": "recorded",
-                "payment": payment_result["record"],
-                "invoice_status": updates.get("status", invoice.get("status"))
-            }
+        # Payment and invoice update are written together or not at all
+        try:
+            with self.transaction():
+                payment_result = self._create_record("payments", payment_id, payment_data)
+                if not payment_result.get("success"):
+                    return payment_result
+                
+                # Update invoice
+                paid_amount = invoice.get("paid_amount", 0.0) + amount
+                total = invoice.get("total", 0.0)
+                
+                updates = {
+                    "paid_amount": paid_amount,
+                    "last_payment_date": payment_date
+                }
+                
+                if paid_amount >= total:
+                    updates["status"] = "paid"
+                    updates["paid_date"] = payment_date
+                
+                self._update_record("invoices", invoice_id, updates)
+        except IOError as e:
+            return {"error": str(e)}
         
-        return payment_result
+        return {
+            "payment_id": payment_id,
+            "status": "recorded",
+            "payment": payment_result["record"],
+            "invoice_status": updates.get("status", invoice.get("status"))
+        }
     
     def create_expense(
         self,
@@ -473,7 +538,7 @@ class BillingServer(BaseMCPServer):
         result = self._create_record("expenses", expense_id, expense_data)
         
         if result.get("success"):
-            self.logger.info(f"Recorded expense: {description} - {format_currency(amount)}")
+            self.logger.info("Recorded expense: %s - %s", description, format_currency(amount))
             return {
                 "expense_id": expense_id,
                 "status": "recorded",
@@ -487,75 +552,90 @@ class BillingServer(BaseMCPServer):
         category: Optional[str] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        tax_year: Optional[int] = None
+        tax_year: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: str = "-expense_date"
     ) -> dict:
         """
-        List expenses with filters.
+        List expenses with filters, paged when limit or cursor is given.
         
         Args:
             category: Filter by category
             start_date: Filter by start date
             end_date: Filter by end date
             tax_year: Filter by tax year
+            limit: Maximum expenses per page (default None: all of them)
+            cursor: next_cursor from the previous page
+            order_by: Field to order by, "-" prefix for descending
         
         Returns:
-            List of expenses with totals
+            Page of expenses, next_cursor, and totals for all matching
+            expenses on the first page
         """
         def filter_func(expense: dict) -> bool:
-            if category and expense.get("category") != category:
-                return False
-            
-            exp_date = expense.get("expense_date")
-            if exp_date:
-                try:
-                    exp_date_obj = date.fromisoformat(exp_date)
-                    
-                    if start_date:
-                        start_obj = date.fromisoformat(start_date)
-                        if exp_date_obj < start_obj:
-                            return False
-                    
-                    if end_date:
-                        end_obj = date.fromisoformat(end_date)
-                        if exp_date_obj > end_obj:
-                            return False
-                except ValueError:
-                    pass
+            return not tax_year or expense.get("tax_year") == tax_year
+        
+        where = {"category": category}
+        between = {"expense_date": (start_date, end_date)}
+        result = self._list_records(
+            "expenses",
+            filter_func,
+            where=where,
+            limit=limit,
+            cursor=cursor,
+            order_by=order_by,
+            between=between
+        )
+        
+        if result.get("success"):
+            response = {
+                "expenses": result["records"],
+                "count": result["count"],
+                "next_cursor": result.get("next_cursor")
+            }
             
-            if tax_year and expense.get("tax_year") != tax_year:
-                return False
+            # Summarize every matching expense once, on the first page
+            if cursor is None:
+                response["summary"] = self._summarize_expenses(
+                    self._iter_records("expenses", filter_func, where, between)
+                )
             
-            return True
+            return response
+        
+        return result
+    
+    def _summarize_expenses(self, expenses: Iterable[dict]) -> dict:
+        """
+        Compute category breakdown and totals for expenses.
         
-        result = self._list_records("expenses", filter_func, sort_key="expense_date", reverse=True)
+        Args:
+            expenses: Expenses to summarize
         
-        if result.get("success"):
-            expenses = result["records"]
+        Returns:
+            Expense summary
+        """
+        summary = {
+            "total_expenses": 0,
+            "by_category": {},
+            "total_amount": 0.0,
+            "billable_expenses": 0.0
+        }
+        
+        for expense in expenses:
+            summary["total_expenses"] += 1
             
-            summary = {
-                "total_expenses": len(expenses),
-                "by_category": {},
-                "total_amount": 0.0,
-                "billable_expenses": 0.0
-            }
+            # Category breakdown
+            cat = expense.get("category", "unknown")
+            summary["by_category"][cat] = summary["by_category"].get(cat, 0.0) + expense.get("amount", 0.0)
             
-            for expense in expenses:
-                # Category breakdown
-                cat = expense.get("category", "unknown")
-                summary["by_category"][cat] = summary["by_category"].get(cat, 0.0) + expense.get("amount", 0.0)
-                
-                # Totals
-                summary["total_amount"] += expense.get("amount", 0.0)
-                
-                if expense.get("billable_to_client"):
-                    summary["billable_expenses"] += expense.get("amount", 0.0)
+            # Totals
+            summary["total_amount"] += expense.get("amount", 0.0)
             
-            return {
-                "expenses": expenses,
-                "summary": summary
-            }
+            if expense.get("billable_to_client"):
+                summary["billable_expenses"] += expense.get("amount", 0.0)
         
-        return result
+        return summary
     
     def get_revenue_report(
         self,
@@ -575,7 +655,6 @@ class BillingServer(BaseMCPServer):
             Revenue breakdown
         """
         today = date.today()
-        invoices = self._get_collection("invoices")
         
         # Determine date range
         if period == "current_month":
@@ -624,41 +703,38 @@ class BillingServer(BaseMCPServer):
         by_client = {}
         by_month = {}
         
-        for invoice in invoices.values():
-            issue_date_str = invoice.get("issue_date")
-            if not issue_date_str:
-                continue
-            
-            try:
-                issue_date_obj = date.fromisoformat(issue_date_str)
-            except ValueError:
-                continue
+        # The issue_date index yields only invoices inside the period
+        invoices = self._iter_records(
+            "invoices",
+            between={"issue_date": (start_date, end_date)}
+        )
+        
+        for invoice in invoices:
+            total = invoice.get("total", 0.0)
+            paid = invoice.get("paid_amount", 0.0)
+            status = invoice.get("status")
             
-            if start_date <= issue_date_obj <= end_date:
-                total = invoice.get("total", 0.0)
-                paid = invoice.get("paid_amount", 0.0)
-                status = invoice.get("status")
+            if status != "cancelled":
+                total_revenue += total
+                paid_revenue += paid
+                
+                if status not in ["paid", "cancelled"]:
+                    outstanding += (total - paid)
+                
+                invoice_count += 1
                 
-                if status != "cancelled":
-                    total_revenue += total
-                    paid_revenue += paid
-                    
-                    if status not in ["paid", "cancelled"]:
-                        outstanding += (total - paid)
-                    
-                    invoice_count += 1
-                    
-                    # By client
-                    client_name = invoice.get("client_name", "Unknown")
-                    if client_name not in by_client:
-                        by_client[client_name] = 0.0
-                    by_client[client_name] += total
-                    
-                    # By month
-                    month_key = issue_date_obj.strftime("%Y-%m")
-                    if month_key not in by_month:
-                        by_month[month_key] = 0.0
-                    by_month[month_key] += total
+                # By client
+                client_name = invoice.get("client_name", "Unknown")
+                if client_name not in by_client:
+                    by_client[client_name] = 0.0
+                by_client[client_name] += total
+                
+                # By month, from the parsed date: the period filter also
+                # accepts forms like 20240305 that cannot be sliced
+                month_key = date.fromordinal(date_ordinal(invoice["issue_date"])).strftime("%Y-%m")
+                if month_key not in by_month:
+                    by_month[month_key] = 0.0
+                by_month[month_key] += total
         
         return {
             "period": period,
@@ -748,7 +824,7 @@ class BillingServer(BaseMCPServer):
         self._update_record("invoices", invoice_id, updates)
         
         # Note: Actual email sending would integrate with SMTP here
-        self.logger.info(f"Payment reminder sent for invoice {invoice.get('invoice_number')}")
+        self.logger.info("Payment reminder sent for invoice %s", invoice.get('invoice_number'))
         
         return {
             "invoice_id": invoice_id,
@@ -764,7 +840,7 @@ class BillingServer(BaseMCPServer):
         Returns:
             Overdue invoices with aging
         """
-        result = self.list_invoices(overdue_only=True)
+        result = self.list_invoices(overdue_only=True, limit=None)
         
         if result.get("success"):
             invoices = result["invoices"]
@@ -866,8 +942,10 @@ def get_overdue_invoices() -> dict:
 
 
 def get_server_info() -> dict:
-    """Get server info."""
-    return _get_server().get_info()
+    """Get server info, without starting the server if it is not running yet."""
+    if _server_instance is None:
+        return BillingServer.describe()
+    return _server_instance.get_info()
 
 
 if __name__ == "__main__":
@@ -20,6 +20,42 @@ from .base_server import BaseMCPServer
 class CareerServer(BaseMCPServer):
     """Career development and professional growth tracking server."""
     
+    INDEXED_FIELDS = {
+        "skills": ("category",),
+        "learning_goals": ("status",),
+        "rate_history": ("type",),
+        "network_contacts": ("relationship",)
+    }
+    
+    UNIQUE_CONSTRAINTS = {
+        "skills": ({"fields": ("name",), "case_insensitive": True},)
+    }
+    
+    INFO = {
+        "name": "career-server",
+        "version": "0.1.0",
+        "description": "Career development and skills tracking MCP server"
+    }
+    
+    TOOLS = (
+        "add_skill",
+        "update_skill_level",
+        "get_skills_inventory",
+        "identify_skill_gaps",
+        "create_learning_goal",
+        "update_learning_progress",
+        "list_learning_goals",
+        "add_portfolio_project",
+        "get_portfolio",
+        "search_portfolio",
+        "record_rate_change",
+        "get_rate_history",
+        "add_network_contact",
+        "list_network_contacts",
+        "add_milestone",
+        "get_career_summary"
+    )
+    
     def __init__(self):
         super().__init__("career")
         
@@ -44,28 +80,7 @@ class CareerServer(BaseMCPServer):
     
     def get_info(self) -> dict:
         """Return server metadata."""
-        return {
-            "name": "career-server",
-            "version": "0.1.0",
-            "description": "Career development and skills tracking MCP server",
-            "tools": [
-                "add_skill",
-                "update_skill_level",
-                "get_skills_inventory",
-                "identify_skill_gaps",
-                "create_learning_goal",
-                "update_learning_progress",
-                "list_learning_goals",
-                "add_portfolio_project",
-                "get_portfolio",
-                "record_rate_change",
-                "get_rate_history",
-                "add_network_contact",
-                "list_network_contacts",
-                "add_milestone",
-                "get_career_summary"
-            ]
-        }
+        return self.describe()
     
     def add_skill(
         self,
@@ -108,10 +123,8 @@ class CareerServer(BaseMCPServer):
             }
         
         # Check for duplicate
-        skills = self._get_collection("skills")
-        for skill in skills.values():
-            if skill.get("name", "").lower() == skill_name.lower():
-                return {"error": f"Skill '{skill_name}' already exists"}
+        if self._unique_conflict("skills", {"name": skill_name}):
+            return {"error": f"Skill '{skill_name}' already exists"}
         
         skill_id = generate_id("skill", date_part=False)
         
@@ -201,13 +214,11 @@ class CareerServer(BaseMCPServer):
             Skills inventory with breakdown
         """
         def filter_func(skill: dict) -> bool:
-            if category and skill.get("category") != category:
-                return False
             if min_proficiency and skill.get("proficiency_level", 0) < min_proficiency:
                 return False
             return True
         
-        result = self._list_records("skills", filter_func)
+        result = self._list_records("skills", filter_func, where={"category": category})
         
         if result.get("success"):
             skills = result["records"]
@@ -411,12 +422,11 @@ class CareerServer(BaseMCPServer):
         Returns:
             List of learning goals
         """
-        def filter_func(goal: dict) -> bool:
-            if status and goal.get("status") != status:
-                return False
-            return True
-        
-        result = self._list_records("learning_goals", filter_func, sort_key="target_date")
+        result = self._list_records(
+            "learning_goals",
+            sort_key="target_date",
+            where={"status": status}
+        )
         
         if result.get("success"):
             goals = result["records"]
@@ -488,28 +498,31 @@ class CareerServer(BaseMCPServer):
             "views": 0
         }
         
-        result = self._create_record("portfolio_projects", project_id, project_data)
-        
-        if result.get("success"):
-            # Update skills used in projects
-            skills = self._get_collection("skills")
-            for skill_id, skill in skills.items():
-                skill_name = skill.get("name", "").lower()
-                if any(tech.lower() == skill_name for tech in technologies):
-                    projects_list = skill.get("projects_used_in", [])
-                    if project_id not in projects_list:
-                        projects_list.append(project_id)
-                        self._update_record("skills", skill_id, {
-                            "projects_used_in": projects_list
-                        })
-            
-            return {
-                "project_id": project_id,
-                "status": "added",
-                "project": result["record"]
-            }
+        # The project and every linked skill are written in one commit
+        try:
+            with self.transaction():
+                result = self._create_record("portfolio_projects", project_id, project_data)
+                if not result.get("success"):
+                    return result
+                
+                # Update skills used in projects
+                technology_names = {tech.lower() for tech in technologies}
+                skills = self._get_collection("skills")
+                for skill_id, skill in skills.items():
+                    if skill.get("name", "").lower() in technology_names:
+                        projects_list = skill.get("projects_used_in", [])
+                        if project_id not in projects_list:
+                            self._update_record("skills", skill_id, {
+                                "projects_used_in": projects_list + [project_id]
+                            })
+        except IOError as e:
+            return {"error": str(e)}
         
-        return result
+        return {
+            "project_id": project_id,
+            "status": "added",
+            "project": result["record"]
+        }
     
     def get_portfolio(
         self,
@@ -544,6 +557,33 @@ class CareerServer(BaseMCPServer):
         
         return result
     
+    def search_portfolio(self, query: str, limit: int = 20) -> dict:
+        """
+        Search portfolio projects by name, description, role, technologies or highlights.
+        
+        Args:
+            query: Words or word prefixes to search for
+            limit: Maximum projects to return
+        
+        Returns:
+            Matching projects, best match first
+        """
+        result = self._search_records(
+            "portfolio_projects",
+            ["name", "description", "role", "technologies", "highlights"],
+            query,
+            limit=limit
+        )
+        
+        if result.get("success"):
+            return {
+                "projects": result["records"],
+                "count": result["count"],
+                "query": query
+            }
+        
+        return result
+    
     def record_rate_change(
         self,
         rate_type: str,
@@ -603,16 +643,11 @@ class CareerServer(BaseMCPServer):
         Returns:
             Rate history with analysis
         """
-        def filter_func(rate: dict) -> bool:
-            if rate_type and rate.get("type") != rate_type:
-                return False
-            return True
-        
         result = self._list_records(
             "rate_history",
-            filter_func,
             sort_key="effective_date",
-            reverse=True
+            reverse=True,
+            where={"type": rate_type}
         )
         
         if result.get("success"):
@@ -692,43 +727,62 @@ class CareerServer(BaseMCPServer):
     def list_network_contacts(
         self,
         relationship: Optional[str] = None,
-        tag: Optional[str] = None
+        tag: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: str = "name"
     ) -> dict:
         """
-        List professional network contacts.
+        List professional network contacts, paged when limit or cursor is given.
         
         Args:
             relationship: Filter by relationship type
             tag: Filter by tag
+            limit: Maximum contacts per page (default None: all of them)
+            cursor: next_cursor from the previous page
+            order_by: Field to order by, "-" prefix for descending
         
         Returns:
-            Network contacts
+            Page of network contacts, next_cursor, and a summary of all
+            matching contacts on the first page
         """
         def filter_func(contact: dict) -> bool:
-            if relationship and contact.get("relationship") != relationship:
-                return False
             if tag and tag not in contact.get("tags", []):
                 return False
             return True
         
-        result = self._list_records("network_contacts", filter_func, sort_key="name")
+        where = {"relationship": relationship}
+        result = self._list_records(
+            "network_contacts",
+            filter_func,
+            where=where,
+            limit=limit,
+            cursor=cursor,
+            order_by=order_by
+        )
         
         if result.get("success"):
-            contacts = result["records"]
-            
-            summary = {
-                "total_contacts": len(contacts),
-                "by_relationship": {}
+            response = {
+                "contacts": result["records"],
+                "count": result["count"],
+                "next_cursor": result.get("next_cursor")
             }
             
-            for contact in contacts:
-                rel = contact.get("relationship", "unknown")
-                summary["by_relationship"][rel] = summary["by_relationship"].get(rel, 0) + 1
+            # Summarize every matching contact once, on the first page
+            if cursor is None:
+                summary = {
+                    "total_contacts": 0,
+                    "by_relationship": {}
+                }
+                
+                for contact in self._iter_records("network_contacts", filter_func, where):
+                    summary["total_contacts"] += 1
+                    rel = contact.get("relationship", "unknown")
+                    summary["by_relationship"][rel] = summary["by_relationship"].get(rel, 0) + 1
+                
+                response["summary"] = summary
             
-            return {
-                "contacts": contacts,
-                "summary": summary
-            }
+            return response
         
         return result
     
@@ -789,11 +843,7 @@ class CareerServer(BaseMCPServer):
         network_result = self.list_network_contacts()
         
         milestones = self._get_collection("milestones")
-        milestone_list = sorted(
-            milestones.values(),
-            key=lambda m: m.get("achieved_date", ""),
-            reverse=True
-        )
+        recent_milestones = self._top_records("milestones", 5, "-achieved_date")
         
         return {
             "skills": {
@@ -818,8 +868,8 @@ class CareerServer(BaseMCPServer):
                 "by_relationship": network_result.get("summary", {}).get("by_relationship", {})
             },
             "milestones": {
-                "total": len(milestone_list),
-                "recent": milestone_list[:5]
+                "total": len(milestones),
+                "recent": recent_milestones
             }
         }
 
@@ -880,6 +930,11 @@ def get_portfolio(**kwargs) -> dict:
     return _get_server().get_portfolio(**kwargs)
 
 
+def search_portfolio(**kwargs) -> dict:
+    """Search portfolio."""
+    return _get_server().search_portfolio(**kwargs)
+
+
 def record_rate_change(**kwargs) -> dict:
     """Record rate change."""
     return _get_server().record_rate_change(**kwargs)
@@ -911,8 +966,10 @@ def get_career_summary() -> dict:
 
 
 def get_server_info() -> dict:
-    """Get server info."""
-    return _get_server().get_info()
+    """Get server info, without starting the server if it is not running yet."""
+    if _server_instance is None:
+        return CareerServer.describe()
+    return _server_instance.get_info()
 
 
 if __name__ == "__main__":
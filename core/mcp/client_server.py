@@ -25,6 +25,37 @@ from .base_server import BaseMCPServer
 class ClientServer(BaseMCPServer):
     """Client relationship management server."""
     
+    INDEXED_FIELDS = {
+        "clients": ("status",),
+        "communications": ("client_id",),
+        "meetings": ("client_id",)
+    }
+    
+    UNIQUE_CONSTRAINTS = {
+        "clients": ({"fields": ("email",), "case_insensitive": True},)
+    }
+    
+    INFO = {
+        "name": "client-server",
+        "version": "0.1.0",
+        "description": "Client relationship management MCP server"
+    }
+    
+    TOOLS = (
+        "create_client",
+        "get_client",
+        "update_client",
+        "list_clients",
+        "search_clients",
+        "log_communication",
+        "get_communications",
+        "search_communications",
+        "schedule_meeting",
+        "log_meeting_notes",
+        "calculate_health_score",
+        "get_client_summary"
+    )
+    
     def __init__(self):
         super().__init__("client")
         
@@ -38,23 +69,7 @@ class ClientServer(BaseMCPServer):
     
     def get_info(self) -> dict:
         """Return server metadata."""
-        return {
-            "name": "client-server",
-            "version": "0.1.0",
-            "description": "Client relationship management MCP server",
-            "tools": [
-                "create_client",
-                "get_client",
-                "update_client",
-                "list_clients",
-                "log_communication",
-                "get_communications",
-                "schedule_meeting",
-                "log_meeting_notes",
-                "calculate_health_score",
-                "get_client_summary"
-            ]
-        }
+        return self.describe()
     
     def create_client(
         self,
@@ -92,10 +107,8 @@ class ClientServer(BaseMCPServer):
             return {"error": f"Invalid phone number: {phone}"}
         
         # Check for duplicate email
-        clients = self._get_collection("clients")
-        for client in clients.values():
-            if client.get("email", "").lower() == email.lower():
-                return {"error": f"Client with email '{email}' already exists"}
+        if self._unique_conflict("clients", {"email": email}):
+            return {"error": f"Client with email '{email}' already exists"}
         
         # Generate client ID
         client_id = generate_id("client")
@@ -124,7 +137,7 @@ class ClientServer(BaseMCPServer):
         result = self._create_record("clients", client_id, client_data)
         
         if result.get("success"):
-            self.logger.info(f"Created client: {name} ({client_id})")
+            self.logger.info("Created client: %s (%s)", name, client_id)
             return {
                 "client_id": client_id,
                 "status": "created",
@@ -169,6 +182,9 @@ class ClientServer(BaseMCPServer):
         if "email" in updates and not validate_email(updates["email"]):
             return {"error": f"Invalid email address: {updates['email']}"}
         
+        if "email" in updates and self._unique_conflict("clients", {"email": updates["email"]}, client_id):
+            return {"error": f"Client with email '{updates['email']}' already exists"}
+        
         # Validate phone if being updated
         if "phone" in updates and updates["phone"] and not validate_phone(updates["phone"]):
             return {"error": f"Invalid phone number: {updates['phone']}"}
@@ -202,15 +218,16 @@ class ClientServer(BaseMCPServer):
             List of clients with summary
         """
         def filter_func(client: dict) -> bool:
-            if status and client.get("status") != status:
-                return False
-            if industry and client.get("industry") != industry:
-                return False
             if min_health_score and client.get("health_score", 0) < min_health_score:
                 return False
             return True
         
-        result = self._list_records("clients", filter_func, sort_key="name")
+        result = self._list_records(
+            "clients",
+            filter_func,
+            sort_key="name",
+            where={"status": status, "industry": industry}
+        )
         
         if result.get("success"):
             clients = result["records"]
@@ -246,6 +263,33 @@ class ClientServer(BaseMCPServer):
         
         return result
     
+    def search_clients(self, query: str, limit: int = 20) -> dict:
+        """
+        Search clients by name, company, email, industry or notes.
+        
+        Args:
+            query: Words or word prefixes to search for
+            limit: Maximum clients to return
+        
+        Returns:
+            Matching clients, best match first
+        """
+        result = self._search_records(
+            "clients",
+            ["name", "company", "email", "industry", "notes"],
+            query,
+            limit=limit
+        )
+        
+        if result.get("success"):
+            return {
+                "clients": result["records"],
+                "count": result["count"],
+                "query": query
+            }
+        
+        return result
+    
     def log_communication(
         self,
         client_id: str,
@@ -289,54 +333,109 @@ class ClientServer(BaseMCPServer):
             "timestamp": datetime.now().isoformat()
         }
         
-        result = self._create_record("communications", comm_id, comm_data)
-        
-        if result.get("success"):
-            # Update client's last contact
-            self._update_record("clients", client_id, {
-                "last_contact": datetime.now().isoformat()
-            })
-            
-            return {
-                "comm_id": comm_id,
-                "status": "logged",
-                "communication": result["record"]
-            }
+        try:
+            with self.transaction():
+                result = self._create_record("communications", comm_id, comm_data)
+                if not result.get("success"):
+                    return result
+                
+                # Update client's last contact
+                self._update_record("clients", client_id, {
+                    "last_contact": datetime.now().isoformat()
+                })
+        except IOError as e:
+            return {"error": str(e)}
         
-        return result
+        return {
+            "comm_id": comm_id,
+            "status": "logged",
+            "communication": result["record"]
+        }
     
     def get_communications(
         self,
         client_id: Optional[str] = None,
         comm_type: Optional[str] = None,
-        limit: int = 50
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        order_by: str = "-timestamp"
     ) -> dict:
         """
-        Get communication history.
+        Get communication history, one page at a time.
         
         Args:
             client_id: Filter by client
             comm_type: Filter by type
             limit: Maximum records to return
+            cursor: next_cursor from the previous page
+            order_by: Field to order by, "-" prefix for descending
         
         Returns:
-            Communication log entries
+            Page of communication log entries, next_cursor, and on the
+            first page total_available (entries matching the filters
+            across all pages)
         """
-        def filter_func(comm: dict) -> bool:
-            if client_id and comm.get("client_id") != client_id:
-                return False
-            if comm_type and comm.get("type") != comm_type:
-                return False
-            return True
+        where = {"client_id": client_id, "type": comm_type}
+        result = self._list_records(
+            "communications",
+            where=where,
+            limit=limit,
+            cursor=cursor,
+            order_by=order_by
+        )
         
-        result = self._list_records("communications", filter_func, sort_key="timestamp", reverse=True)
+        if result.get("success"):
+            response = {
+                "communications": result["records"],
+                "count": result["count"],
+                "next_cursor": result["next_cursor"]
+            }
+            
+            # Count every matching entry once, on the first page
+            if cursor is None:
+                if result["next_cursor"] is None:
+                    response["total_available"] = result["count"]
+                else:
+                    response["total_available"] = sum(
+                        1 for _ in self._iter_records("communications", where=where)
+                    )
+            
+            return response
+        
+        return result
+    
+    def search_communications(
+        self,
+        query: str,
+        client_id: Optional[str] = None,
+        limit: int = 20
+    ) -> dict:
+        """
+        Search communication subjects and notes.
+        
+        Args:
+            query: Words or word prefixes to search for
+            client_id: Only search this client's communications
+            limit: Maximum records to return
+        
+        Returns:
+            Matching communications, best match first
+        """
+        result = self._search_records(
+            "communications",
+            ["subject", "notes"],
+            query,
+            limit=None if client_id else limit
+        )
         
         if result.get("success"):
-            communications = result["records"][:limit]
+            communications = result["records"]
+            if client_id:
+                communications = [c for c in communications if c.get("client_id") == client_id][:limit]
             return {
                 "communications": communications,
                 "count": len(communications),
-                "total_available": result["count"]
+                "query": query
             }
         
         return result
@@ -574,15 +673,18 @@ class ClientServer(BaseMCPServer):
         client = client_result["record"]
         
         # Get recent communications
-        comms_result = self.get_communications(client_id=client_id, limit=10)
-        recent_comms = comms_result.get("communications", [])
+        recent_comms = self._top_records(
+            "communications",
+            10,
+            "-timestamp",
+            where={"client_id": client_id}
+        )
         
         # Get upcoming meetings
-        meetings = self._get_collection("meetings")
-        upcoming_meetings = [
-            m for m in meetings.values()
-            if m.get("client_id") == client_id and m.get("status") == "scheduled"
-        ]
+        upcoming_meetings = self._list_records(
+            "meetings",
+            where={"client_id": client_id, "status": "scheduled"}
+        )["records"]
         
         # Calculate health score
         health_result = self.calculate_health_score(client_id)
@@ -633,6 +735,11 @@ def list_clients(**kwargs) -> dict:
     return _get_server().list_clients(**kwargs)
 
 
+def search_clients(**kwargs) -> dict:
+    """Search clients."""
+    return _get_server().search_clients(**kwargs)
+
+
 def log_communication(**kwargs) -> dict:
     """Log communication with client."""
     return _get_server().log_communication(**kwargs)
@@ -643,6 +750,11 @@ def get_communications(**kwargs) -> dict:
     return _get_server().get_communications(**kwargs)
 
 
+def search_communications(**kwargs) -> dict:
+    """Search communication history."""
+    return _get_server().search_communications(**kwargs)
+
+
 def schedule_meeting(**kwargs) -> dict:
     """Schedule a client meeting."""
     return _get_server().schedule_meeting(**kwargs)
@@ -664,8 +776,10 @@ def get_client_summary(client_id: str) -> dict:
 
 
 def get_server_info() -> dict:
-    """Get server info."""
-    return _get_server().get_info()
+    """Get server info, without starting the server if it is not running yet."""
+    if _server_instance is None:
+        return ClientServer.describe()
+    return _server_instance.get_info()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+"""
+Multi-Server Host
+
+Runs every MCP server in one process behind a single stdio endpoint, so
+the suite needs one interpreter, one event loop and one tool thread pool
+instead of six processes. Tools are registered per namespace as
+``{namespace}_{tool}`` (e.g. ``billing_create_invoice``), read from each
+server's TOOLS without constructing it; a server is started on the first
+call to one of its tools. The host uses the same instances as the
+module-level functions (``_get_server()``), so in-process callers and MCP
+clients share one data store, its indexes and caches.
+
+A JSON-RPC batch runs inside the batch() of every server it touches: the
+calls see one consistent state and each server commits once at the end.
+
+Usage:
+    python -m core.mcp.host
+    python -m core.mcp.host --servers work,billing
+"""
+
+import inspect
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import ExitStack, contextmanager
+from typing import Any, Optional
+
+from . import SERVERS, get_server_module
+from .stdio_server import StdioServer
+
+logger = logging.getLogger(__name__)
+
+class ServerHost:
+    """Hosts several MCP servers in one process and starts them lazily."""
+    
+    def __init__(self, namespaces: Optional[Iterable[str]] = None, max_workers: Optional[int] = None):
+        """
+        Initialize the host. No server is started yet.
+        
+        Args:
+            namespaces: Servers to host (default: all of SERVERS)
+            max_workers: Thread pool size for tool calls (default: Python's)
+        
+        Raises:
+            ValueError: If a namespace is not in SERVERS
+        """
+        self.namespaces = list(namespaces) if namespaces is not None else list(SERVERS)
+        unknown = [ns for ns in self.namespaces if ns not in SERVERS]
+        if unknown:
+            raise ValueError(
+                f"Unknown server(s): {', '.join(unknown)}. Must be one of: {', '.join(SERVERS)}"
+            )
+        
+        self.max_workers = max_workers
+        self._servers: dict[str, Any] = {}
+        self._start_lock = threading.Lock()
+    
+    def _server_class(self, namespace: str) -> Optional[type]:
+        """Get a server's class, or None for the module-based work server."""
+        class_name = SERVERS[namespace][1]
+        return getattr(get_server_module(namespace), class_name) if class_name else None
+    
+    def tool_names(self, namespace: str) -> list[str]:
+        """
+        List a server's tools without starting it.
+        
+        Args:
+            namespace: Server namespace
+        
+        Returns:
+            Tool names as the server defines them (without the namespace)
+        """
+        return list(get_server_module(namespace).get_server_info()["tools"])
+    
+    def server(self, namespace: str) -> Any:
+        """
+        Get a server, starting it on first use.
+        
+        Args:
+            namespace: Server namespace
+        
+        Returns:
+            The module's shared server instance (the module itself for work)
+        """
+        server = self._servers.get(namespace)
+        if server is not None:
+            return server
+        
+        with self._start_lock:
+            if namespace not in self._servers:
+                start = time.perf_counter()
+                module = get_server_module(namespace)
+                server = module if SERVERS[namespace][1] is None else module._get_server()
+                self._servers[namespace] = server
+                logger.info("Started %s server in %.1fms", namespace, (time.perf_counter() - start) * 1000)
+            return self._servers[namespace]
+    
+    def _tool(self, namespace: str, name: str) -> Callable[..., dict]:
+        """Build the function registered for one tool; it starts the server when called."""
+        server_class = self._server_class(namespace)
+        target = getattr(server_class or get_server_module(namespace), name)
+        signature = inspect.signature(target)
+        if server_class is not None:
+            # Drop self from the unbound method
+            signature = signature.replace(parameters=list(signature.parameters.values())[1:])
+        
+        def call(**arguments) -> dict:
+            if server_class is None:
+                return getattr(self.server(namespace), name)(**arguments)
+            return self.server(namespace).call_tool(name, arguments)
+        
+        call.__name__ = f"{namespace}_{name}"
+        call.__doc__ = target.__doc__
+        call.__signature__ = signature
+        return call
+    
+    def tools(self) -> dict[str, Callable[..., dict]]:
+        """
+        Get every hosted tool, keyed by namespaced name.
+        
+        Returns:
+            Tool functions keyed by '{namespace}_{tool}'
+        """
+        return {
+            f"{namespace}_{name}": self._tool(namespace, name)
+            for namespace in self.namespaces
+            for name in self.tool_names(namespace)
+        }
+    
+    @contextmanager
+    def batch(self, tool_names: list[str]) -> Iterator[None]:
+        """
+        Enter the batch() of every server a batch of tool calls touches.
+        
+        Servers are entered in SERVERS order, so concurrent batches cannot
+        deadlock on each other's locks.
+        
+        Args:
+            tool_names: Namespaced tool names in the batch
+        """
+        with ExitStack() as stack:
+            for namespace in self.namespaces:
+                if any(name.startswith(f"{namespace}_") for name in tool_names):
+                    stack.enter_context(self.server(namespace).batch())
+            yield
+    
+    def get_info(self) -> dict:
+        """Return host metadata without starting any server."""
+        return {
+            "name": "freelance-dev",
+            "version": "0.1.0",
+            "servers": {
+                namespace: {
+                    "tools": self.tool_names(namespace),
+                    "started": namespace in self._servers
+                }
+                for namespace in self.namespaces
+            }
+        }
+    
+    def run(self) -> None:
+        """Serve all hosted tools on stdin/stdout until stdin closes."""
+        info = self.get_info()
+        StdioServer(info["name"], info["version"], self.tools(), self.max_workers, self.batch).run()
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Freelance Dev - all MCP servers in one process")
+    parser.add_argument(
+        "--servers",
+        help=f"Comma-separated servers to host (default: all of {', '.join(SERVERS)})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Thread pool size for tool calls"
+    )
+    args = parser.parse_args()
+    
+    namespaces = args.servers.split(",") if args.servers else None
+    ServerHost(namespaces, args.workers).run()
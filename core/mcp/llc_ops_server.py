@@ -25,6 +25,30 @@ from .base_server import BaseMCPServer
 class LLCOpsServer(BaseMCPServer):
     """LLC operations and compliance management server."""
     
+    INDEXED_FIELDS = {
+        "compliance_items": ("category",),
+        "documents": ("type",)
+    }
+    
+    INFO = {
+        "name": "llc-ops-server",
+        "version": "0.1.0",
+        "description": "LLC operations and compliance MCP server"
+    }
+    
+    TOOLS = (
+        "get_entity_info",
+        "update_entity_info",
+        "get_tax_deadlines",
+        "calculate_quarterly_estimate",
+        "add_compliance_item",
+        "get_compliance_checklist",
+        "complete_compliance_item",
+        "upload_document",
+        "list_documents",
+        "get_tax_summary"
+    )
+    
     def __init__(self):
         super().__init__("llc_ops")
         
@@ -54,23 +78,7 @@ class LLCOpsServer(BaseMCPServer):
     
     def get_info(self) -> dict:
         """Return server metadata."""
-        return {
-            "name": "llc-ops-server",
-            "version": "0.1.0",
-            "description": "LLC operations and compliance MCP server",
-            "tools": [
-                "get_entity_info",
-                "update_entity_info",
-                "get_tax_deadlines",
-                "calculate_quarterly_estimate",
-                "add_compliance_item",
-                "get_compliance_checklist",
-                "complete_compliance_item",
-                "upload_document",
-                "list_documents",
-                "get_tax_summary"
-            ]
-        }
+        return self.describe()
     
     def _initialize_tax_deadlines(self) -> None:
         """Initialize standard tax deadlines for the current year."""
@@ -354,9 +362,6 @@ class LLCOpsServer(BaseMCPServer):
             Compliance items
         """
         def filter_func(item: dict) -> bool:
-            if category and item.get("category") != category:
-                return False
-            
             item_status = item.get("status")
             
             # Determine if overdue
@@ -375,7 +380,12 @@ class LLCOpsServer(BaseMCPServer):
             
             return True
         
-        result = self._list_records("compliance_items", filter_func, sort_key="due_date")
+        result = self._list_records(
+            "compliance_items",
+            filter_func,
+            sort_key="due_date",
+            where={"category": category}
+        )
         
         if result.get("success"):
             items = result["records"]
@@ -568,15 +578,17 @@ class LLCOpsServer(BaseMCPServer):
             List of documents
         """
         def filter_func(doc: dict) -> bool:
-            if document_type and doc.get("type") != document_type:
-                return False
-            if year and doc.get("year") != year:
-                return False
             if tag and tag not in doc.get("tags", []):
                 return False
             return True
         
-        result = self._list_records("documents", filter_func, sort_key="upload_date", reverse=True)
+        result = self._list_records(
+            "documents",
+            filter_func,
+            sort_key="upload_date",
+            reverse=True,
+            where={"type": document_type, "year": year}
+        )
         
         if result.get("success"):
             documents = result["records"]
@@ -703,8 +715,10 @@ def get_tax_summary(**kwargs) -> dict:
 
 
 def get_server_info() -> dict:
-    """Get server info."""
-    return _get_server().get_info()
+    """Get server info, without starting the server if it is not running yet."""
+    if _server_instance is None:
+        return LLCOpsServer.describe()
+    return _server_instance.get_info()
 
 
 if __name__ == "__main__":
@@ -20,6 +20,29 @@ from .base_server import BaseMCPServer
 class OnboardingServer(BaseMCPServer):
     """Client onboarding workflow management server."""
     
+    INDEXED_FIELDS = {
+        "onboarding_workflows": ("client_id", "status")
+    }
+    
+    INFO = {
+        "name": "onboarding-server",
+        "version": "0.1.0",
+        "description": "Client onboarding workflow MCP server"
+    }
+    
+    TOOLS = (
+        "start_onboarding",
+        "get_onboarding_status",
+        "update_onboarding_step",
+        "complete_onboarding",
+        "create_contract",
+        "get_contract",
+        "sign_contract",
+        "generate_scope_of_work",
+        "send_welcome_packet",
+        "list_onboarding_workflows"
+    )
+    
     def __init__(self):
         super().__init__("onboarding")
         
@@ -36,23 +59,7 @@ class OnboardingServer(BaseMCPServer):
     
     def get_info(self) -> dict:
         """Return server metadata."""
-        return {
-            "name": "onboarding-server",
-            "version": "0.1.0",
-            "description": "Client onboarding workflow MCP server",
-            "tools": [
-                "start_onboarding",
-                "get_onboarding_status",
-                "update_onboarding_step",
-                "complete_onboarding",
-                "create_contract",
-                "get_contract",
-                "sign_contract",
-                "generate_scope_of_work",
-                "send_welcome_packet",
-                "list_onboarding_workflows"
-            ]
-        }
+        return self.describe()
     
     def _initialize_templates(self) -> None:
         """Initialize default onboarding templates."""
@@ -190,7 +197,7 @@ class OnboardingServer(BaseMCPServer):
         result = self._create_record("onboarding_workflows", workflow_id, workflow_data)
         
         if result.get("success"):
-            self.logger.info(f"Started onboarding for {client_name} ({workflow_id})")
+            self.logger.info("Started onboarding for %s (%s)", client_name, workflow_id)
             return {
                 "workflow_id": workflow_id,
                 "status": "started",
@@ -352,7 +359,7 @@ class OnboardingServer(BaseMCPServer):
         result = self._update_record("onboarding_workflows", workflow_id, updates)
         
         if result.get("success"):
-            self.logger.info(f"Completed onboarding workflow {workflow_id}")
+            self.logger.info("Completed onboarding workflow %s", workflow_id)
             return {
                 "workflow_id": workflow_id,
                 "status": "completed",
@@ -579,18 +586,11 @@ class OnboardingServer(BaseMCPServer):
         Returns:
             List of workflows
         """
-        def filter_func(workflow: dict) -> bool:
-            if status and workflow.get("status") != status:
-                return False
-            if client_id and workflow.get("client_id") != client_id:
-                return False
-            return True
-        
         result = self._list_records(
             "onboarding_workflows",
-            filter_func,
             sort_key="started_date",
-            reverse=True
+            reverse=True,
+            where={"status": status, "client_id": client_id}
         )
         
         if result.get("success"):
@@ -675,8 +675,10 @@ def list_onboarding_workflows(**kwargs) -> dict:
 
 
 def get_server_info() -> dict:
-    """Get server info."""
-    return _get_server().get_info()
+    """Get server info, without starting the server if it is not running yet."""
+    if _server_instance is None:
+        return OnboardingServer.describe()
+    return _server_instance.get_info()
 
 
 if __name__ == "__main__":
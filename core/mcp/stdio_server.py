@@ -0,0 +1,362 @@
+"""
+Asyncio JSON-RPC Server over stdio
+
+Serves a set of tool functions with the MCP stdio transport: one JSON-RPC
+2.0 message per line on stdin, responses on stdout. Each request is
+dispatched as its own asyncio task and tool functions run in a thread
+pool, so a slow tool call never holds up the responses to others; the
+responses are written as they complete, matched to requests by id.
+
+A JSON-RPC batch (an array of requests) is answered with one array. Its
+tool calls run one after another in a single worker inside the server's
+batch context, which lets the tools read one consistent state and commit
+their writes together.
+
+Tool functions are the plain synchronous functions the servers already
+expose. They are responsible for their own locking around shared files.
+
+Usage:
+    server = StdioServer("work-server", "0.1.0", {"list_tasks": list_tasks})
+    server.run()
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import sys
+import typing
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = "2024-11-05"
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+_JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    dict: "object",
+}
+
+
+def _json_type(annotation: Any) -> Optional[str]:
+    """Map a parameter annotation to a JSON schema type (Optional[X] maps like X)."""
+    if typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        annotation = args[0] if len(args) == 1 else None
+    annotation = typing.get_origin(annotation) or annotation
+    return _JSON_TYPES.get(annotation)
+
+
+def tool_schema(name: str, func: Callable) -> dict:
+    """
+    Describe a tool function for tools/list.
+    
+    Args:
+        name: Tool name
+        func: Tool function; its signature becomes the input schema and the
+            first paragraph of its docstring the description
+    
+    Returns:
+        MCP tool definition
+    """
+    properties = {}
+    required = []
+    for param in inspect.signature(func).parameters.values():
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        schema = {}
+        json_type = _json_type(param.annotation)
+        if json_type:
+            schema["type"] = json_type
+        properties[param.name] = schema
+        if param.default is param.empty:
+            required.append(param.name)
+    
+    doc = inspect.getdoc(func) or ""
+    return {
+        "name": name,
+        "description": doc.split("\n\n")[0].strip(),
+        "inputSchema": {"type": "object", "properties": properties, "required": required}
+    }
+
+
+def _error(request_id: Any, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+class StdioServer:
+    """JSON-RPC/MCP server that runs tool functions concurrently."""
+    
+    def __init__(
+        self,
+        name: str,
+        version: str,
+        tools: dict[str, Callable[..., dict]],
+        max_workers: Optional[int] = None,
+        batch: Optional[Callable[[list[str]], AbstractContextManager]] = None
+    ):
+        """
+        Initialize the server.
+        
+        Args:
+            name: Server name reported by initialize
+            version: Server version reported by initialize
+            tools: Tool functions keyed by tool name
+            max_workers: Thread pool size for tool calls (default: Python's)
+            batch: Called with the tool names of a batch; returns the context
+                manager its tool calls run in
+        """
+        self.name = name
+        self.version = version
+        self.tools = tools
+        self.max_workers = max_workers
+        self.batch = batch
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    async def call_tool(self, name: str, arguments: dict) -> dict:
+        """
+        Run a tool function in the thread pool.
+        
+        Args:
+            name: Tool name
+            arguments: Keyword arguments for the tool
+        
+        Returns:
+            MCP tool result; isError is set when the tool returned an error
+            dict or raised
+        
+        Raises:
+            KeyError: If the tool does not exist
+            TypeError: If the arguments do not match the tool's signature
+        """
+        inspect.signature(self.tools[name]).bind(**arguments)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(self._run_tool, name, arguments))
+    
+    def _run_tool(self, name: str, arguments: dict) -> dict:
+        """Run a tool function in the current thread and wrap its result."""
+        try:
+            result = self.tools[name](**arguments)
+        except Exception as e:
+            logger.exception("Tool %s failed", name)
+            return {"content": [{"type": "text", "text": f"{type(e).__name__}: {e}"}], "isError": True}
+        
+        return {
+            "content": [{"type": "text", "text": json.dumps(result, default=str)}],
+            "isError": isinstance(result, dict) and "error" in result
+        }
+    
+    def _run_batch(self, calls: list[tuple[str, dict]]) -> list:
+        """
+        Run a batch's tool calls in order inside the batch context.
+        
+        Returns:
+            One result per call, or the TypeError raised binding its arguments
+        """
+        results = []
+        with self.batch([name for name, _ in calls]) if self.batch else nullcontext():
+            for name, arguments in calls:
+                try:
+                    inspect.signature(self.tools[name]).bind(**arguments)
+                except TypeError as e:
+                    results.append(e)
+                    continue
+                results.append(self._run_tool(name, arguments))
+        return results
+    
+    async def handle_batch(self, messages: list) -> list[dict]:
+        """
+        Handle a JSON-RPC batch.
+        
+        Valid tool calls run together through _run_batch in one worker;
+        every other message is handled as if sent alone.
+        
+        Args:
+            messages: Decoded batch (non-empty)
+        
+        Returns:
+            Responses in request order, without notifications
+        """
+        calls = {}
+        for position, message in enumerate(messages):
+            if (isinstance(message, dict) and "id" in message
+                    and message.get("method") == "tools/call"
+                    and isinstance(message.get("params"), dict)
+                    and message["params"].get("name") in self.tools
+                    and isinstance(message["params"].get("arguments") or {}, dict)):
+                calls[position] = (message["params"]["name"], message["params"].get("arguments") or {})
+        
+        responses = {}
+        if calls:
+            loop = asyncio.get_running_loop()
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, functools.partial(self._run_batch, list(calls.values()))
+                )
+            except Exception as e:
+                # The batch could not commit: none of its calls took effect
+                logger.exception("Batch failed")
+                results = [e] * len(calls)
+            
+            for position, result in zip(calls, results):
+                request_id = messages[position]["id"]
+                name = calls[position][0]
+                if isinstance(result, TypeError):
+                    responses[position] = _error(request_id, INVALID_PARAMS, f"Invalid arguments for {name}: {result}")
+                elif isinstance(result, Exception):
+                    responses[position] = _error(request_id, INTERNAL_ERROR, f"Batch failed: {result}")
+                else:
+                    responses[position] = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        
+        for position, message in enumerate(messages):
+            if position not in calls:
+                responses[position] = await self.handle(message)
+        
+        return [responses[position] for position in sorted(responses) if responses[position] is not None]
+    
+    async def handle(self, message: Any) -> Optional[dict]:
+        """
+        Handle one JSON-RPC message.
+        
+        Args:
+            message: Decoded JSON-RPC request or notification
+        
+        Returns:
+            Response, or None for notifications
+        """
+        if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+            return _error(message.get("id") if isinstance(message, dict) else None, INVALID_REQUEST, "Invalid request")
+        
+        method = message["method"]
+        params = message.get("params") or {}
+        is_notification = "id" not in message
+        request_id = message.get("id")
+        
+        if is_notification:
+            # notifications/initialized and friends need no reply
+            return None
+        
+        if method == "initialize":
+            result = {
+                "protocolVersion": params.get("protocolVersion", PROTOCOL_VERSION),
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": self.name, "version": self.version}
+            }
+        elif method == "ping":
+            result = {}
+        elif method == "tools/list":
+            result = {"tools": [tool_schema(name, func) for name, func in self.tools.items()]}
+        elif method == "tools/call":
+            name = params.get("name")
+            arguments = params.get("arguments") or {}
+            if name not in self.tools:
+                return _error(request_id, INVALID_PARAMS, f"Unknown tool: {name}")
+            if not isinstance(arguments, dict):
+                return _error(request_id, INVALID_PARAMS, "arguments must be an object")
+            try:
+                result = await self.call_tool(name, arguments)
+            except TypeError as e:
+                return _error(request_id, INVALID_PARAMS, f"Invalid arguments for {name}: {e}")
+        else:
+            return _error(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+        
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+    
+    async def _dispatch(self, line: str, write: Callable[[Any], Awaitable[None]]) -> None:
+        """Decode one line, handle it and write the response."""
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            await write(_error(None, PARSE_ERROR, f"Parse error: {e}"))
+            return
+        
+        if isinstance(message, list):
+            if not message:
+                await write(_error(None, INVALID_REQUEST, "Empty batch"))
+                return
+            responses = await self.handle_batch(message)
+            if responses:
+                await write(responses)
+            return
+        
+        try:
+            response = await self.handle(message)
+        except Exception as e:
+            logger.exception("Request failed")
+            response = _error(message.get("id") if isinstance(message, dict) else None, INTERNAL_ERROR, str(e))
+        
+        if response is not None:
+            await write(response)
+    
+    async def serve(
+        self,
+        read_line: Optional[Callable[[], Awaitable[str]]] = None,
+        write_line: Optional[Callable[[str], None]] = None
+    ) -> None:
+        """
+        Serve requests until the input ends.
+        
+        Args:
+            read_line: Coroutine returning the next input line, "" at EOF
+                (defaults to stdin, read in a separate thread)
+            write_line: Writes one output line (defaults to stdout)
+        """
+        loop = asyncio.get_running_loop()
+        if read_line is None:
+            async def read_line() -> str:
+                # Not the tool pool, so input is read even when every worker is busy
+                return await loop.run_in_executor(None, sys.stdin.readline)
+        if write_line is None:
+            def write_line(line: str) -> None:
+                sys.stdout.write(line)
+                sys.stdout.flush()
+        
+        write_lock = asyncio.Lock()
+        
+        async def write(response: Any) -> None:
+            async with write_lock:
+                write_line(json.dumps(response, default=str) + "\n")
+        
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=f"{self.name}-tool")
+        pending: set[asyncio.Task] = set()
+        try:
+            while True:
+                line = await read_line()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                
+                task = asyncio.create_task(self._dispatch(line, write))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            
+            # Answer everything already received before exiting
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def run(self) -> None:
+        """Serve stdin/stdout until stdin closes."""
+        # Servers start lazily in worker threads, so hook SIGTERM/SIGHUP here
+        from ..storage.write_behind import install_signal_handlers
+        install_signal_handlers()
+        logger.info("%s serving on stdio", self.name)
+        asyncio.run(self.serve())
@@ -8,24 +8,41 @@ Features:
     - [BILLABLE] / [INTERNAL] tagging
     - Priority enforcement (max 3 P0s)
     - Billable hours tracking per client
-    - YAML-based persistent storage
+    - YAML task storage with an append-only JSONL hours ledger
 """
 
-import asyncio
+import functools
+import json
 import os
+import threading
 import yaml
-from datetime import datetime, date
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta
 from typing import Optional
 from pathlib import Path
 
+from ..metrics import instrumented, record_io, record_save, registry
+from ..storage.indexes import UniqueIndex
+
 # ---------- Configuration ----------
 
 VAULT_PATH = os.environ.get("VAULT_PATH", os.path.expanduser("~/freelance-vault"))
 TASKS_DIR = os.path.join(VAULT_PATH, "03-Tasks")
 TASKS_FILE = os.path.join(TASKS_DIR, "tasks.yaml")
 HOURS_FILE = os.path.join(TASKS_DIR, "hours.yaml")
+HOURS_DIR = os.path.join(TASKS_DIR, "hours")
+ROLLUPS_FILE = os.path.join(TASKS_DIR, "hours_rollups.json")
+SEQUENCES_FILE = os.path.join(TASKS_DIR, "sequences.yaml")
 MAX_P0_TASKS = 3
 
+# Open tasks may not share a title (case-insensitive) and client
+TASK_UNIQUE_CONSTRAINT = {
+    "fields": ("title", "client"),
+    "case_insensitive": ("title",),
+    "condition": lambda task: task.get("status") != "completed"
+}
+
 # ---------- Storage Helpers ----------
 
 def _ensure_dirs():
@@ -33,24 +50,179 @@ def _ensure_dirs():
     os.makedirs(TASKS_DIR, exist_ok=True)
 
 
+# LibYAML's C loader and dumper are many times faster than the pure-Python ones
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Parsed files by path: (file signature, data). Tool calls share the parsed
+# data and a file is only parsed again after something else changed it.
+_yaml_cache: dict[str, tuple[tuple, dict]] = {}
+
+# Saves deferred by a batch() open in the current thread
+_batch_state = threading.local()
+
+
+def _pending_saves() -> Optional[dict]:
+    """Data waiting to be written when this thread's batch ends, by file path."""
+    return getattr(_batch_state, "pending", None)
+
+
+def _file_signature(filepath: str) -> Optional[tuple]:
+    """Identify a file's current contents by inode, mtime and size, or None if missing."""
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
 def _load_yaml(filepath: str) -> dict:
-    """Load a YAML file, return empty dict if missing or invalid."""
-    _ensure_dirs()
-    if os.path.exists(filepath):
-        try:
-            with open(filepath, "r") as f:
-                data = yaml.safe_load(f)
-                return data if isinstance(data, dict) else {}
-        except yaml.YAMLError:
-            return {}
-    return {}
+    """
+    Load a YAML file, return empty dict if missing or invalid.
+    
+    While the file is unchanged the cached data is returned as is, and
+    other threads may be reading it. Writers copy what they change and
+    save the copy with _save_yaml, which makes it the cached data.
+    """
+    pending = _pending_saves()
+    if pending is not None and filepath in pending:
+        return pending[filepath]
+    
+    signature = _file_signature(filepath)
+    if signature is None:
+        _ensure_dirs()
+        _yaml_cache.pop(filepath, None)
+        return {}
+    
+    cached = _yaml_cache.get(filepath)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    try:
+        with open(filepath, "r") as f:
+            # The file may have been replaced since the stat above; cache
+            # the parsed data under the signature of the file actually read
+            stat = os.fstat(f.fileno())
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            data = yaml.load(f, Loader=_YAML_LOADER)
+        record_io(read=stat.st_size)
+        data = data if isinstance(data, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except yaml.YAMLError:
+        data = {}
+    
+    _yaml_cache[filepath] = (signature, data)
+    return data
 
 
 def _save_yaml(filepath: str, data: dict):
-    """Save data to a YAML file."""
+    """
+    Save data to a YAML file and cache it as the file's parsed contents.
+    
+    The file is written to a temporary file and moved into place, so
+    readers that do not hold the file lock never see it half written.
+    Inside a batch() the write is deferred until the batch ends.
+    """
+    pending = _pending_saves()
+    if pending is not None:
+        pending[filepath] = data
+        _batch_state.saves += 1
+        return
+    
     _ensure_dirs()
-    with open(filepath, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    temp_file = filepath + ".tmp"
+    with open(temp_file, "w") as f:
+        yaml.dump(
+            data, f,
+            Dumper=_YAML_DUMPER,
+            default_flow_style=False,
+            sort_keys=False,
+            allow_unicode=True
+        )
+        written = f.tell()
+    os.replace(temp_file, filepath)
+    record_save()
+    record_io(written=written)
+    _yaml_cache[filepath] = (_file_signature(filepath), data)
+
+
+# One lock per storage file. Writers hold it for their whole
+# read-modify-write, so concurrent tool calls cannot lose updates.
+_file_locks: dict[str, threading.RLock] = {}
+_file_locks_guard = threading.Lock()
+
+
+def _file_lock(filepath: str) -> threading.RLock:
+    """Get the lock serializing writes to a storage file or directory."""
+    with _file_locks_guard:
+        return _file_locks.setdefault(filepath, threading.RLock())
+
+
+def _writes_tasks(func):
+    """Run a tool holding the tasks.yaml lock for its whole read-modify-write."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _file_lock(TASKS_FILE):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def batch() -> Iterator[None]:
+    """
+    Run several tool calls as one batch.
+    
+    Holds the tasks and hours locks for the whole batch, so the calls see
+    one consistent state, and writes tasks.yaml, the task counters and the
+    rollups once when the batch ends instead of after every call. Hours
+    are still appended to the ledger as they are logged. If the batch
+    raises, nothing is written and the hours it appended are truncated
+    away again, so none of its calls take effect. Nested batches join the
+    outermost one.
+    
+    Example:
+        with batch():
+            task_id = create_task("Review PR", client="Acme")["task_id"]
+            log_hours(task_id, 1.5)
+    """
+    with _file_lock(TASKS_FILE), _file_lock(HOURS_DIR):
+        if _pending_saves() is not None:
+            yield
+            return
+        
+        _batch_state.pending = {}
+        _batch_state.saves = 0
+        _batch_state.ledger_sizes = {}
+        try:
+            yield
+        except BaseException:
+            _discard_batch()
+            raise
+        
+        pending = _batch_state.pending
+        _batch_state.pending = None
+        for filepath, data in pending.items():
+            if filepath == ROLLUPS_FILE:
+                _save_rollups(data)
+            else:
+                _save_yaml(filepath, data)
+
+
+def _discard_batch():
+    """Drop a failed batch's deferred saves and the ledger lines it appended."""
+    global _rollups_cache
+    pending = _batch_state.pending
+    _batch_state.pending = None
+    if ROLLUPS_FILE in pending:
+        # The cache holds the unsaved rollups; reload them from disk
+        _rollups_cache = None
+    
+    for path, size in _batch_state.ledger_sizes.items():
+        if size is None:
+            os.remove(path)
+        else:
+            os.truncate(path, size)
 
 
 def _load_tasks() -> dict:
@@ -64,32 +236,325 @@ def _save_tasks(tasks: dict):
 
 
 def _load_hours() -> dict:
-    """Load all hour entries from storage."""
+    """Load hour entries from the legacy hours.yaml (migration only)."""
     return _load_yaml(HOURS_FILE)
 
+# ---------- Hours Ledger ----------
+
+# (rollups file signature, rollups) as last loaded or saved
+_rollups_cache: Optional[tuple] = None
+
+
+def _ledger_path(work_date: str) -> str:
+    """Ledger file for an entry: one file per work month, e.g. hours-2024-03.jsonl."""
+    return os.path.join(HOURS_DIR, f"hours-{work_date[:7]}.jsonl")
+
+
+def _ledger_files(start: Optional[str] = None, end: Optional[str] = None) -> list:
+    """
+    List ledger files in month order, optionally only months overlapping a range.
+    
+    Args:
+        start: First ISO date of the range
+        end: Last ISO date of the range
+    """
+    if not os.path.isdir(HOURS_DIR):
+        return []
+    
+    files = []
+    for name in sorted(os.listdir(HOURS_DIR)):
+        if not (name.startswith("hours-") and name.endswith(".jsonl")):
+            continue
+        month = name[len("hours-"):-len(".jsonl")]
+        if (start and month < start[:7]) or (end and month > end[:7]):
+            continue
+        files.append(os.path.join(HOURS_DIR, name))
+    return files
+
+
+def _migrate_hours_yaml():
+    """
+    Move entries from the legacy hours.yaml into the ledger, once.
+    
+    The YAML file is renamed to hours.yaml.migrated afterwards, so the
+    migration runs again only if a new hours.yaml appears.
+    """
+    if not os.path.exists(HOURS_FILE):
+        return
+    
+    with _file_lock(HOURS_DIR):
+        if not os.path.exists(HOURS_FILE):
+            return
+        
+        by_file = {}
+        for entry in _load_hours().get("entries", []):
+            try:
+                # Store the extended form, which ledger months and ranges rely on
+                entry["work_date"] = date.fromisoformat(entry.get("work_date")).isoformat()
+                path = _ledger_path(entry["work_date"])
+            except (ValueError, TypeError):
+                # Never matched by a period, but kept for the record
+                path = os.path.join(HOURS_DIR, "hours-undated.jsonl")
+            by_file.setdefault(path, []).append(entry)
+        
+        os.makedirs(HOURS_DIR, exist_ok=True)
+        for path, entries in by_file.items():
+            with open(path, "a") as f:
+                f.writelines(json.dumps(entry, default=str) + "\n" for entry in entries)
+        
+        os.replace(HOURS_FILE, HOURS_FILE + ".migrated")
+        _yaml_cache.pop(HOURS_FILE, None)
+
+
+def _append_hours(entry: dict):
+    """Append one entry to its month's ledger file."""
+    os.makedirs(HOURS_DIR, exist_ok=True)
+    line = json.dumps(entry) + "\n"
+    path = _ledger_path(entry["work_date"])
+    if _pending_saves() is not None and path not in _batch_state.ledger_sizes:
+        # Remember where the file ended, so a failed batch can cut it back
+        _batch_state.ledger_sizes[path] = (
+            os.path.getsize(path) if os.path.exists(path) else None
+        )
+    with open(path, "a") as f:
+        f.write(line)
+    record_io(written=len(line))
+
+
+def _iter_hours(start: Optional[str] = None, end: Optional[str] = None) -> Iterator[dict]:
+    """
+    Stream hour entries from the ledger without loading it all.
+    
+    Only the month files overlapping the range are opened. Entries with
+    an invalid work_date are skipped when a range is given, as is a
+    partially written last line.
+    
+    Args:
+        start: First ISO date to include (None for no lower bound)
+        end: Last ISO date to include (None for no upper bound)
+    
+    Yields:
+        Hour entries
+    """
+    _migrate_hours_yaml()
+    
+    for path in _ledger_files(start, end):
+        with open(path, "r") as f:
+            for line in f:
+                record_io(read=len(line))
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                
+                if start or end:
+                    work_date = entry.get("work_date")
+                    if not isinstance(work_date, str):
+                        continue
+                    if (start and work_date < start) or (end and work_date > end):
+                        continue
+                
+                yield entry
+
+
+def _ledger_signature() -> list:
+    """Identify the current contents of the ledger without reading it (JSON-ready)."""
+    return [
+        [os.path.basename(path), list(_file_signature(path) or ())]
+        for path in _ledger_files()
+    ]
+
+# ---------- Hours Rollups ----------
+
+def _quarter_key(day: date) -> str:
+    """Rollup key of a date's quarter, e.g. 2024-Q1."""
+    return f"{day.year}-Q{(day.month - 1) // 3 + 1}"
+
+
+def _add_to_rollups(rollups: dict, entry: dict):
+    """
+    Count one ledger entry into the rollups.
+    
+    Every entry adds to its task's total. Billable entries with a valid
+    work date also add hours, an entry and their task ID to the client's
+    month, quarter and all-time buckets.
+    """
+    task_id = entry.get("task_id")
+    hours = entry.get("hours", 0)
+    rollups["tasks"][task_id] = rollups["tasks"].get(task_id, 0.0) + hours
+    
+    if not entry.get("billable"):
+        return
+    
+    work_date = entry.get("work_date", "")
+    try:
+        day = date.fromisoformat(work_date)
+    except (ValueError, TypeError):
+        return
+    
+    client = entry.get("client", "unknown")
+    buckets = (
+        rollups["months"].setdefault(day.isoformat()[:7], {}),
+        rollups["quarters"].setdefault(_quarter_key(day), {}),
+        rollups["all"]
+    )
+    for bucket in buckets:
+        stats = bucket.setdefault(client, {"hours": 0.0, "entries": 0, "tasks": {}})
+        stats["hours"] += hours
+        stats["entries"] += 1
+        stats["tasks"][task_id] = None
+
+
+def _save_rollups(rollups: dict):
+    """Write the rollups atomically and cache them (deferred inside a batch())."""
+    global _rollups_cache
+    pending = _pending_saves()
+    if pending is not None:
+        # The file is unchanged, so _load_rollups keeps returning these
+        pending[ROLLUPS_FILE] = rollups
+        _rollups_cache = (_file_signature(ROLLUPS_FILE), rollups)
+        return
+    
+    _ensure_dirs()
+    temp_file = ROLLUPS_FILE + ".tmp"
+    encoded = json.dumps(rollups)
+    with open(temp_file, "w") as f:
+        f.write(encoded)
+    os.replace(temp_file, ROLLUPS_FILE)
+    record_save()
+    record_io(written=len(encoded))
+    _rollups_cache = (_file_signature(ROLLUPS_FILE), rollups)
+
+
+def rebuild_rollups() -> dict:
+    """
+    Regenerate the billable-hours rollups from the raw ledger.
+    
+    Returns:
+        dict with the number of entries and months rolled up
+    """
+    with _file_lock(HOURS_DIR):
+        _migrate_hours_yaml()
+        rollups = {"ledger": _ledger_signature(), "tasks": {}, "months": {}, "quarters": {}, "all": {}}
+        entries = 0
+        for entry in _iter_hours():
+            _add_to_rollups(rollups, entry)
+            entries += 1
+        _save_rollups(rollups)
+    
+    return {
+        "status": "rebuilt",
+        "entries": entries,
+        "months": len(rollups["months"]),
+        "rollups_file": ROLLUPS_FILE
+    }
+
+
+def _load_rollups() -> dict:
+    """
+    Get the rollups, rebuilding them if they no longer match the ledger.
+    
+    The rollups record the ledger signature they were computed from, so
+    a crash between appending an entry and saving the rollups, or a
+    ledger edited by hand, is repaired on the next call.
+    """
+    global _rollups_cache
+    with _file_lock(HOURS_DIR):
+        _migrate_hours_yaml()
+        
+        signature = _file_signature(ROLLUPS_FILE)
+        if _rollups_cache is None or _rollups_cache[0] != signature:
+            rollups = None
+            if signature is not None:
+                try:
+                    with open(ROLLUPS_FILE, "r") as f:
+                        raw = f.read()
+                    record_io(read=len(raw))
+                    rollups = json.loads(raw)
+                except (ValueError, IOError):
+                    rollups = None
+            _rollups_cache = (signature, rollups)
+        
+        rollups = _rollups_cache[1]
+        if not isinstance(rollups, dict) or rollups.get("ledger") != _ledger_signature():
+            rebuild_rollups()
+            rollups = _rollups_cache[1]
+        
+        return rollups
+
+
+def _logged_hours() -> dict:
+    """Get total logged hours per task from the rollups."""
+    return _load_rollups()["tasks"]
+
+
+def _with_logged_hours(task_id: str, task: dict, totals: dict) -> dict:
+    """Copy of a task with logged_hours taken from the ledger totals."""
+    return {**task, "logged_hours": totals.get(task_id, 0.0)}
+
+
+def _period_rollup(rollups: dict, period: str, today: date) -> dict:
+    """
+    Get the per-client rollup bucket of a reporting period.
+    
+    Args:
+        rollups: Loaded rollups
+        period: 'current_month', 'last_month', 'current_quarter', 'all'
+        today: Reference date
+    
+    Returns:
+        Stats keyed by client
+    """
+    if period == "current_month":
+        return rollups["months"].get(today.strftime("%Y-%m"), {})
+    if period == "last_month":
+        last_month = today.replace(day=1) - timedelta(days=1)
+        return rollups["months"].get(last_month.strftime("%Y-%m"), {})
+    if period == "current_quarter":
+        return rollups["quarters"].get(_quarter_key(today), {})
+    return rollups["all"]
 
-def _save_hours(hours: dict):
-    """Save all hour entries to storage."""
-    _save_yaml(HOURS_FILE, hours)
 
 # ---------- Task ID Generator ----------
 
-def _generate_task_id() -> str:
-    """Generate a unique task ID: task-YYYYMMDD-XXX."""
+def _generate_task_id(tasks: dict) -> tuple[str, dict]:
+    """
+    Allocate the next task ID: task-YYYYMMDD-XXX.
+    
+    Reads today's counter from sequences.yaml instead of scanning task
+    IDs; existing IDs are only scanned to seed the counter on the first
+    task of a day. Call with the tasks.yaml lock held and save the returned
+    sequences after the task, so a failed save never skips a number.
+    
+    Args:
+        tasks: Current tasks, used to seed the counter and skip taken IDs
+    
+    Returns:
+        (task_id, updated sequences to save)
+    """
     today = date.today().strftime("%Y%m%d")
-    tasks = _load_tasks()
+    # Copied so the cached file is unchanged until the caller saves it
+    sequences = dict(_load_yaml(SEQUENCES_FILE))
+    counter = sequences.get("task", {})
     
-    existing_today = [
-        tid for tid in tasks.keys()
-        if tid.startswith(f"task-{today}-")
-    ]
+    if counter.get("day") == today:
+        last = counter.get("last", 0)
+    else:
+        prefix = f"task-{today}-"
+        last = max(
+            (int(tid[len(prefix):]) for tid in tasks
+             if tid.startswith(prefix) and tid[len(prefix):].isdigit()),
+            default=0
+        )
     
-    next_num = len(existing_today) + 1
-    while True:
-        task_id = f"task-{today}-{next_num:03d}"
-        if task_id not in tasks:
-            return task_id
+    # A counter older than tasks.yaml (crash between the two saves) is
+    # caught up here rather than handing out a taken ID
+    next_num = last + 1
+    while f"task-{today}-{next_num:03d}" in tasks:
         next_num += 1
+    
+    sequences["task"] = {"day": today, "last": next_num}
+    return f"task-{today}-{next_num:03d}", sequences
 
 # ---------- Validation ----------
 
@@ -101,17 +566,46 @@ def _count_p0_tasks(tasks: dict) -> int:
     )
 
 
+# (tasks file, file signature) the index was built from, and the index
+_task_index: Optional[tuple] = None
+
+
+def _tasks_signature() -> tuple:
+    """Identify the current contents of tasks.yaml without reading it."""
+    pending = _pending_saves()
+    if pending is not None and TASKS_FILE in pending:
+        return (TASKS_FILE, "batch", _batch_state.saves)
+    return (TASKS_FILE, _file_signature(TASKS_FILE))
+
+
+def _get_task_index(tasks: dict) -> UniqueIndex:
+    """
+    Get the unique (title, client) index of open tasks.
+    
+    The index is rebuilt only when tasks.yaml changed since it was built;
+    create_task keeps it current for its own writes.
+    
+    Args:
+        tasks: Tasks as just loaded from tasks.yaml
+    """
+    global _task_index
+    signature = _tasks_signature()
+    if _task_index is None or _task_index[0] != signature:
+        index = UniqueIndex(**TASK_UNIQUE_CONSTRAINT)
+        index.build(tasks)
+        _task_index = (signature, index)
+    return _task_index[1]
+
+
 def _is_duplicate(tasks: dict, title: str, client: Optional[str] = None) -> bool:
-    """Check if a task with the same title and client already exists."""
-    for t in tasks.values():
-        if (t.get("title", "").lower() == title.lower() 
-            and t.get("client") == client
-            and t.get("status") != "completed"):
-            return True
-    return False
+    """Check if an open task with the same title and client already exists."""
+    conflict = _get_task_index(tasks).conflict({"title": title, "client": client})
+    return conflict is not None
 
 # ---------- MCP Tool Functions ----------
 
+@instrumented("work")
+@_writes_tasks
 def create_task(
     title: str,
     priority: str = "P1",
@@ -144,7 +638,7 @@ def create_task(
     if billable and not client:
         return {"error": "Billable tasks require a client name."}
     
-    tasks = _load_tasks()
+    tasks = dict(_load_tasks())
     
     # Check for duplicates
     if _is_duplicate(tasks, title, client):
@@ -161,7 +655,6 @@ def create_task(
             ]
         }
     
-    task_id = _generate_task_id()
     tag = "[BILLABLE]" if billable else "[INTERNAL]"
     
     task = {
@@ -180,8 +673,15 @@ def create_task(
         "completed_at": None
     }
     
+    global _task_index
+    task_id, sequences = _generate_task_id(tasks)
     tasks[task_id] = task
+    index = _get_task_index(tasks)
     _save_tasks(tasks)
+    _save_yaml(SEQUENCES_FILE, sequences)
+    
+    index.add(task_id, task)
+    _task_index = (_tasks_signature(), index)
     
     return {
         "task_id": task_id,
@@ -191,6 +691,7 @@ def create_task(
     }
 
 
+@instrumented("work")
 def list_tasks(
     status: Optional[str] = None,
     client: Optional[str] = None,
@@ -210,6 +711,7 @@ def list_tasks(
         dict with filtered task list and summary counts
     """
     tasks = _load_tasks()
+    totals = _logged_hours()
     
     filtered = {}
     for tid, task in tasks.items():
@@ -221,7 +723,7 @@ def list_tasks(
             continue
         if billable is not None and task.get("billable") != billable:
             continue
-        filtered[tid] = task
+        filtered[tid] = _with_logged_hours(tid, task, totals)
     
     summary = {
         "total": len(filtered),
@@ -249,6 +751,8 @@ def list_tasks(
     }
 
 
+@instrumented("work")
+@_writes_tasks
 def complete_task(task_id: str, notes: str = "") -> dict:
     """
     Mark a task as completed.
@@ -260,12 +764,12 @@ def complete_task(task_id: str, notes: str = "") -> dict:
     Returns:
         dict with updated task details
     """
-    tasks = _load_tasks()
+    tasks = dict(_load_tasks())
     
     if task_id not in tasks:
         return {"error": f"Task '{task_id}' not found."}
     
-    task = tasks[task_id]
+    task = dict(tasks[task_id])
     
     if task["status"] == "completed":
         return {"error": f"Task '{task_id}' is already completed."}
@@ -277,6 +781,7 @@ def complete_task(task_id: str, notes: str = "") -> dict:
     
     tasks[task_id] = task
     _save_tasks(tasks)
+    task = _with_logged_hours(task_id, task, _logged_hours())
     
     result = {
         "task_id": task_id,
@@ -295,6 +800,7 @@ def complete_task(task_id: str, notes: str = "") -> dict:
     return result
 
 
+@instrumented("work")
 def log_hours(
     task_id: str,
     hours: float,
@@ -326,16 +832,12 @@ def log_hours(
     if work_date is None:
         work_date = date.today().isoformat()
     
-    # Update task hours
-    task["logged_hours"] = task.get("logged_hours", 0.0) + hours
-    task["updated_at"] = datetime.now().isoformat()
-    tasks[task_id] = task
-    _save_tasks(tasks)
-    
-    # Save detailed hour entry
-    all_hours = _load_hours()
-    if "entries" not in all_hours:
-        all_hours["entries"] = []
+    try:
+        # fromisoformat also accepts forms like 20240305 and 2024-W10-2;
+        # store YYYY-MM-DD so ledger months and range filters match
+        work_date = date.fromisoformat(work_date).isoformat()
+    except ValueError:
+        return {"error": f"Invalid work date '{work_date}'. Use YYYY-MM-DD."}
     
     entry = {
         "task_id": task_id,
@@ -347,21 +849,30 @@ def log_hours(
         "logged_at": datetime.now().isoformat()
     }
     
-    all_hours["entries"].append(entry)
-    _save_hours(all_hours)
+    # Append to the ledger and roll the entry up; task totals are derived
+    # from the ledger, so neither tasks.yaml nor earlier entries are rewritten
+    with _file_lock(HOURS_DIR):
+        rollups = _load_rollups()
+        _append_hours(entry)
+        _add_to_rollups(rollups, entry)
+        rollups["ledger"] = _ledger_signature()
+        _save_rollups(rollups)
+    
+    logged = rollups["tasks"][task_id]
     
     return {
         "task_id": task_id,
         "hours_logged": hours,
-        "total_hours_on_task": task["logged_hours"],
+        "total_hours_on_task": logged,
         "estimated_hours": task.get("estimated_hours", 0.0),
-        "remaining": max(0, task.get("estimated_hours", 0.0) - task["logged_hours"]),
+        "remaining": max(0, task.get("estimated_hours", 0.0) - logged),
         "client": task.get("client"),
         "billable": task.get("billable"),
-        "message": f"Logged {hours}h on '{task['title']}' (total: {task['logged_hours']}h)"
+        "message": f"Logged {hours}h on '{task['title']}' (total: {logged}h)"
     }
 
 
+@instrumented("work")
 def get_billable_summary(
     client: Optional[str] = None,
     period: str = "current_month"
@@ -376,73 +887,40 @@ def get_billable_summary(
     Returns:
         dict with billable hours breakdown by client
     """
-    all_hours = _load_hours()
-    entries = all_hours.get("entries", [])
-    
-    today = date.today()
-    
-    # Filter by period
-    filtered = []
-    for entry in entries:
-        if not entry.get("billable"):
-            continue
-        
-        try:
-            entry_date = date.fromisoformat(entry.get("work_date", ""))
-        except (ValueError, TypeError):
-            continue
-        
-        if period == "current_month":
-            if entry_date.year == today.year and entry_date.month == today.month:
-                filtered.append(entry)
-        elif period == "last_month":
-            last_month = today.month - 1 if today.month > 1 else 12
-            last_month_year = today.year if today.month > 1 else today.year - 1
-            if entry_date.year == last_month_year and entry_date.month == last_month:
-                filtered.append(entry)
-        elif period == "current_quarter":
-            current_q = (today.month - 1) // 3
-            entry_q = (entry_date.month - 1) // 3
-            if entry_date.year == today.year and entry_q == current_q:
-                filtered.append(entry)
-        else:  # all
-            filtered.append(entry)
-    
-    # Filter by client
-    if client:
-        filtered = [e for e in filtered if e.get("client") == client]
-    
-    # Aggregate by client
     by_client = {}
     total_hours = 0.0
+    entry_count = 0
     
-    for entry in filtered:
-        c = entry.get("client", "unknown")
-        if c not in by_client:
+    # Rollups are kept per client, month, quarter and all time by
+    # log_hours, so a summary is a lookup rather than a ledger scan.
+    # The lock keeps a concurrent log_hours from changing them mid-read.
+    with _file_lock(HOURS_DIR):
+        rollup = _period_rollup(_load_rollups(), period, date.today())
+        
+        for c, stats in rollup.items():
+            if client and c != client:
+                continue
+            
             by_client[c] = {
-                "hours": 0.0,
-                "entries": 0,
-                "tasks": set()
+                "hours": stats["hours"],
+                "entries": stats["entries"],
+                "tasks": list(stats["tasks"]),
+                "unique_tasks": len(stats["tasks"])
             }
-        by_client[c]["hours"] += entry.get("hours", 0)
-        by_client[c]["entries"] += 1
-        by_client[c]["tasks"].add(entry.get("task_id", ""))
-        total_hours += entry.get("hours", 0)
-    
-    # Convert sets to lists for serialization
-    for c in by_client:
-        by_client[c]["tasks"] = list(by_client[c]["tasks"])
-        by_client[c]["unique_tasks"] = len(by_client[c]["tasks"])
+            total_hours += stats["hours"]
+            entry_count += stats["entries"]
     
     return {
         "period": period,
         "total_billable_hours": total_hours,
         "by_client": by_client,
-        "entry_count": len(filtered),
+        "entry_count": entry_count,
         "generated_at": datetime.now().isoformat()
     }
 
 
+@instrumented("work")
+@_writes_tasks
 def update_task(
     task_id: str,
     priority: Optional[str] = None,
@@ -463,24 +941,32 @@ def update_task(
     Returns:
         dict with updated task
     """
-    tasks = _load_tasks()
+    tasks = dict(_load_tasks())
     
     if task_id not in tasks:
         return {"error": f"Task '{task_id}' not found."}
     
-    task = tasks[task_id]
+    task = dict(tasks[task_id])
     
+    # Validate everything before applying any change
     if priority:
         if priority not in ("P0", "P1", "P2", "P3"):
             return {"error": f"Invalid priority '{priority}'."}
         if priority == "P0" and task.get("priority") != "P0":
             if _count_p0_tasks(tasks) >= MAX_P0_TASKS:
                 return {"error": f"Cannot promote to P0. Max {MAX_P0_TASKS} P0 tasks active."}
-        task["priority"] = priority
     
     if status:
         if status not in ("active", "blocked", "completed"):
             return {"error": f"Invalid status '{status}'."}
+        if (status != "completed" and task.get("status") == "completed"
+                and _is_duplicate(tasks, task.get("title", ""), task.get("client"))):
+            return {"error": f"Cannot reopen: an open task '{task.get('title')}' for client '{task.get('client')}' already exists."}
+    
+    if priority:
+        task["priority"] = priority
+    
+    if status:
         task["status"] = status
         if status == "completed":
             task["completed_at"] = datetime.now().isoformat()
@@ -498,13 +984,23 @@ def update_task(
     return {
         "task_id": task_id,
         "status": "updated",
-        "task": task,
+        "task": _with_logged_hours(task_id, task, _logged_hours()),
         "message": f"Task '{task_id}' updated successfully."
     }
 
 
 # ---------- Server Entry Point ----------
 
+def get_stats() -> dict:
+    """
+    Get per-tool call metrics.
+    
+    Returns:
+        Call counts, latency percentiles, bytes read/written and saves per tool
+    """
+    return {"server": "work", "tools": registry.snapshot("work")}
+
+
 def get_server_info() -> dict:
     """Return server metadata and available tools."""
     return {
@@ -523,8 +1019,34 @@ def get_server_info() -> dict:
 
 
 if __name__ == "__main__":
-    print("Work Server - Task Management MCP Server")
-    print(f"Vault path: {VAULT_PATH}")
-    print(f"Tasks file: {TASKS_FILE}")
-    info = get_server_info()
-    print(f"Available tools: {', '.join(info['tools'])}")
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Work Server - Task Management MCP Server")
+    parser.add_argument(
+        "--rebuild-rollups",
+        action="store_true",
+        help="Regenerate billable-hours rollups from the hours ledger"
+    )
+    parser.add_argument(
+        "--info",
+        action="store_true",
+        help="Print server configuration instead of serving on stdio"
+    )
+    args = parser.parse_args()
+    
+    if args.rebuild_rollups:
+        result = rebuild_rollups()
+        print(f"Rebuilt rollups from {result['entries']} entries over {result['months']} months")
+        print(f"Rollups file: {result['rollups_file']}")
+    elif args.info:
+        print("Work Server - Task Management MCP Server")
+        print(f"Vault path: {VAULT_PATH}")
+        print(f"Tasks file: {TASKS_FILE}")
+        info = get_server_info()
+        print(f"Available tools: {', '.join(info['tools'])}")
+    else:
+        from .stdio_server import StdioServer
+        
+        info = get_server_info()
+        tools = {name: globals()[name] for name in info["tools"]}
+        StdioServer(info["name"], info["version"], tools, batch=lambda names: batch()).run()
@@ -0,0 +1,267 @@
+"""
+Tool Call Metrics
+
+Per-tool call counts, latency percentiles, bytes read and written and
+storage saves, collected in-process. Server tools are wrapped with
+instrument(); storage code reports its I/O with record_io() and
+record_save(), which count towards every tool call running in the
+current thread (a tool calling another tool counts for both).
+
+Snapshots are exposed through the servers' get_stats() and, when
+Config.METRICS_FILE is set, written to that file in Prometheus text
+format at most every Config.METRICS_INTERVAL seconds.
+"""
+
+import functools
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import Optional, Union
+
+from . import profiling
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# Latencies kept per tool for percentiles (most recent calls)
+LATENCY_SAMPLES = 1024
+
+_local = threading.local()
+
+
+def _active_calls() -> list:
+    """Counters of the tool calls running in this thread, outermost first."""
+    calls = getattr(_local, "calls", None)
+    if calls is None:
+        calls = _local.calls = []
+    return calls
+
+
+def record_io(read: int = 0, written: int = 0) -> None:
+    """
+    Count bytes read from or written to storage by the running tool calls.
+    
+    Args:
+        read: Bytes read
+        written: Bytes written
+    """
+    for counters in getattr(_local, "calls", ()):
+        counters[0] += read
+        counters[1] += written
+
+
+def record_save() -> None:
+    """Count one write of a server's data to its storage engine."""
+    for counters in getattr(_local, "calls", ()):
+        counters[2] += 1
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values (0.0 when empty)."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+class ToolStats:
+    """Running totals for one tool."""
+    
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.saves = 0
+        self.latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+    
+    def snapshot(self) -> dict:
+        """Return the totals with p50/p95/p99 latency in milliseconds."""
+        ordered = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.seconds * 1000, 3),
+            "p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+            "p95_ms": round(_percentile(ordered, 0.95) * 1000, 3),
+            "p99_ms": round(_percentile(ordered, 0.99) * 1000, 3),
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "saves": self.saves
+        }
+
+
+class MetricsRegistry:
+    """Tool statistics keyed by (server, tool)."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[tuple[str, str], ToolStats] = {}
+        self._last_export = 0.0
+    
+    def record(
+        self,
+        server: str,
+        tool: str,
+        seconds: float,
+        error: bool,
+        read: int = 0,
+        written: int = 0,
+        saves: int = 0
+    ) -> None:
+        """Add one finished call to a tool's statistics."""
+        with self._lock:
+            stats = self._stats.get((server, tool))
+            if stats is None:
+                stats = self._stats[(server, tool)] = ToolStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.seconds += seconds
+            stats.latencies.append(seconds)
+            stats.bytes_read += read
+            stats.bytes_written += written
+            stats.saves += saves
+    
+    def snapshot(self, server: Optional[str] = None) -> dict:
+        """
+        Get tool statistics.
+        
+        Args:
+            server: Only this server's tools, keyed by tool name
+        
+        Returns:
+            Statistics by tool, or by server and tool when server is None
+        """
+        with self._lock:
+            items = [(key, stats.snapshot()) for key, stats in self._stats.items()]
+        
+        if server is not None:
+            return {tool: stats for (name, tool), stats in sorted(items) if name == server}
+        
+        result: dict[str, dict] = {}
+        for (name, tool), stats in sorted(items):
+            result.setdefault(name, {})[tool] = stats
+        return result
+    
+    def reset(self) -> None:
+        """Discard all statistics."""
+        with self._lock:
+            self._stats = {}
+    
+    def prometheus(self) -> str:
+        """Render the statistics in Prometheus text exposition format."""
+        metrics = [
+            ("freelance_tool_calls_total", "counter", "Tool calls", "calls"),
+            ("freelance_tool_errors_total", "counter", "Tool calls that failed or returned an error", "errors"),
+            ("freelance_tool_read_bytes_total", "counter", "Bytes read from storage", "bytes_read"),
+            ("freelance_tool_written_bytes_total", "counter", "Bytes written to storage", "bytes_written"),
+            ("freelance_tool_saves_total", "counter", "Writes to the storage engine", "saves"),
+        ]
+        snapshot = self.snapshot()
+        labelled = [
+            (f'server="{server}",tool="{tool}"', stats)
+            for server, tools in snapshot.items()
+            for tool, stats in tools.items()
+        ]
+        
+        lines = []
+        for name, kind, help_text, field in metrics:
+            lines.append(f"# HELP {name} {help_text}.")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{{{labels}}} {stats[field]}" for labels, stats in labelled)
+        
+        name = "freelance_tool_latency_seconds"
+        lines.append(f"# HELP {name} Tool call latency.")
+        lines.append(f"# TYPE {name} summary")
+        for labels, stats in labelled:
+            for quantile, field in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'{name}{{{labels},quantile="{quantile}"}} {stats[field] / 1000}')
+            lines.append(f"{name}_sum{{{labels}}} {stats['total_ms'] / 1000}")
+            lines.append(f"{name}_count{{{labels}}} {stats['calls']}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def write_prometheus(self, path: Union[str, Path]) -> None:
+        """
+        Write the statistics to a Prometheus text file atomically.
+        
+        Args:
+            path: Output file, e.g. for node_exporter's textfile collector
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(self.prometheus())
+        os.replace(tmp_path, path)
+    
+    def maybe_export(self) -> None:
+        """Write Config.METRICS_FILE if configured and the interval has passed."""
+        if not Config.METRICS_FILE:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_export < Config.METRICS_INTERVAL:
+                return
+            self._last_export = now
+        try:
+            self.write_prometheus(Config.METRICS_FILE)
+        except OSError as e:
+            logger.warning("Failed to write metrics to %s: %s", Config.METRICS_FILE, e)
+
+
+# Process-wide registry shared by all servers
+registry = MetricsRegistry()
+
+
+def instrument(server: Optional[str], func: Callable, tool: Optional[str] = None) -> Callable:
+    """
+    Wrap a tool function so every call is timed and its I/O counted.
+    
+    A call counts as an error if it raises or returns a dict with an
+    'error' key. Calls selected by core.profiling are also profiled.
+    
+    Args:
+        server: Server name the statistics are filed under; None for
+            methods, which are filed under their instance's server_name
+        func: Tool function or method
+        tool: Tool name (default: the function's name)
+    
+    Returns:
+        Wrapped function with the same signature
+    """
+    tool = tool or func.__name__
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        name = server or args[0].server_name
+        counters = [0, 0, 0]
+        calls = _active_calls()
+        calls.append(counters)
+        profile = None
+        error = True
+        start = time.perf_counter()
+        try:
+            profile = profiling.start(name, tool)
+            result = func(*args, **kwargs)
+            error = isinstance(result, dict) and "error" in result
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            calls.pop()
+            if profile is not None:
+                profiling.finish(profile, elapsed)
+            registry.record(name, tool, elapsed, error, *counters)
+            registry.maybe_export()
+    
+    return wrapper
+
+
+def instrumented(server: str) -> Callable[[Callable], Callable]:
+    """Decorator form of instrument() for module-level tool functions."""
+    return lambda func: instrument(server, func)
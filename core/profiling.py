@@ -0,0 +1,206 @@
+"""
+Opt-in Tool Call Profiling
+
+Profiles selected tool calls without code changes. Calls to the tools
+named in Config.PROFILE_TOOLS, plus a random Config.PROFILE_SAMPLE_PERCENT
+of all other calls, run under cProfile and tracemalloc. Each profiled call
+leaves two files in the profile directory:
+
+- ``{time}-{server}-{tool}.prof``: cProfile stats (open with pstats or snakeviz)
+- ``{time}-{server}-{tool}.memory.txt``: top allocations by source line
+
+The oldest files are deleted once the directory grows past
+Config.PROFILE_MAX_MB.
+
+Usage:
+    PROFILE_TOOLS=billing.get_revenue_report python -m core.mcp.host
+    python -c "import pstats; pstats.Stats('data/profiles/....prof').sort_stats('cumtime').print_stats(20)"
+"""
+
+import cProfile
+import logging
+import random
+import threading
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# Allocation sites listed per memory report
+TOP_ALLOCATIONS = 25
+
+_local = threading.local()
+_rotate_lock = threading.Lock()
+
+# tracemalloc is process-wide: it runs while any profiled call is active,
+# unless something else already started it
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+def profile_dir() -> Path:
+    """Directory profiles are written to (Config.PROFILE_DIR or data/profiles)."""
+    return Path(Config.PROFILE_DIR) if Config.PROFILE_DIR else Config.DATA_DIR / "profiles"
+
+
+def _targets() -> set[str]:
+    """Tool names from Config.PROFILE_TOOLS."""
+    return {name.strip() for name in Config.PROFILE_TOOLS.split(",") if name.strip()}
+
+
+def should_profile(server: str, tool: str) -> bool:
+    """
+    Decide whether to profile a call.
+    
+    Args:
+        server: Server name, e.g. 'billing'
+        tool: Tool name, e.g. 'get_revenue_report'
+    
+    Returns:
+        True if the tool is targeted (as 'tool' or 'server.tool') or the
+        call is sampled
+    """
+    if Config.PROFILE_TOOLS:
+        targets = _targets()
+        if tool in targets or f"{server}.{tool}" in targets:
+            return True
+    return Config.PROFILE_SAMPLE_PERCENT > 0 and random.random() * 100 < Config.PROFILE_SAMPLE_PERCENT
+
+
+class ToolProfile:
+    """
+    cProfile and tracemalloc capture of one tool call.
+    
+    The memory report covers allocations made while the call ran,
+    including those of other threads profiled at the same time.
+    """
+    
+    def __init__(self, server: str, tool: str):
+        self.server = server
+        self.tool = tool
+        self._profiler = cProfile.Profile()
+    
+    def start(self) -> None:
+        """Start tracing allocations and profiling the current thread."""
+        global _tracemalloc_users, _tracemalloc_owned
+        with _tracemalloc_lock:
+            if _tracemalloc_users == 0:
+                _tracemalloc_owned = not tracemalloc.is_tracing()
+                if _tracemalloc_owned:
+                    tracemalloc.start()
+            _tracemalloc_users += 1
+        try:
+            self._profiler.enable()
+        except Exception:
+            with _tracemalloc_lock:
+                _release_tracemalloc()
+            raise
+    
+    def finish(self, seconds: float) -> list[Path]:
+        """
+        Stop profiling and write the .prof dump and the memory report.
+        
+        Args:
+            seconds: Wall time of the call, noted in the memory report
+        
+        Returns:
+            Paths of the files written
+        """
+        self._profiler.disable()
+        with _tracemalloc_lock:
+            snapshot = tracemalloc.take_snapshot()
+            _release_tracemalloc()
+        
+        directory = profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{self.server}-{self.tool}"
+        
+        prof_path = directory / f"{stem}.prof"
+        self._profiler.dump_stats(prof_path)
+        
+        memory_path = directory / f"{stem}.memory.txt"
+        lines = [f"{self.server}.{self.tool} took {seconds * 1000:.1f} ms", ""]
+        statistics = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+        )).statistics("lineno")
+        lines.extend(str(stat) for stat in statistics[:TOP_ALLOCATIONS])
+        memory_path.write_text("\n".join(lines) + "\n")
+        
+        rotate()
+        return [prof_path, memory_path]
+
+
+def _release_tracemalloc() -> None:
+    """Drop one tracemalloc user, stopping it after the last (caller holds _tracemalloc_lock)."""
+    global _tracemalloc_users
+    _tracemalloc_users -= 1
+    if _tracemalloc_users == 0 and _tracemalloc_owned:
+        tracemalloc.stop()
+
+
+def start(server: str, tool: str) -> Optional[ToolProfile]:
+    """
+    Start profiling a tool call if it is targeted or sampled.
+    
+    Calls nested inside a profiled call are covered by the outer profile.
+    A profiler that fails to start is logged and the call runs unprofiled.
+    
+    Args:
+        server: Server name
+        tool: Tool name
+    
+    Returns:
+        Running profile to finish() after the call, or None
+    """
+    if getattr(_local, "active", False) or not should_profile(server, tool):
+        return None
+    
+    profile = ToolProfile(server, tool)
+    _local.active = True
+    try:
+        profile.start()
+    except Exception as e:
+        _local.active = False
+        logger.warning("Failed to start profiling %s.%s: %s", server, tool, e)
+        return None
+    return profile
+
+
+def finish(profile: ToolProfile, seconds: float) -> None:
+    """Finish a profile from start(); failures to write are logged, not raised."""
+    _local.active = False
+    try:
+        profile.finish(seconds)
+    except Exception as e:
+        logger.warning("Failed to write profile for %s.%s: %s", profile.server, profile.tool, e)
+
+
+def rotate() -> None:
+    """Delete the oldest profile files until the directory is within Config.PROFILE_MAX_MB."""
+    directory = profile_dir()
+    limit = Config.PROFILE_MAX_MB * 1024 * 1024
+    
+    with _rotate_lock:
+        files = []
+        for path in directory.glob("*"):
+            if path.suffix not in (".prof", ".txt"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime_ns, path.name, stat.st_size, path))
+        files.sort()
+        
+        total = sum(size for _, _, size, _ in files)
+        for _, _, size, path in files:
+            if total <= limit:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,74 @@
+"""
+Storage Engines for MCP Server Data
+
+Pluggable persistence backends for BaseMCPServer:
+- json: single JSON snapshot rewritten on every save (default)
+- journal: JSON snapshot plus an append-only write-ahead log
+- sqlite: one SQLite table per collection, loaded on first access
+- split: one JSON file per collection, loaded on first access
+
+The backend is chosen per server with Config.get_storage_backend(). Any
+backend can be written behind the tool calls with Config.WRITE_MODE (see
+write_behind).
+"""
+
+from pathlib import Path
+from typing import Union
+
+from ..config import Config
+from .base import LazyCollections, StorageEngine
+from .json_store import JSONStorage
+from .journal import JournaledStorage
+from .split_store import SplitFileStorage
+from .sqlite_store import SQLiteStorage, migrate_json_to_sqlite
+
+BACKENDS = {
+    "json": JSONStorage,
+    "journal": JournaledStorage,
+    "sqlite": SQLiteStorage,
+    "split": SplitFileStorage,
+}
+
+
+def get_storage_engine(backend: str, data_path: Union[str, Path]) -> StorageEngine:
+    """
+    Create a storage engine by backend name.
+    
+    Args:
+        backend: Backend name (see BACKENDS)
+        data_path: Path of the server's primary data file
+    
+    Returns:
+        Storage engine instance
+    """
+    backend = backend.lower()
+    
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown storage backend '{backend}'. Must be one of: {', '.join(BACKENDS)}"
+        )
+    
+    if backend == "sqlite":
+        return SQLiteStorage(data_path)
+    
+    if backend == "journal":
+        return JournaledStorage(
+            data_path,
+            compact_threshold=Config.JOURNAL_COMPACT_THRESHOLD,
+            codec=Config.DATA_CODEC
+        )
+    
+    return BACKENDS[backend](data_path, codec=Config.DATA_CODEC)
+
+
+__all__ = [
+    "StorageEngine",
+    "LazyCollections",
+    "JSONStorage",
+    "JournaledStorage",
+    "SQLiteStorage",
+    "SplitFileStorage",
+    "migrate_json_to_sqlite",
+    "BACKENDS",
+    "get_storage_engine",
+]
@@ -0,0 +1,167 @@
+"""
+Storage Engine Base Class
+
+Defines the interface every persistence backend implements so that
+BaseMCPServer can stay agnostic of how its collections reach disk.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from collections.abc import ItemsView, Iterable, Iterator, MutableMapping
+from pathlib import Path
+from typing import Any, Callable, Union
+
+# Collection names that are safe to use as table or file names
+COLLECTION_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class StorageEngine(ABC):
+    """Base class for MCP server persistence backends."""
+    
+    def __init__(self, data_path: Union[str, Path]):
+        """
+        Initialize the storage engine.
+        
+        Args:
+            data_path: Path of the server's primary data file
+        """
+        self.data_path = Path(data_path)
+    
+    @abstractmethod
+    def load(self) -> dict:
+        """
+        Load the full data store.
+        
+        Returns:
+            Dictionary of collections
+        """
+        pass
+    
+    @abstractmethod
+    def save(self, data: dict) -> bool:
+        """
+        Persist the full data store.
+        
+        Args:
+            data: Dictionary of collections
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        pass
+    
+    def record_changed(self, data: dict, collection_name: str, record_id: str) -> bool:
+        """
+        Persist a single record mutation.
+        
+        The record is considered deleted when it is no longer present in
+        ``data[collection_name]``. Backends that cannot write individual
+        records fall back to a full save.
+        
+        Args:
+            data: Dictionary of collections (already mutated)
+            collection_name: Collection containing the record
+            record_id: Record identifier
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.save(data)
+    
+    def records_changed(self, data: dict, changes: list[tuple[str, str]]) -> bool:
+        """
+        Persist a batch of record mutations as one atomic write.
+        
+        Backends without a cheaper batch write fall back to a single full
+        save, which is atomic because snapshots are swapped in whole.
+        
+        Args:
+            data: Dictionary of collections (already mutated)
+            changes: (collection_name, record_id) pairs that changed
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.save(data)
+    
+    def files(self) -> list[Path]:
+        """
+        List the files holding the data store.
+        
+        Returns:
+            Paths of the store's files (some may not exist yet)
+        """
+        return [self.data_path]
+    
+    def count_records(self, collection_name: str) -> int:
+        """
+        Count a stored collection's records without keeping it in memory.
+        
+        Backends that return LazyCollections from load() override this
+        with a cheaper count; the default loads the whole store.
+        
+        Args:
+            collection_name: Collection to count
+        
+        Returns:
+            Number of records
+        """
+        return len(self.load().get(collection_name, {}))
+    
+    def close(self) -> None:
+        """Release any resources held by the engine."""
+        pass
+
+
+class LazyCollections(MutableMapping):
+    """
+    Dictionary of collections that loads each collection on first access.
+    
+    Used by backends that can read one collection without parsing the rest
+    of the data store. Membership tests and iteration only consult the
+    known collection names, so they never trigger a load.
+    """
+    
+    def __init__(self, loader: Callable[[str], dict], names: Iterable[str]):
+        """
+        Initialize the lazy mapping.
+        
+        Args:
+            loader: Function returning a collection's records by name
+            names: Names of collections that exist in storage
+        """
+        self._loader = loader
+        self._names = dict.fromkeys(names)
+        self._loaded: dict[str, Any] = {}
+    
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._loaded:
+            if name not in self._names:
+                raise KeyError(name)
+            self._loaded[name] = self._loader(name)
+        return self._loaded[name]
+    
+    def __setitem__(self, name: str, value: Any) -> None:
+        self._loaded[name] = value
+        self._names[name] = None
+    
+    def __delitem__(self, name: str) -> None:
+        del self._names[name]
+        self._loaded.pop(name, None)
+    
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a collection has been read into memory."""
+        return name in self._loaded
+    
+    def loaded_items(self) -> ItemsView:
+        """Collections that have been read into memory."""
+        return self._loaded.items()
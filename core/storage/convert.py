@@ -0,0 +1,99 @@
+"""
+Data File Codec Converter
+
+Rewrites existing ``data/*_data.json`` snapshots (and split collection
+files under ``data/*_data/``) with another codec. Files are read in
+whatever format they are in, so conversion works in either direction.
+
+Usage:
+    python -m core.storage.convert msgpack                 # all servers
+    python -m core.storage.convert compact billing client  # selected servers
+"""
+
+import argparse
+from pathlib import Path
+
+from ..codecs import CODECS, decode, get_codec
+from ..config import Config
+from ..utils import save_json
+
+
+def convert_file(path: Path, codec: str) -> dict:
+    """
+    Re-encode one data file in place.
+    
+    Args:
+        path: Data file to convert
+        codec: Target codec name
+    
+    Returns:
+        Conversion result with file sizes before and after
+    """
+    try:
+        before = path.stat().st_size
+        data = decode(path.read_bytes())
+    except (ValueError, IOError) as e:
+        # Never rewrite a file that could not be read
+        return {"error": f"Failed to read {path}: {e}"}
+    
+    if not save_json(path, data, codec=get_codec(codec)):
+        return {"error": f"Failed to write {path}"}
+    
+    return {
+        "success": True,
+        "file": str(path),
+        "bytes_before": before,
+        "bytes_after": path.stat().st_size
+    }
+
+
+def convert_all(codec: str, server_names: list[str] = None) -> dict:
+    """
+    Convert server data files in the data directory to a codec.
+    
+    Args:
+        codec: Target codec name
+        server_names: Servers to convert (defaults to every server with data)
+    
+    Returns:
+        Conversion results keyed by file name
+    """
+    if server_names:
+        prefixes = [f"{name}_data" for name in server_names]
+    else:
+        prefixes = sorted({
+            path.name[:-len(".json")] if path.is_file() else path.name
+            for path in Config.DATA_DIR.glob("*_data*")
+            if path.is_dir() or path.suffix == ".json"
+        })
+    
+    results = {}
+    for prefix in prefixes:
+        snapshot = Config.DATA_DIR / f"{prefix}.json"
+        files = [snapshot] if snapshot.exists() else []
+        files += sorted((Config.DATA_DIR / prefix).glob("*.json"))
+        
+        for path in files:
+            results[str(path.relative_to(Config.DATA_DIR))] = convert_file(path, codec)
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert MCP server data files to another codec")
+    parser.add_argument("codec", choices=sorted(CODECS), help="Target codec")
+    parser.add_argument("servers", nargs="*", help="Server names (default: all)")
+    args = parser.parse_args()
+    
+    results = convert_all(args.codec, args.servers)
+    
+    if not results:
+        print(f"No data files found in {Config.DATA_DIR}")
+    
+    for name, result in results.items():
+        if result.get("success"):
+            print(f"✓ {name}: {result['bytes_before']:,} -> {result['bytes_after']:,} bytes")
+        else:
+            print(f"✗ {name}: {result['error']}")
+    
+    print(f"\nSet DATA_CODEC={args.codec} so servers keep writing this format.")
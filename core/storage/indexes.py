@@ -0,0 +1,481 @@
+"""
+In-Memory Collection Indexes
+
+Secondary index structures maintained by BaseMCPServer alongside its
+collections so that common queries avoid scanning every record.
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from collections.abc import Callable, Hashable
+from datetime import date, datetime
+from typing import Any, Iterable, Optional, Union
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: Any) -> list[str]:
+    """
+    Split a value into lowercase word tokens.
+    
+    Args:
+        text: Value to tokenize (non-strings are converted with str())
+    
+    Returns:
+        Tokens in order of appearance
+    """
+    return _TOKEN_PATTERN.findall(str(text).lower())
+
+
+class HashIndex:
+    """
+    Equality index mapping a field's values to record IDs.
+    
+    Buckets preserve insertion order so that index lookups return records
+    in the same order as the collection itself. Records whose value is
+    unhashable (lists, dicts) are not indexed; they can never equal a
+    hashable lookup value anyway. The index remembers each record's value,
+    so a record changed in place is still moved out of its old bucket.
+    """
+    
+    def __init__(self, field: str):
+        """
+        Initialize the index.
+        
+        Args:
+            field: Record field to index
+        """
+        self.field = field
+        self._buckets: dict[Any, dict[str, None]] = {}
+        self._values: dict[str, Any] = {}
+    
+    def build(self, collection: dict) -> None:
+        """
+        Index every record of a collection.
+        
+        Args:
+            collection: Records keyed by ID
+        """
+        self._buckets = {}
+        self._values = {}
+        for record_id, record in collection.items():
+            self.add(record_id, record.get(self.field))
+    
+    def add(self, record_id: str, value: Any) -> None:
+        """Index a record under a value, replacing any previous value."""
+        if record_id in self._values and self._values[record_id] == value:
+            return
+        
+        self.discard(record_id)
+        if isinstance(value, Hashable):
+            self._buckets.setdefault(value, {})[record_id] = None
+            self._values[record_id] = value
+    
+    def discard(self, record_id: str) -> None:
+        """Drop a record from the index."""
+        if record_id not in self._values:
+            return
+        value = self._values.pop(record_id)
+        bucket = self._buckets[value]
+        del bucket[record_id]
+        if not bucket:
+            del self._buckets[value]
+    
+    def lookup(self, value: Any) -> Optional[dict[str, None]]:
+        """
+        Get IDs of records whose field equals value.
+        
+        Args:
+            value: Value to match
+        
+        Returns:
+            Ordered record IDs, or None if value cannot be looked up
+        """
+        if not isinstance(value, Hashable):
+            return None
+        return self._buckets.get(value, {})
+    
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class UniqueIndex:
+    """
+    Unique constraint over one or more record fields, backed by a hash map.
+    
+    Maps each record's key (its tuple of field values) to the one record
+    that holds it, so checking a new record for duplicates is O(1).
+    Records whose constrained fields are all empty, or that fail the
+    optional condition (e.g. completed tasks), are exempt.
+    """
+    
+    def __init__(
+        self,
+        fields: Iterable[str],
+        case_insensitive: Union[bool, Iterable[str]] = False,
+        condition: Optional[Callable[[dict], bool]] = None
+    ):
+        """
+        Initialize the index.
+        
+        Args:
+            fields: Record fields that must be unique together
+            case_insensitive: True to compare every string field
+                case-insensitively, or the names of the fields to
+            condition: Only records for which this returns True are
+                constrained
+        """
+        self.fields = tuple(fields)
+        if case_insensitive is True:
+            case_insensitive = self.fields
+        self.case_insensitive = frozenset(case_insensitive or ())
+        self.condition = condition
+        self._owners: dict[tuple, str] = {}
+        self._keys: dict[str, tuple] = {}
+    
+    def key(self, record: dict) -> Optional[tuple]:
+        """
+        Get the constrained key of a record.
+        
+        Args:
+            record: Record (or candidate field values)
+        
+        Returns:
+            Normalized field values, or None if the record is exempt
+        """
+        if self.condition is not None and not self.condition(record):
+            return None
+        
+        values = []
+        for field in self.fields:
+            value = record.get(field)
+            if isinstance(value, str) and field in self.case_insensitive:
+                value = value.lower()
+            values.append(value)
+        
+        key = tuple(values)
+        if all(value is None or value == "" for value in key):
+            return None
+        try:
+            hash(key)
+        except TypeError:
+            # Unhashable values (lists, dicts) cannot be constrained
+            return None
+        return key
+    
+    def build(self, collection: dict) -> None:
+        """
+        Index every record of a collection.
+        
+        Records that duplicate an earlier one are left unindexed, so data
+        written before the constraint existed still loads.
+        
+        Args:
+            collection: Records keyed by ID
+        """
+        self._owners = {}
+        self._keys = {}
+        for record_id, record in collection.items():
+            if self.conflict(record) is None:
+                self.add(record_id, record)
+    
+    def add(self, record_id: str, record: dict) -> None:
+        """Index a record under its current key, replacing any previous key."""
+        self.discard(record_id)
+        key = self.key(record)
+        if key is not None:
+            self._owners[key] = record_id
+            self._keys[record_id] = key
+    
+    def discard(self, record_id: str) -> None:
+        """Drop a record from the index."""
+        key = self._keys.pop(record_id, None)
+        if key is not None and self._owners.get(key) == record_id:
+            del self._owners[key]
+    
+    def conflict(self, record: dict, record_id: Optional[str] = None) -> Optional[str]:
+        """
+        Find another record holding the same key.
+        
+        Args:
+            record: Record (or candidate field values) to check
+            record_id: ID of the record itself, which never conflicts
+        
+        Returns:
+            ID of the conflicting record, or None
+        """
+        key = self.key(record)
+        if key is None:
+            return None
+        owner = self._owners.get(key)
+        return owner if owner != record_id else None
+    
+    def __len__(self) -> int:
+        return len(self._owners)
+
+
+class TextIndex:
+    """
+    Inverted full-text index over one or more record fields.
+    
+    Each token maps to the records containing it and how often. The sorted
+    vocabulary makes prefix lookups a binary search, so queries cost time
+    proportional to the matching records rather than the collection size.
+    """
+    
+    # Score multiplier for a token that only matches as a prefix
+    PREFIX_WEIGHT = 0.5
+    
+    def __init__(self, fields: Iterable[str]):
+        """
+        Initialize the index.
+        
+        Args:
+            fields: Record fields whose text is indexed
+        """
+        self.fields = tuple(fields)
+        self._postings: dict[str, dict[str, int]] = {}
+        self._terms: list[str] = []
+        self._docs: dict[str, Counter] = {}
+    
+    def _tokens(self, record: dict) -> Counter:
+        """Count the tokens of a record's indexed fields."""
+        counts = Counter()
+        for field in self.fields:
+            value = record.get(field)
+            if value is not None:
+                counts.update(tokenize(value))
+        return counts
+    
+    def build(self, collection: dict) -> None:
+        """
+        Index every record of a collection.
+        
+        Args:
+            collection: Records keyed by ID
+        """
+        self._postings = {}
+        self._docs = {}
+        for record_id, record in collection.items():
+            counts = self._tokens(record)
+            self._docs[record_id] = counts
+            for term, count in counts.items():
+                self._postings.setdefault(term, {})[record_id] = count
+        self._terms = sorted(self._postings)
+    
+    def add(self, record_id: str, record: dict) -> None:
+        """Index a record, replacing any previous version of it."""
+        self.remove(record_id)
+        
+        counts = self._tokens(record)
+        self._docs[record_id] = counts
+        for term, count in counts.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                insort(self._terms, term)
+            posting[record_id] = count
+    
+    def remove(self, record_id: str) -> None:
+        """Drop a record from the index."""
+        counts = self._docs.pop(record_id, None)
+        if counts is None:
+            return
+        
+        for term in counts:
+            posting = self._postings[term]
+            del posting[record_id]
+            if not posting:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+    
+    def _expand(self, prefix: str) -> Iterable[str]:
+        """Yield indexed terms starting with prefix."""
+        i = bisect_left(self._terms, prefix)
+        while i < len(self._terms) and self._terms[i].startswith(prefix):
+            yield self._terms[i]
+            i += 1
+    
+    def search(self, query: str, limit: Optional[int] = None) -> list[str]:
+        """
+        Find records matching every query token, best matches first.
+        
+        Query tokens match indexed tokens exactly or as a prefix ("dev"
+        matches "developer"). Records are scored by TF-IDF, with prefix
+        matches weighted lower than exact ones; ties keep index order.
+        
+        Args:
+            query: Free-text query
+            limit: Maximum number of IDs to return
+        
+        Returns:
+            Matching record IDs, highest score first
+        """
+        total = len(self._docs)
+        
+        # Expand every token up front and start with the most selective one
+        expanded = []
+        for token in dict.fromkeys(tokenize(query)):
+            terms = [(term, self._postings[term]) for term in self._expand(token)]
+            if not terms:
+                return []
+            size = sum(len(posting) for _, posting in terms)
+            expanded.append((size, token, terms))
+        expanded.sort(key=lambda item: item[0])
+        
+        scores: Optional[dict[str, float]] = None
+        for _, token, terms in expanded:
+            weights = []
+            for term, posting in terms:
+                weight = math.log(1 + total / len(posting))
+                if term != token:
+                    weight *= self.PREFIX_WEIGHT
+                weights.append((posting, weight))
+            
+            if scores is None:
+                scores = {}
+                for posting, weight in weights:
+                    for record_id, count in posting.items():
+                        scores[record_id] = scores.get(record_id, 0.0) + count * weight
+                continue
+            
+            # Only the surviving candidates need scoring for later tokens
+            narrowed = {}
+            for record_id, score in scores.items():
+                token_score = 0.0
+                for posting, weight in weights:
+                    count = posting.get(record_id)
+                    if count:
+                        token_score += count * weight
+                if token_score:
+                    narrowed[record_id] = score + token_score
+            scores = narrowed
+            if not scores:
+                return []
+        
+        if scores is None:
+            return []
+        if limit is not None:
+            return heapq.nlargest(limit, scores, key=scores.get)
+        return sorted(scores, key=scores.get, reverse=True)
+    
+    def __len__(self) -> int:
+        return len(self._docs)
+
+
+def date_ordinal(value: Any) -> Optional[int]:
+    """
+    Convert an ISO date or datetime to a day ordinal.
+    
+    Args:
+        value: date, datetime or ISO string ("2024-03-01" or "2024-03-01T09:00:00")
+    
+    Returns:
+        Proleptic Gregorian ordinal, or None if value is not a date
+    """
+    if isinstance(value, (date, datetime)):
+        return value.toordinal()
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value[:10]).toordinal()
+        except ValueError:
+            return None
+    return None
+
+
+def _required_ordinal(value: Any) -> int:
+    """Convert a range bound to an ordinal, rejecting non-dates."""
+    ordinal = date_ordinal(value)
+    if ordinal is None:
+        raise ValueError(f"Invalid date: {value!r}")
+    return ordinal
+
+
+class DateIndex:
+    """
+    Sorted index of a date field, stored as day ordinals.
+    
+    Range lookups are two binary searches, so a period query touches only
+    the records inside the period. Records without a parseable date are
+    not indexed.
+    """
+    
+    def __init__(self, field: str):
+        """
+        Initialize the index.
+        
+        Args:
+            field: Record field holding an ISO date
+        """
+        self.field = field
+        self._entries: list[tuple[int, str]] = []
+        self._ordinals: dict[str, int] = {}
+    
+    def build(self, collection: dict) -> None:
+        """
+        Index every record of a collection.
+        
+        Args:
+            collection: Records keyed by ID
+        """
+        self._ordinals = {}
+        for record_id, record in collection.items():
+            ordinal = date_ordinal(record.get(self.field))
+            if ordinal is not None:
+                self._ordinals[record_id] = ordinal
+        self._entries = sorted((ordinal, record_id) for record_id, ordinal in self._ordinals.items())
+    
+    def add(self, record_id: str, value: Any) -> None:
+        """Index a record under a date, replacing any previous date."""
+        ordinal = date_ordinal(value)
+        if ordinal is not None and self._ordinals.get(record_id) == ordinal:
+            return
+        
+        self.discard(record_id)
+        if ordinal is not None:
+            self._ordinals[record_id] = ordinal
+            insort(self._entries, (ordinal, record_id))
+    
+    def discard(self, record_id: str) -> None:
+        """Drop a record from the index."""
+        ordinal = self._ordinals.pop(record_id, None)
+        if ordinal is not None:
+            del self._entries[bisect_left(self._entries, (ordinal, record_id))]
+    
+    def _bounds(self, start: Any, end: Any) -> tuple[int, int]:
+        """Positions of the first entry on or after start and the first after end."""
+        low = 0
+        high = len(self._entries)
+        if start is not None:
+            low = bisect_left(self._entries, (_required_ordinal(start),))
+        if end is not None:
+            high = bisect_left(self._entries, (_required_ordinal(end) + 1,))
+        return low, max(low, high)
+    
+    def range(self, start: Any = None, end: Any = None) -> list[str]:
+        """
+        Get IDs of records dated within an inclusive range, oldest first.
+        
+        Args:
+            start: First date to include (None for no lower bound)
+            end: Last date to include (None for no upper bound)
+        
+        Returns:
+            Record IDs in date order
+        
+        Raises:
+            ValueError: If a bound is not a date
+        """
+        low, high = self._bounds(start, end)
+        return [record_id for _, record_id in self._entries[low:high]]
+    
+    def count(self, start: Any = None, end: Any = None) -> int:
+        """Count records dated within an inclusive range without listing them."""
+        low, high = self._bounds(start, end)
+        return high - low
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,233 @@
+"""
+Journaled Storage
+
+JSON snapshot plus an append-only write-ahead log. Record mutations are
+appended to ``{server}_data.journal`` as one JSON line each, so a write
+costs O(record) instead of O(dataset). The journal is replayed on load and
+periodically compacted back into the snapshot. A transaction's changes are
+written as a single batch line, so replay applies them all or none.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Union
+
+from ..metrics import record_io
+from .json_store import JSONStorage
+
+logger = logging.getLogger(__name__)
+
+
+class JournaledStorage(JSONStorage):
+    """JSON snapshot with an append-only mutation journal."""
+    
+    def __init__(
+        self,
+        data_path: Union[str, Path],
+        compact_threshold: int = 500,
+        codec: str = "json"
+    ):
+        """
+        Initialize journaled storage.
+        
+        Args:
+            data_path: Path of the JSON snapshot file
+            compact_threshold: Journal entries to accumulate before compacting
+            codec: Codec used to write the snapshot
+        """
+        super().__init__(data_path, codec=codec)
+        self.journal_path = self.data_path.with_suffix(".journal")
+        self.compact_threshold = compact_threshold
+        self._journal_file = None
+        self._pending = 0
+    
+    def load(self) -> dict:
+        """Load the snapshot and replay any journaled mutations on top."""
+        data = super().load()
+        self._pending = self._replay(data)
+        return data
+    
+    def read(self, strict: bool = False) -> dict:
+        """
+        Load the snapshot and journal without modifying either file.
+        
+        For readers other than the server that owns the files, which may be
+        appending to the journal at the same moment.
+        
+        Args:
+            strict: Raise if the snapshot exists but cannot be read
+        
+        Returns:
+            Dictionary of collections
+        
+        Raises:
+            ValueError, IOError: If strict and the snapshot is unreadable, or
+                the journal is corrupt before its last line
+        """
+        data = self._load_snapshot(strict=strict)
+        self._replay(data, repair=False)
+        return data
+    
+    def _replay(self, data: dict, repair: bool = True) -> int:
+        """
+        Apply journal entries to data in order.
+        
+        Only the last line may be unreadable (the process died while
+        appending it); it is skipped and, with repair, cut off the file.
+        
+        Args:
+            data: Snapshot data to mutate
+            repair: Truncate a torn last line
+        
+        Returns:
+            Number of entries applied
+        
+        Raises:
+            ValueError: If an unreadable line is followed by further entries
+        """
+        if not self.journal_path.exists():
+            return 0
+        
+        applied = 0
+        good_offset = 0
+        torn_line = None
+        with open(self.journal_path, "rb") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    if torn_line is None:
+                        good_offset += len(line)
+                    continue
+                if torn_line is not None:
+                    raise ValueError(
+                        f"Corrupt journal entry at {self.journal_path}:{torn_line} "
+                        "is followed by further entries"
+                    )
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    torn_line = line_number
+                    continue
+                
+                # A batch is a single line, so it is applied all-or-nothing
+                for op in entry["entries"] if entry["op"] == "batch" else [entry]:
+                    collection = data.setdefault(op["collection"], {})
+                    if op["op"] == "put":
+                        collection[op["id"]] = op["record"]
+                    elif op["op"] == "delete":
+                        collection.pop(op["id"], None)
+                applied += 1
+                good_offset += len(line)
+        
+        record_io(read=good_offset)
+        
+        if torn_line is not None:
+            # A torn final line means the process died mid-append; everything
+            # before it is intact
+            logger.warning("Ignoring truncated journal entry at %s:%s", self.journal_path, torn_line)
+            if repair:
+                # Drop the torn bytes so later appends are not stranded behind them
+                with open(self.journal_path, "r+b") as f:
+                    f.truncate(good_offset)
+        
+        return applied
+    
+    def _append(self, entry: dict) -> None:
+        """
+        Append one entry to the journal.
+        
+        If the write fails partway, the journal is cut back to its previous
+        size, so no partial line is left for later entries to follow.
+        """
+        line = (json.dumps(entry, default=str, separators=(",", ":")) + "\n").encode("utf-8")
+        
+        if self._journal_file is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            # Unbuffered, so a failed write leaves nothing queued to retry
+            self._journal_file = open(self.journal_path, "ab", buffering=0)
+        
+        fd = self._journal_file.fileno()
+        size = os.fstat(fd).st_size
+        try:
+            written = 0
+            while written < len(line):
+                written += self._journal_file.write(line[written:])
+        except OSError:
+            try:
+                os.ftruncate(fd, size)
+            except OSError as e:
+                logger.error("Failed to truncate partial journal entry in %s: %s", self.journal_path, e)
+                # Leave the handle closed so the next append reopens the file
+                self._close_journal()
+            raise
+        record_io(written=len(line))
+    
+    def _entry(self, data: dict, collection_name: str, record_id: str) -> dict:
+        """Build a put or delete entry for a record's current state."""
+        collection = data.get(collection_name, {})
+        
+        if record_id in collection:
+            return {
+                "op": "put",
+                "collection": collection_name,
+                "id": record_id,
+                "record": collection[record_id]
+            }
+        return {"op": "delete", "collection": collection_name, "id": record_id}
+    
+    def record_changed(self, data: dict, collection_name: str, record_id: str) -> bool:
+        """Append a put or delete entry, compacting once the threshold is hit."""
+        return self._write_entry(data, self._entry(data, collection_name, record_id))
+    
+    def records_changed(self, data: dict, changes: list[tuple[str, str]]) -> bool:
+        """Append all changes as a single batch entry."""
+        entries = [self._entry(data, name, record_id) for name, record_id in changes]
+        return self._write_entry(data, {"op": "batch", "entries": entries})
+    
+    def _write_entry(self, data: dict, entry: dict) -> bool:
+        """Append an entry, compacting once the threshold is hit."""
+        try:
+            self._append(entry)
+        except (IOError, TypeError) as e:
+            logger.error("Failed to append to journal %s: %s", self.journal_path, e)
+            return False
+        
+        self._pending += 1
+        if self._pending >= self.compact_threshold and not self.save(data):
+            # The entry is already durable; compaction is retried on the next write
+            logger.warning("Failed to compact journal %s", self.journal_path)
+        return True
+    
+    def save(self, data: dict) -> bool:
+        """Write a full snapshot and discard the journal it supersedes."""
+        if not super().save(data):
+            return False
+        
+        self._close_journal()
+        try:
+            self.journal_path.unlink(missing_ok=True)
+        except OSError as e:
+            # Replaying a stale journal is idempotent, so this is not fatal
+            logger.warning("Failed to remove compacted journal %s: %s", self.journal_path, e)
+        self._pending = 0
+        return True
+    
+    def files(self) -> list[Path]:
+        """The snapshot and the journal."""
+        return [self.data_path, self.journal_path]
+    
+    @property
+    def pending_entries(self) -> int:
+        """Number of journal entries not yet compacted into the snapshot."""
+        return self._pending
+    
+    def _close_journal(self) -> None:
+        """Close the open journal handle, if any."""
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+    
+    def close(self) -> None:
+        """Close the journal handle."""
+        self._close_journal()
@@ -0,0 +1,40 @@
+"""
+JSON Snapshot Storage
+
+The original persistence model: the whole data store is serialized to a
+single JSON file on every save.
+"""
+
+from pathlib import Path
+from typing import Union
+
+from ..codecs import get_codec
+from ..utils import load_json, save_json
+from .base import StorageEngine
+
+
+class JSONStorage(StorageEngine):
+    """Single-file JSON snapshot storage."""
+    
+    def __init__(self, data_path: Union[str, Path], codec: str = "json"):
+        """
+        Initialize snapshot storage.
+        
+        Args:
+            data_path: Path of the snapshot file
+            codec: Codec used to write the snapshot (any codec is read)
+        """
+        super().__init__(data_path)
+        self.codec = get_codec(codec)
+    
+    def load(self) -> dict:
+        """Load the snapshot file."""
+        return self._load_snapshot()
+    
+    def _load_snapshot(self, strict: bool = False) -> dict:
+        """Read the snapshot file; with strict, an unreadable file raises instead of loading empty."""
+        return load_json(self.data_path, default={}, strict=strict)
+    
+    def save(self, data: dict) -> bool:
+        """Rewrite the snapshot file."""
+        return save_json(self.data_path, data, codec=self.codec)
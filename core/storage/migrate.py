@@ -0,0 +1,61 @@
+"""
+Storage Migration Tool
+
+Imports existing ``data/*_data.json`` files (including any pending journal)
+into per-server SQLite databases.
+
+Usage:
+    python -m core.storage.migrate                 # all servers
+    python -m core.storage.migrate billing client  # selected servers
+    python -m core.storage.migrate --overwrite     # rebuild existing databases
+"""
+
+import argparse
+
+from ..config import Config
+from .sqlite_store import migrate_json_to_sqlite
+
+
+def migrate_all(server_names: list[str] = None, overwrite: bool = False) -> dict:
+    """
+    Migrate JSON data files in the data directory to SQLite.
+    
+    Args:
+        server_names: Servers to migrate (defaults to every *_data.json file)
+        overwrite: Replace existing databases
+    
+    Returns:
+        Migration results keyed by server name
+    """
+    if server_names:
+        data_files = [Config.DATA_DIR / f"{name}_data.json" for name in server_names]
+    else:
+        data_files = sorted(Config.DATA_DIR.glob("*_data.json"))
+    
+    results = {}
+    for data_file in data_files:
+        server_name = data_file.name[:-len("_data.json")]
+        results[server_name] = migrate_json_to_sqlite(data_file, overwrite=overwrite)
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate MCP server JSON data to SQLite")
+    parser.add_argument("servers", nargs="*", help="Server names (default: all)")
+    parser.add_argument("--overwrite", action="store_true", help="Rebuild existing databases")
+    args = parser.parse_args()
+    
+    results = migrate_all(args.servers, overwrite=args.overwrite)
+    
+    if not results:
+        print(f"No *_data.json files found in {Config.DATA_DIR}")
+    
+    for server_name, result in results.items():
+        if result.get("success"):
+            counts = ", ".join(f"{name}={count}" for name, count in result["collections"].items())
+            print(f"✓ {server_name}: {result['database']} ({counts})")
+        else:
+            print(f"✗ {server_name}: {result['error']}")
+    
+    print("\nSet STORAGE_BACKEND=sqlite (or STORAGE_BACKEND_OVERRIDES) to use the databases.")
@@ -0,0 +1,233 @@
+"""
+Split-File Storage
+
+Keeps each collection in its own JSON file under ``{server}_data/``, e.g.
+``data/llc_ops_data/documents.json``. Collections are parsed on first
+access and a write only rewrites the files of the collections it touched,
+so a tool pays for the collections it uses rather than the whole store.
+
+A write touching several collections is atomic: the new files are staged
+as ``{collection}.json.staged``, a ``.commit`` file listing them is written,
+and only then are they renamed into place. If the process dies midway, the
+next open finishes a listed commit or discards staged files without one.
+"""
+
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Union
+
+from ..codecs import get_codec
+from ..metrics import record_io
+from ..utils import load_json, save_json
+from .base import COLLECTION_NAME_PATTERN, LazyCollections, StorageEngine
+
+logger = logging.getLogger(__name__)
+
+STAGED_SUFFIX = ".staged"
+
+
+class SplitFileStorage(StorageEngine):
+    """One JSON file per collection, loaded lazily."""
+    
+    def __init__(self, data_path: Union[str, Path], codec: str = "json"):
+        """
+        Initialize split-file storage.
+        
+        Collection files live in a directory named after the JSON file
+        (``{server}_data/``). If the directory does not exist yet but the
+        JSON file (and any journal) does, its contents are split out on
+        first open.
+        
+        Args:
+            data_path: Path of the server's JSON data file
+            codec: Codec used to write collection files
+        
+        Raises:
+            ValueError, IOError: If the JSON data exists but cannot be split out
+        """
+        super().__init__(data_path)
+        self.codec = get_codec(codec)
+        self.collections_dir = self.data_path.with_suffix("")
+        # Set when a commit could not be finished; later writes finish it first
+        self._commit_pending = False
+        
+        if not self.collections_dir.exists():
+            self._import_legacy_json()
+            self.collections_dir.mkdir(parents=True, exist_ok=True)
+        
+        self._recover()
+    
+    @property
+    def _commit_path(self) -> Path:
+        """File listing the staged collections of a multi-collection write."""
+        return self.collections_dir / ".commit"
+    
+    def _staged_path(self, collection_name: str) -> Path:
+        """Return the file a collection's new contents are staged in."""
+        path = self._collection_path(collection_name)
+        return path.with_name(path.name + STAGED_SUFFIX)
+    
+    def _recover(self) -> None:
+        """Finish a commit interrupted by a crash and drop uncommitted staged files."""
+        if self._commit_path.exists():
+            self._finish_commit()
+            logger.info("Finished interrupted commit in %s", self.collections_dir)
+        for staged in self.collections_dir.glob(f"*{STAGED_SUFFIX}"):
+            staged.unlink(missing_ok=True)
+    
+    def _collection_path(self, collection_name: str) -> Path:
+        """Return the file holding a collection."""
+        if not COLLECTION_NAME_PATTERN.match(collection_name):
+            raise ValueError(f"Invalid collection name for split storage: '{collection_name}'")
+        return self.collections_dir / f"{collection_name}.json"
+    
+    def _import_legacy_json(self) -> None:
+        """
+        Split an existing JSON data file (and journal) into collection files.
+        
+        The files are written to a temporary directory that is renamed to
+        collections_dir only once complete, so a failed import is retried
+        on the next open.
+        
+        Raises:
+            ValueError, IOError: If the JSON data cannot be read or written
+        """
+        from .journal import JournaledStorage
+        
+        legacy = JournaledStorage(self.data_path)
+        if not self.data_path.exists() and not legacy.journal_path.exists():
+            return
+        
+        data = legacy.read(strict=True)
+        
+        final_dir = self.collections_dir
+        tmp_dir = final_dir.with_name(f"{final_dir.name}.importing")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        self.collections_dir = tmp_dir
+        try:
+            success = self.save(data)
+        finally:
+            self.collections_dir = final_dir
+        
+        if not success:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise IOError(f"Failed to split {self.data_path} into {final_dir}")
+        os.replace(tmp_dir, final_dir)
+        logger.info("Split %s into %s", self.data_path, final_dir)
+    
+    def load(self) -> LazyCollections:
+        """Return a mapping that reads each collection file on first access."""
+        names = sorted(path.stem for path in self.collections_dir.glob("*.json"))
+        return LazyCollections(self.load_collection, names)
+    
+    def load_collection(self, collection_name: str) -> dict:
+        """
+        Read one collection file.
+        
+        Args:
+            collection_name: Collection to read
+        
+        Returns:
+            Collection contents
+        """
+        return load_json(self._collection_path(collection_name), default={})
+    
+    def count_records(self, collection_name: str) -> int:
+        """Count a collection by reading its file."""
+        return len(self.load_collection(collection_name))
+    
+    def files(self) -> list[Path]:
+        """One file per collection."""
+        return sorted(self.collections_dir.glob("*.json"))
+    
+    def _save_collection(self, data, collection_name: str) -> bool:
+        """Rewrite one collection file."""
+        if self._commit_pending and not self._finish_commit():
+            return False
+        try:
+            path = self._collection_path(collection_name)
+        except ValueError as e:
+            logger.error(str(e))
+            return False
+        return save_json(path, data.get(collection_name, {}), codec=self.codec)
+    
+    def _save_collections(self, data, names: list[str]) -> bool:
+        """
+        Rewrite several collection files as one atomic change.
+        
+        Args:
+            data: Dictionary of collections
+            names: Collections to rewrite
+        
+        Returns:
+            True if every file was replaced, False if none was
+        """
+        if len(names) <= 1:
+            return all(self._save_collection(data, name) for name in names)
+        if self._commit_pending and not self._finish_commit():
+            return False
+        
+        staged = []
+        try:
+            for name in names:
+                staged_path = self._staged_path(name)
+                staged.append(staged_path)
+                encoded = self.codec.encode(data.get(name, {}))
+                with open(staged_path, "wb") as f:
+                    f.write(encoded)
+                record_io(written=len(encoded))
+        except (IOError, TypeError, ValueError) as e:
+            logger.error("Failed to stage %s in %s: %s", ", ".join(names), self.collections_dir, e)
+            for staged_path in staged:
+                staged_path.unlink(missing_ok=True)
+            return False
+        
+        # The commit file is swapped in atomically; once it exists the write
+        # counts as done and is finished by recovery if need be
+        if not save_json(self._commit_path, names):
+            for staged_path in staged:
+                staged_path.unlink(missing_ok=True)
+            return False
+        return self._finish_commit()
+    
+    def _finish_commit(self) -> bool:
+        """Rename the staged files listed in the commit file into place, then drop it."""
+        try:
+            for name in load_json(self._commit_path, default=[], strict=True):
+                staged_path = self._staged_path(name)
+                # Files renamed before an interruption are already in place
+                if staged_path.exists():
+                    os.replace(staged_path, self._collection_path(name))
+            self._commit_path.unlink(missing_ok=True)
+        except (IOError, ValueError) as e:
+            logger.error("Failed to finish commit in %s: %s", self.collections_dir, e)
+            # Later writes must not overtake the staged files
+            self._commit_pending = True
+            return False
+        
+        self._commit_pending = False
+        return True
+    
+    def save(self, data) -> bool:
+        """
+        Rewrite the file of every in-memory collection, atomically.
+        
+        Collections that were never loaded are left untouched on disk.
+        """
+        if isinstance(data, LazyCollections):
+            names = [name for name, _ in data.loaded_items()]
+        else:
+            names = list(data)
+        return self._save_collections(data, names)
+    
+    def record_changed(self, data, collection_name: str, record_id: str) -> bool:
+        """Rewrite only the file of the changed record's collection."""
+        return self._save_collection(data, collection_name)
+    
+    def records_changed(self, data, changes: list[tuple[str, str]]) -> bool:
+        """Rewrite each touched collection file once, as one atomic change."""
+        names = list(dict.fromkeys(collection_name for collection_name, _ in changes))
+        return self._save_collections(data, names)
@@ -0,0 +1,262 @@
+"""
+SQLite Storage
+
+Keeps each collection in its own SQLite table of ``(id, data)`` rows, where
+``data`` is the JSON-encoded record. Collections are read on first access
+and record mutations touch a single row, so neither startup nor writes
+scale with the size of the whole data store.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Union
+
+from ..metrics import record_io
+from .base import COLLECTION_NAME_PATTERN, LazyCollections, StorageEngine
+
+logger = logging.getLogger(__name__)
+
+
+def _table(collection_name: str) -> str:
+    """Return the quoted table name for a collection."""
+    if not COLLECTION_NAME_PATTERN.match(collection_name):
+        raise ValueError(f"Invalid collection name for SQLite storage: '{collection_name}'")
+    return f'"{collection_name}"'
+
+
+def _encode(value) -> str:
+    """Serialize a record for storage."""
+    return json.dumps(value, default=str, separators=(",", ":"))
+
+
+class SQLiteStorage(StorageEngine):
+    """One SQLite table per collection, loaded lazily."""
+    
+    def __init__(self, data_path: Union[str, Path]):
+        """
+        Initialize SQLite storage.
+        
+        The database lives next to the JSON file as ``{server}_data.db``. If
+        the database does not exist yet but the JSON file (and any journal)
+        does, its contents are imported on first open.
+        
+        Args:
+            data_path: Path of the server's JSON data file
+        
+        Raises:
+            ValueError, IOError: If the JSON data exists but cannot be imported
+        """
+        super().__init__(data_path)
+        self.db_path = self.data_path.with_suffix(".db")
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.RLock()
+        if not self.db_path.exists():
+            self._import_legacy_json()
+        
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._tables = self._existing_tables()
+    
+    def _existing_tables(self) -> set:
+        """Names of collection tables already in the database."""
+        rows = self._conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        ).fetchall()
+        return {row[0] for row in rows}
+    
+    def _ensure_table(self, collection_name: str) -> None:
+        """Create a collection table on first write."""
+        if collection_name not in self._tables:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {_table(collection_name)} "
+                "(id TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+            self._tables.add(collection_name)
+    
+    def _import_legacy_json(self) -> None:
+        """
+        Import an existing JSON data file (and journal) into a new database.
+        
+        The import is written to a temporary database that replaces db_path
+        only once complete, so a failed import is retried on the next open.
+        
+        Raises:
+            ValueError, IOError: If the JSON data cannot be read or written
+        """
+        from .journal import JournaledStorage
+        
+        legacy = JournaledStorage(self.data_path)
+        if not self.data_path.exists() and not legacy.journal_path.exists():
+            return
+        
+        data = legacy.read(strict=True)
+        
+        tmp_path = self.db_path.with_name(f"{self.db_path.name}.importing")
+        tmp_path.unlink(missing_ok=True)
+        self._conn = sqlite3.connect(str(tmp_path), check_same_thread=False)
+        self._tables = set()
+        try:
+            success = self.save(data)
+        finally:
+            self._conn.close()
+        
+        if not success:
+            tmp_path.unlink(missing_ok=True)
+            raise IOError(f"Failed to import {self.data_path} into {self.db_path}")
+        os.replace(tmp_path, self.db_path)
+        logger.info("Migrated %s into %s", self.data_path, self.db_path)
+    
+    def load(self) -> LazyCollections:
+        """Return a mapping that reads each collection on first access."""
+        with self._lock:
+            names = sorted(self._tables)
+        return LazyCollections(self.load_collection, names)
+    
+    def load_collection(self, collection_name: str) -> dict:
+        """
+        Read every record of one collection.
+        
+        Args:
+            collection_name: Collection to read
+        
+        Returns:
+            Records keyed by ID
+        """
+        with self._lock:
+            if collection_name not in self._tables:
+                return {}
+            rows = self._conn.execute(
+                f"SELECT id, data FROM {_table(collection_name)}"
+            ).fetchall()
+        record_io(read=sum(len(data) for _, data in rows))
+        return {record_id: json.loads(data) for record_id, data in rows}
+    
+    def count_records(self, collection_name: str) -> int:
+        """Count a collection's rows."""
+        with self._lock:
+            if collection_name not in self._tables:
+                return 0
+            return self._conn.execute(f"SELECT COUNT(*) FROM {_table(collection_name)}").fetchone()[0]
+    
+    def files(self) -> list[Path]:
+        """The database and its write-ahead log."""
+        return [self.db_path, Path(f"{self.db_path}-wal")]
+    
+    def save(self, data) -> bool:
+        """
+        Replace the stored contents of every in-memory collection.
+        
+        Collections that were never loaded are left untouched on disk.
+        """
+        if isinstance(data, LazyCollections):
+            collections = list(data.loaded_items())
+        else:
+            collections = list(data.items())
+        
+        try:
+            with self._lock, self._conn:
+                for collection_name, collection in collections:
+                    if not isinstance(collection, dict):
+                        logger.error("Skipping non-dict collection '%s'", collection_name)
+                        continue
+                    self._ensure_table(collection_name)
+                    table = _table(collection_name)
+                    rows = [(str(key), _encode(value)) for key, value in collection.items()]
+                    self._conn.execute(f"DELETE FROM {table}")
+                    self._conn.executemany(f"INSERT INTO {table} (id, data) VALUES (?, ?)", rows)
+                    record_io(written=sum(len(data) for _, data in rows))
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.error("Failed to save to %s: %s", self.db_path, e)
+            return False
+    
+    def _write_row(self, data, collection_name: str, record_id: str) -> None:
+        """Upsert or delete one row to match the in-memory record."""
+        collection = data.get(collection_name, {})
+        self._ensure_table(collection_name)
+        table = _table(collection_name)
+        
+        if record_id in collection:
+            encoded = _encode(collection[record_id])
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {table} (id, data) VALUES (?, ?)",
+                (record_id, encoded)
+            )
+            record_io(written=len(encoded))
+        else:
+            self._conn.execute(f"DELETE FROM {table} WHERE id = ?", (record_id,))
+    
+    def record_changed(self, data, collection_name: str, record_id: str) -> bool:
+        """Upsert or delete a single row."""
+        try:
+            with self._lock, self._conn:
+                self._write_row(data, collection_name, record_id)
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.error("Failed to save %s record %s to %s: %s", collection_name, record_id, self.db_path, e)
+            return False
+    
+    def records_changed(self, data, changes: list[tuple[str, str]]) -> bool:
+        """Write every changed row in one SQLite transaction."""
+        try:
+            with self._lock, self._conn:
+                for collection_name, record_id in changes:
+                    self._write_row(data, collection_name, record_id)
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.error("Failed to save batch of %s records to %s: %s", len(changes), self.db_path, e)
+            return False
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_json_to_sqlite(data_path: Union[str, Path], overwrite: bool = False) -> dict:
+    """
+    Migrate a JSON data file (and any pending journal) into SQLite.
+    
+    Args:
+        data_path: Path of the ``{server}_data.json`` file
+        overwrite: Replace an existing database instead of skipping it
+    
+    Returns:
+        Migration summary with per-collection record counts
+    """
+    data_path = Path(data_path)
+    db_path = data_path.with_suffix(".db")
+    journal_path = data_path.with_suffix(".journal")
+    
+    if not data_path.exists() and not journal_path.exists():
+        return {"error": f"No data file found: {data_path}"}
+    
+    if db_path.exists():
+        if not overwrite:
+            return {"error": f"Database already exists: {db_path}"}
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+    
+    # Opening a fresh database imports the JSON file
+    try:
+        storage = SQLiteStorage(data_path)
+    except (ValueError, IOError) as e:
+        return {"error": f"Failed to import {data_path}: {e}"}
+    try:
+        data = storage.load()
+        counts = {name: len(data[name]) for name in data}
+    finally:
+        storage.close()
+    
+    return {
+        "success": True,
+        "source": str(data_path),
+        "database": str(db_path),
+        "collections": counts
+    }
@@ -0,0 +1,204 @@
+"""
+Write-Behind Flushing
+
+Background flushing for servers that buffer mutations instead of writing
+them before a tool returns (Config.WRITE_MODE):
+
+- ``sync``: every mutation is written before the tool returns (default)
+- ``group``: mutations are written together by a background thread at most
+  WRITE_BEHIND_INTERVAL_MS after the first one, or as soon as
+  WRITE_BEHIND_MAX_PENDING records are dirty
+- ``deferred``: mutations are only written once WRITE_BEHIND_MAX_PENDING
+  records are dirty, on an explicit flush, or at exit
+
+Buffered mutations are flushed at interpreter exit and on SIGTERM/SIGHUP,
+but are lost if the process is killed outright; that window is the price
+of not writing on every call.
+"""
+
+import atexit
+import logging
+import signal
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+WRITE_MODES = ("sync", "group", "deferred")
+
+# Flushers that may hold buffered mutations, flushed at exit
+_flushers: "weakref.WeakSet[WriteBehindFlusher]" = weakref.WeakSet()
+_handlers_lock = threading.Lock()
+_signals_installed = False
+
+
+class WriteBehindFlusher:
+    """Calls a server's flush function from a background thread when it is due."""
+    
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[], bool],
+        mode: str,
+        interval_ms: float,
+        max_pending: int
+    ):
+        """
+        Initialize the flusher. The thread starts on the first notify().
+        
+        Args:
+            name: Server name, used for the thread name
+            flush: Bound method writing the buffered mutations
+            mode: 'group' or 'deferred'
+            interval_ms: Longest a mutation waits in group mode
+            max_pending: Dirty records that trigger a flush in any mode
+        
+        Raises:
+            ValueError: If mode is not a write-behind mode
+        """
+        if mode not in ("group", "deferred"):
+            raise ValueError(f"Invalid write-behind mode '{mode}'. Must be 'group' or 'deferred'")
+        
+        self.name = name
+        self.mode = mode
+        self.interval = interval_ms / 1000
+        self.max_pending = max_pending
+        # Weak, so an unused server can be garbage collected; the thread then exits
+        self._flush = weakref.WeakMethod(flush, lambda _: self._stop_thread())
+        self._cond = threading.Condition()
+        self._due: Optional[float] = None
+        self._flush_requested = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        _register(self)
+    
+    def notify(self, pending: int) -> None:
+        """
+        Report that mutations are buffered.
+        
+        Args:
+            pending: Number of dirty records now buffered
+        """
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"write-behind-{self.name}",
+                    daemon=True
+                )
+                self._thread.start()
+            if pending >= self.max_pending:
+                self._flush_requested = True
+            elif self.mode == "group" and self._due is None:
+                self._due = time.monotonic() + self.interval
+            self._cond.notify()
+    
+    def _run(self) -> None:
+        """Wait until a flush is due, flush, repeat."""
+        while True:
+            with self._cond:
+                while not (self._stopping or self._flush_requested or self._is_due()):
+                    timeout = None if self._due is None else max(0.0, self._due - time.monotonic())
+                    self._cond.wait(timeout)
+                if self._stopping:
+                    return
+                self._flush_requested = False
+                self._due = None
+            
+            if not self.flush():
+                return
+    
+    def _is_due(self) -> bool:
+        """Check whether the group-mode deadline has passed (caller holds _cond)."""
+        return self._due is not None and time.monotonic() >= self._due
+    
+    def flush(self) -> bool:
+        """
+        Write buffered mutations now.
+        
+        Returns:
+            False if the server no longer exists, True otherwise (write
+            failures are logged and retried by the next flush)
+        """
+        flush = self._flush()
+        if flush is None:
+            return False
+        try:
+            if not flush():
+                # Try again after another interval rather than spinning
+                with self._cond:
+                    if self._due is None:
+                        self._due = time.monotonic() + max(self.interval, 1.0)
+        except Exception:
+            logger.exception("Write-behind flush of %s failed", self.name)
+        return True
+    
+    def _stop_thread(self) -> None:
+        """Wake the background thread and let it exit."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+    
+    def stop(self) -> None:
+        """Flush once more and stop the background thread."""
+        self._stop_thread()
+        self.flush()
+
+
+def _register(flusher: WriteBehindFlusher) -> None:
+    """Track a flusher for flush_all() and install the exit hooks once."""
+    _flushers.add(flusher)
+    install_signal_handlers()
+
+
+def flush_all() -> None:
+    """Flush every server's buffered mutations (runs at exit)."""
+    for flusher in list(_flushers):
+        flusher.flush()
+
+
+def install_signal_handlers() -> None:
+    """
+    Flush buffered mutations on SIGTERM and SIGHUP before the process exits.
+    
+    Signal handlers can only be installed from the main thread; when called
+    from another thread this is a no-op until it is called again from the
+    main thread (servers started lazily by the host call it from
+    StdioServer.run()).
+    """
+    global _signals_installed
+    if threading.current_thread() is not threading.main_thread():
+        return
+    
+    with _handlers_lock:
+        if _signals_installed:
+            return
+        _signals_installed = True
+        
+        for name in ("SIGTERM", "SIGHUP"):
+            signum = getattr(signal, name, None)
+            if signum is None:
+                continue
+            previous = signal.getsignal(signum)
+            if previous is signal.SIG_IGN:
+                continue
+            signal.signal(signum, _exit_handler(previous))
+
+
+def _exit_handler(previous):
+    """Build a handler that flushes, then defers to the previous handler."""
+    def handler(signum, frame):
+        flush_all()
+        if callable(previous):
+            previous(signum, frame)
+        else:
+            # Default action: exit with the conventional status
+            raise SystemExit(128 + signum)
+    
+    return handler
+
+
+atexit.register(flush_all)
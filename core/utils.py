@@ -4,18 +4,83 @@ Shared Utility Functions for Freelance LLC OS
 Common helpers for date formatting, file I/O, validation, and data manipulation.
 """
 
-import json
+import atexit
+import itertools
 import logging
+import logging.handlers
+import os
+import queue
+import secrets
+import sys
+import threading
+import time
+from collections.abc import Callable
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any, Optional, Union
 from decimal import Decimal, ROUND_HALF_UP
 
+from .codecs import Codec, JSONCodec, decode, get_codec
+from .metrics import record_io
+
+
+# Process-wide logging: loggers set up with setup_logging() only put records
+# on one queue; a single listener thread formats them and writes them to the
+# console and log files, so callers never wait on log I/O
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_handlers: dict[str, logging.Handler] = {}
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_logging_lock = threading.Lock()
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """Writes to the current sys.stderr, even if it was replaced after setup."""
+    
+    def __init__(self):
+        logging.Handler.__init__(self)
+    
+    @property
+    def stream(self):
+        return sys.stderr
+
+
+class _LoggerFilter(logging.Filter):
+    """Passes records from the loggers (and their children) set up for one file."""
+    
+    def __init__(self):
+        super().__init__()
+        self.names: set[str] = set()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        name = record.name
+        while name not in self.names:
+            if "." not in name:
+                return False
+            name = name.rsplit(".", 1)[0]
+        return True
+
+
+def _log_handler(key: str, factory: Callable[[], logging.Handler]) -> tuple[logging.Handler, bool]:
+    """Get the listener handler for a destination, creating it once (caller holds _logging_lock)."""
+    handler = _log_handlers.get(key)
+    if handler is not None:
+        return handler, False
+    handler = factory()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _log_handlers[key] = handler
+    return handler, True
+
 
 def setup_logging(name: str, log_file: Optional[Path] = None, level: str = "INFO") -> logging.Logger:
     """
     Set up logging for a module.
     
+    Safe to call repeatedly: the logger gets one queue handler and each
+    destination one handler, however often it is set up. Records are
+    written by a background listener thread.
+    
     Args:
         name: Logger name (usually __name__)
         log_file: Optional log file path
@@ -24,39 +89,69 @@ def setup_logging(name: str, log_file: Optional[Path] = None, level: str = "INFO
     Returns:
         Configured logger instance
     """
+    global _log_listener
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))
     
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, level.upper()))
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler (optional)
-    if log_file:
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(getattr(logging, level.upper()))
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+    with _logging_lock:
+        if not any(getattr(handler, "queue", None) is _log_queue for handler in logger.handlers):
+            logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+        
+        _, changed = _log_handler("console", _ConsoleHandler)
+        
+        # File handler (optional)
+        if log_file:
+            log_file = Path(log_file)
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            file_handler, added = _log_handler(
+                f"file:{log_file.resolve()}",
+                lambda: logging.FileHandler(log_file)
+            )
+            if added:
+                file_handler.addFilter(_LoggerFilter())
+                changed = True
+            file_handler.filters[0].names.add(name)
+        
+        # The listener's handlers are fixed, so restart it to pick up new ones;
+        # stop() first writes everything already queued
+        if changed or _log_listener is None:
+            if _log_listener is not None:
+                _log_listener.stop()
+            _log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers.values())
+            _log_listener.start()
     
     return logger
 
 
-def load_json(filepath: Union[str, Path], default: Any = None) -> Any:
+def stop_logging() -> None:
+    """Write all queued log records and stop the listener thread (runs at exit)."""
+    global _log_listener
+    with _logging_lock:
+        if _log_listener is not None:
+            _log_listener.stop()
+            _log_listener = None
+
+
+atexit.register(stop_logging)
+
+
+def load_json(filepath: Union[str, Path], default: Any = None, strict: bool = False) -> Any:
     """
     Load JSON file with error handling.
     
+    Files written with a binary codec are detected by their header and
+    decoded transparently.
+    
     Args:
         filepath: Path to JSON file
         default: Default value if file doesn't exist or is invalid
+        strict: Raise instead of returning default if the file is invalid
     
     Returns:
         Parsed JSON data or default value
+    
+    Raises:
+        ValueError, IOError: If strict and the file exists but cannot be read
     """
     filepath = Path(filepath)
     
@@ -64,14 +159,23 @@ def load_json(filepath: Union[str, Path], default: Any = None) -> Any:
         return default if default is not None else {}
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        logging.warning(f"Failed to load JSON from {filepath}: {e}")
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        record_io(read=len(raw))
+        return decode(raw)
+    except (ValueError, IOError) as e:
+        if strict:
+            raise
+        logging.warning("Failed to load JSON from %s: %s", filepath, e)
         return default if default is not None else {}
 
 
-def save_json(filepath: Union[str, Path], data: Any, indent: int = 2) -> bool:
+def save_json(
+    filepath: Union[str, Path],
+    data: Any,
+    indent: int = 2,
+    codec: Optional[Union[str, Codec]] = None
+) -> bool:
     """
     Save data to JSON file with error handling.
     
@@ -79,19 +183,31 @@ def save_json(filepath: Union[str, Path], data: Any, indent: int = 2) -> bool:
         filepath: Path to JSON file
         data: Data to serialize
         indent: JSON indentation (default: 2)
+        codec: Codec or codec name from core.codecs (default: indented JSON)
     
     Returns:
         True if successful, False otherwise
     """
     filepath = Path(filepath)
     filepath.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = filepath.with_name(filepath.name + ".tmp")
+    if codec is None:
+        codec = JSONCodec(indent)
+    elif isinstance(codec, str):
+        codec = get_codec(codec)
     
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=indent, default=str)
+        # Write to a sibling file and swap it in so readers never see a
+        # half-written file
+        encoded = codec.encode(data)
+        with open(tmp_path, 'wb') as f:
+            f.write(encoded)
+        os.replace(tmp_path, filepath)
+        record_io(written=len(encoded))
         return True
-    except (IOError, TypeError) as e:
-        logging.error(f"Failed to save JSON to {filepath}: {e}")
+    except (IOError, TypeError, ValueError) as e:
+        logging.error("Failed to save JSON to %s: %s", filepath, e)
+        tmp_path.unlink(missing_ok=True)
         return False
 
 
@@ -232,24 +348,80 @@ def round_currency(amount: Union[float, Decimal], places: int = 2) -> Decimal:
     return amount.quantize(Decimal(quantize_str), rounding=ROUND_HALF_UP)
 
 
+# Crockford base32: sorts in the same order as the encoded integers
+_ID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ID_NODE_BITS = 40
+_ID_SEQUENCE_BITS = 40
+
+_id_node = secrets.randbits(_ID_NODE_BITS)
+_id_sequence = itertools.count()
+_id_last_ms = 0
+_id_date = (-1, "")
+
+
+def _reset_id_state() -> None:
+    """Give a forked child its own node so it cannot repeat the parent's IDs."""
+    global _id_node, _id_sequence
+    _id_node = secrets.randbits(_ID_NODE_BITS)
+    _id_sequence = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_id_state)
+
+
+# Two base32 characters per 10 bits halves the encoding loop
+_ID_PAIRS = [a + b for a in _ID_ALPHABET for b in _ID_ALPHABET]
+
+
+def _encode_id(value: int) -> str:
+    """Encode a 128-bit integer as 26 Crockford base32 characters."""
+    pairs = _ID_PAIRS
+    return "".join([
+        pairs[(value >> shift) & 1023]
+        for shift in (120, 110, 100, 90, 80, 70, 60, 50, 40, 30, 20, 10, 0)
+    ])
+
+
 def generate_id(prefix: str, date_part: bool = True) -> str:
     """
-    Generate a unique ID with optional date component.
+    Generate a unique, time-sortable ID with optional date component.
+    
+    The random part is ULID-style: a 48-bit millisecond timestamp, a
+    40-bit node number chosen randomly per process, and a 40-bit
+    per-process sequence. The sequence comes from itertools.count, which
+    is atomic under the GIL, so threads never share a value without
+    taking a lock; the node keeps concurrent processes apart. IDs from
+    one process sort in creation order, even if the clock steps back.
     
     Args:
         prefix: ID prefix (e.g., 'inv', 'client', 'task')
-        date_part: Include date in ID
+        date_part: Include a readable YYYYMMDD date in ID
     
     Returns:
-        Generated ID string
+        Generated ID string, e.g. inv-20240301-01HQ3M8Z9V3Y4K0N6D2C5W7R1T
     """
+    global _id_last_ms, _id_date
+    
+    sequence = next(_id_sequence)
+    now_ms = max(time.time_ns() // 1_000_000, _id_last_ms)
+    _id_last_ms = now_ms
+    
+    value = (
+        (now_ms << (_ID_NODE_BITS + _ID_SEQUENCE_BITS))
+        | (_id_node << _ID_SEQUENCE_BITS)
+        | (sequence & ((1 << _ID_SEQUENCE_BITS) - 1))
+    )
+    
     if date_part:
-        date_str = datetime.now().strftime("%Y%m%d")
-        timestamp = datetime.now().strftime("%H%M%S")
-        return f"{prefix}-{date_str}-{timestamp}"
-    else:
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"{prefix}-{timestamp}"
+        # Formatting the date dominates the cost; it only changes once a second
+        second, date_str = _id_date
+        if now_ms // 1000 != second:
+            second = now_ms // 1000
+            date_str = datetime.fromtimestamp(second).strftime("%Y%m%d")
+            _id_date = (second, date_str)
+        return f"{prefix}-{date_str}-{_encode_id(value)}"
+    return f"{prefix}-{_encode_id(value)}"
 
 
 def get_quarter(dt: Optional[Union[datetime, date]] = None) -> tuple[int, int]:
@@ -11,6 +11,9 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 import yaml
 
+from core.codecs import decode
+from core.storage.journal import JournaledStorage
+
 from .config import DATA_DIR, PROJECT_ROOT
 
 logger = logging.getLogger(__name__)
@@ -23,18 +26,30 @@ class DataLoader:
         """Initialize data loader with data directory."""
         self.data_dir = data_dir
         self.project_root = PROJECT_ROOT
-        
+    
     def _load_json(self, filename: str, default: Any = None) -> Any:
-        """Load JSON file from data directory."""
+        """
+        Load a data file (JSON or any core.codecs format) from data directory.
+        
+        Servers on the journal backend keep recent changes in a
+        ``.journal`` file next to the snapshot; it is replayed on top.
+        """
         filepath = self.data_dir / filename
+        if filepath.with_suffix(".journal").exists():
+            try:
+                return JournaledStorage(filepath).read()
+            except (ValueError, IOError) as e:
+                logger.error(f"Failed to load {filename}: {e}")
+                return default if default is not None else {}
+        
         if not filepath.exists():
             logger.warning(f"File not found: {filepath}")
             return default if default is not None else {}
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
+            with open(filepath, 'rb') as f:
+                return decode(f.read())
+        except (ValueError, IOError) as e:
             logger.error(f"Failed to load {filename}: {e}")
             return default if default is not None else {}
     
@@ -51,6 +66,21 @@ class DataLoader:
             logger.error(f"Failed to load {filepath}: {e}")
             return default if default is not None else {}
     
+    def _load_jsonl(self, directory: Path) -> List[Dict[str, Any]]:
+        """Load every line of the *.jsonl files in a directory, in file order."""
+        records = []
+        for filepath in sorted(directory.glob("*.jsonl")):
+            try:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            continue
+            except IOError as e:
+                logger.error(f"Failed to load {filepath}: {e}")
+        return records
+    
     def load_work_data(self) -> Dict[str, Any]:
         """Load task and hours data from work server."""
         vault_path = self.project_root / "vault"
@@ -60,7 +90,12 @@ class DataLoader:
         hours_file = tasks_dir / "hours.yaml"
         
         tasks = self._load_yaml(tasks_file, default=[])
-        hours = self._load_yaml(hours_file, default=[])
+        
+        # Hours live in monthly JSONL ledger files; hours.yaml only exists
+        # until the work server migrates it
+        hours = self._load_jsonl(tasks_dir / "hours")
+        if hours_file.exists():
+            hours += self._load_yaml(hours_file).get("entries", [])
         
         return {
             "tasks": tasks if isinstance(tasks, list) else [],
@@ -190,7 +190,7 @@ echo "  2. Edit your .env file with your configuration:"
 echo "     ${BLUE}nano .env${NC} or ${BLUE}vim .env${NC}"
 echo ""
 echo "  3. Test the installation:"
-echo "     ${BLUE}python -m core.mcp.work_server${NC}"
+echo "     ${BLUE}python -m core.mcp.work_server --info${NC}"
 echo ""
 echo "  4. Run the test suite:"
 echo "     ${BLUE}pytest tests/ -v${NC}"
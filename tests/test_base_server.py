@@ -0,0 +1,610 @@
+"""
+Tests for BaseMCPServer shared record handling
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.mcp.base_server import BaseMCPServer
+from core.storage.indexes import DateIndex
+
+
+class SampleServer(BaseMCPServer):
+    """Minimal concrete server for exercising the base class."""
+    
+    INDEXED_FIELDS = {
+        "invoices": ("client_id", "status")
+    }
+    
+    DATE_INDEXED_FIELDS = {
+        "invoices": ("issue_date",)
+    }
+    
+    UNIQUE_CONSTRAINTS = {
+        "contacts": ({"fields": ("email",), "case_insensitive": True},)
+    }
+    
+    TOOLS = ("add_contact", "count_contacts")
+    
+    def __init__(self):
+        super().__init__("sample")
+    
+    def get_info(self) -> dict:
+        return {"name": "sample-server", "tools": list(self.TOOLS)}
+    
+    def add_contact(self, contact_id: str, email: str) -> dict:
+        return self._create_record("contacts", contact_id, {"email": email})
+    
+    def count_contacts(self) -> dict:
+        return {"count": len(self._get_collection("contacts"))}
+
+
+@pytest.fixture
+def temp_data_dir(tmp_path, monkeypatch):
+    """Create a temporary data directory for testing."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    
+    # Patch Config to use temp directory
+    from core import config
+    monkeypatch.setattr(config.Config, "DATA_DIR", data_dir)
+    
+    yield data_dir
+
+
+@pytest.fixture
+def server(temp_data_dir):
+    """Create a fresh sample server for each test."""
+    return SampleServer()
+
+
+@pytest.fixture
+def invoices(server):
+    """Populate the sample server with a few invoices."""
+    server._create_record("invoices", "inv-1", {"client_id": "acme", "status": "draft"})
+    server._create_record("invoices", "inv-2", {"client_id": "acme", "status": "paid"})
+    server._create_record("invoices", "inv-3", {"client_id": "globex", "status": "draft"})
+    return server
+
+
+def test_where_filters_by_equality(invoices):
+    """Test equality filtering through declared indexes."""
+    result = invoices._list_records("invoices", where={"client_id": "acme"})
+    
+    assert [r["id"] for r in result["records"]] == ["inv-1", "inv-2"]
+    
+    result = invoices._list_records("invoices", where={"client_id": "acme", "status": "draft"})
+    
+    assert [r["id"] for r in result["records"]] == ["inv-1"]
+
+
+def test_where_ignores_none_values(invoices):
+    """Test that None-valued conditions do not filter."""
+    result = invoices._list_records("invoices", where={"client_id": None, "status": "draft"})
+    
+    assert result["count"] == 2
+
+
+def test_where_on_unindexed_field(invoices):
+    """Test that non-indexed fields still filter correctly."""
+    invoices._create_record("invoices", "inv-4", {"client_id": "acme", "currency": "EUR"})
+    
+    result = invoices._list_records("invoices", where={"client_id": "acme", "currency": "EUR"})
+    
+    assert [r["id"] for r in result["records"]] == ["inv-4"]
+
+
+def test_index_tracks_updates_and_deletes(invoices):
+    """Test that indexes follow record updates and deletes."""
+    invoices._list_records("invoices", where={"status": "draft"})
+    
+    invoices._update_record("invoices", "inv-1", {"status": "paid"})
+    invoices._delete_record("invoices", "inv-2")
+    
+    paid = invoices._list_records("invoices", where={"status": "paid"})
+    draft = invoices._list_records("invoices", where={"status": "draft"})
+    
+    assert [r["id"] for r in paid["records"]] == ["inv-1"]
+    assert [r["id"] for r in draft["records"]] == ["inv-3"]
+
+
+def test_index_tracks_records_changed_in_place(invoices):
+    """Test that a record mutated before _update_record still moves buckets."""
+    invoices._list_records("invoices", where={"status": "draft"})
+    
+    record = invoices._get_collection("invoices")["inv-1"]
+    record["status"] = "sent"
+    invoices._update_record("invoices", "inv-1", {"client_id": "globex"})
+    
+    sent = invoices._list_records("invoices", where={"status": "sent"})
+    draft = invoices._list_records("invoices", where={"status": "draft"})
+    
+    assert [r["id"] for r in sent["records"]] == ["inv-1"]
+    assert [r["id"] for r in draft["records"]] == ["inv-3"]
+
+
+def test_index_lookup_skips_non_matching_records(invoices):
+    """Test that equality filters only visit matching records."""
+    seen = []
+    
+    def spy(record):
+        seen.append(record["id"])
+        return True
+    
+    invoices._list_records("invoices", spy, where={"client_id": "globex"})
+    
+    assert seen == ["inv-3"]
+
+
+def test_set_collection_rebuilds_index(invoices):
+    """Test that replacing a collection invalidates its indexes."""
+    invoices._list_records("invoices", where={"client_id": "acme"})
+    
+    invoices._set_collection("invoices", {
+        "inv-9": {"id": "inv-9", "client_id": "acme", "status": "sent"}
+    })
+    
+    result = invoices._list_records("invoices", where={"client_id": "acme"})
+    
+    assert [r["id"] for r in result["records"]] == ["inv-9"]
+
+
+def test_transaction_writes_once(server, monkeypatch):
+    """Test that a transaction flushes all changes in a single write."""
+    calls = []
+    monkeypatch.setattr(server._storage, "record_changed", lambda *args: calls.append("record"))
+    monkeypatch.setattr(server._storage, "records_changed", lambda data, changes: calls.append(changes) or True)
+    
+    with server.transaction():
+        server._create_record("invoices", "inv-1", {"client_id": "acme", "status": "draft"})
+        server._create_record("payments", "pay-1", {"invoice_id": "inv-1"})
+        server._update_record("invoices", "inv-1", {"status": "paid"})
+        
+        assert calls == []
+    
+    assert calls == [[("invoices", "inv-1"), ("payments", "pay-1")]]
+
+
+def test_transaction_rolls_back_on_error(invoices):
+    """Test that an exception discards the transaction's changes."""
+    with pytest.raises(RuntimeError):
+        with invoices.transaction():
+            invoices._update_record("invoices", "inv-1", {"status": "paid"})
+            invoices._delete_record("invoices", "inv-3")
+            raise RuntimeError("boom")
+    
+    assert invoices._read_record("invoices", "inv-1")["record"]["status"] == "draft"
+    assert invoices._read_record("invoices", "inv-3")["success"]
+    
+    draft = invoices._list_records("invoices", where={"status": "draft"})
+    assert [r["id"] for r in draft["records"]] == ["inv-1", "inv-3"]
+
+
+def test_nested_transaction_joins_outer(server):
+    """Test that an inner transaction commits with the outer one."""
+    with server.transaction():
+        with server.transaction():
+            server._create_record("invoices", "inv-1", {"client_id": "acme"})
+        
+        assert not SampleServer()._read_record("invoices", "inv-1").get("success")
+    
+    assert SampleServer()._read_record("invoices", "inv-1")["success"]
+
+
+def test_next_sequence_rolls_back_with_transaction(server):
+    """Test that a counter allocated in a failed transaction is not consumed."""
+    assert server._next_sequence("invoice-2024", seed=lambda: 7) == 8
+    
+    with pytest.raises(RuntimeError):
+        with server.transaction():
+            assert server._next_sequence("invoice-2024") == 9
+            raise RuntimeError("write failed")
+    
+    assert server._next_sequence("invoice-2024") == 9
+    assert SampleServer()._next_sequence("invoice-2024") == 10
+
+
+def test_unique_constraint_rejects_duplicates(server):
+    """Test unique constraints on create and update, case-insensitively."""
+    assert server._create_record("contacts", "c-1", {"email": "Ada@Example.com"})["success"]
+    assert server._create_record("contacts", "c-2", {"email": "grace@example.com"})["success"]
+    
+    assert "error" in server._create_record("contacts", "c-3", {"email": "ada@example.com"})
+    assert "error" in server._update_record("contacts", "c-2", {"email": "ADA@example.com"})
+    assert server._unique_conflict("contacts", {"email": "ada@EXAMPLE.com"})["id"] == "c-1"
+    
+    # Records without a value are exempt, and freed values can be reused
+    assert server._create_record("contacts", "c-4", {"email": None})["success"]
+    assert server._create_record("contacts", "c-5", {"email": None})["success"]
+    server._delete_record("contacts", "c-1")
+    assert server._update_record("contacts", "c-2", {"email": "ada@example.com"})["success"]
+
+
+@pytest.fixture
+def notes(server):
+    """Populate the sample server with searchable notes."""
+    server._create_record("notes", "n-1", {"title": "Python developer", "body": "Django and Flask"})
+    server._create_record("notes", "n-2", {"title": "Java developer", "body": "Spring"})
+    server._create_record("notes", "n-3", {"title": "JavaScript", "body": "React developer, React Native"})
+    return server
+
+
+def test_search_matches_words_and_prefixes(notes):
+    """Test that search matches whole words and word prefixes."""
+    result = notes._search_records("notes", ["title", "body"], "dev")
+    
+    assert {r["id"] for r in result["records"]} == {"n-1", "n-2", "n-3"}
+    
+    result = notes._search_records("notes", ["title", "body"], "java dev")
+    
+    assert [r["id"] for r in result["records"]] == ["n-2", "n-3"]
+
+
+def test_search_ranks_exact_and_frequent_matches_first(notes):
+    """Test that exact and repeated matches outrank prefix matches."""
+    result = notes._search_records("notes", ["title", "body"], "react")
+    assert [r["id"] for r in result["records"]] == ["n-3"]
+    
+    result = notes._search_records("notes", ["title", "body"], "java", limit=1)
+    
+    assert [r["id"] for r in result["records"]] == ["n-2"]
+
+
+def test_search_index_tracks_mutations(notes):
+    """Test that the text index follows creates, updates and deletes."""
+    notes._search_records("notes", ["title", "body"], "python")
+    
+    notes._update_record("notes", "n-1", {"title": "Rust developer"})
+    notes._delete_record("notes", "n-2")
+    notes._create_record("notes", "n-4", {"title": "Python tutor", "body": ""})
+    
+    python = notes._search_records("notes", ["title", "body"], "python")
+    rust = notes._search_records("notes", ["title", "body"], "rust")
+    spring = notes._search_records("notes", ["title", "body"], "spring")
+    
+    assert [r["id"] for r in python["records"]] == ["n-4"]
+    assert [r["id"] for r in rust["records"]] == ["n-1"]
+    assert spring["count"] == 0
+
+
+def _all_pages(server, **kwargs) -> list:
+    """Collect record IDs by following next_cursor to the end."""
+    ids = []
+    cursor = None
+    while True:
+        result = server._list_records("invoices", cursor=cursor, **kwargs)
+        ids.extend(r["id"] for r in result["records"])
+        cursor = result["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.fixture
+def many_invoices(server):
+    """Populate the sample server with invoices sharing some dates."""
+    for i in range(7):
+        server._create_record("invoices", f"inv-{i}", {
+            "client_id": "acme",
+            "issue_date": f"2024-01-0{i // 2 + 1}"
+        })
+    server._create_record("invoices", "inv-undated", {"client_id": "acme"})
+    return server
+
+
+def test_pagination_covers_every_record_once(many_invoices):
+    """Test that following cursors returns each record exactly once, in order."""
+    ids = _all_pages(many_invoices, limit=3, order_by="-issue_date")
+    
+    assert ids == ["inv-6", "inv-5", "inv-4", "inv-3", "inv-2", "inv-1", "inv-0", "inv-undated"]
+    
+    ids = _all_pages(many_invoices, limit=3, order_by="issue_date")
+    
+    assert ids == ["inv-0", "inv-1", "inv-2", "inv-3", "inv-4", "inv-5", "inv-6", "inv-undated"]
+
+
+def test_pagination_cursor_survives_changes(many_invoices):
+    """Test that inserts and deletes between pages do not shift the cursor."""
+    first = many_invoices._list_records("invoices", limit=3, order_by="issue_date")
+    
+    many_invoices._delete_record("invoices", "inv-0")
+    many_invoices._create_record("invoices", "inv-early", {"issue_date": "2023-12-31"})
+    
+    second = many_invoices._list_records(
+        "invoices", limit=3, cursor=first["next_cursor"], order_by="issue_date"
+    )
+    
+    assert [r["id"] for r in first["records"]] == ["inv-0", "inv-1", "inv-2"]
+    assert [r["id"] for r in second["records"]] == ["inv-3", "inv-4", "inv-5"]
+
+
+def test_pagination_rejects_foreign_cursor(many_invoices):
+    """Test that a cursor from another ordering is refused."""
+    page = many_invoices._list_records("invoices", limit=2, order_by="issue_date")
+    
+    result = many_invoices._list_records("invoices", limit=2, cursor=page["next_cursor"], order_by="id")
+    
+    assert "error" in result
+    assert "error" in many_invoices._list_records("invoices", limit=2, cursor="not-a-cursor")
+
+
+def test_iter_records_is_lazy(many_invoices):
+    """Test that _iter_records stops filtering once the caller stops."""
+    seen = []
+    
+    def spy(record):
+        seen.append(record["id"])
+        return True
+    
+    records = many_invoices._iter_records("invoices", spy, where={"client_id": "acme"})
+    next(records)
+    
+    assert seen == ["inv-0"]
+
+
+def test_top_records_selects_most_recent(many_invoices):
+    """Test that _top_records returns the first records of an ordering."""
+    recent = many_invoices._top_records("invoices", 3, "-issue_date")
+    
+    assert [r["id"] for r in recent] == ["inv-6", "inv-5", "inv-4"]
+    
+    oldest = many_invoices._top_records("invoices", 2, "issue_date", where={"client_id": "acme"})
+    
+    assert [r["id"] for r in oldest] == ["inv-0", "inv-1"]
+
+
+def test_date_index_range_is_inclusive_and_ordered():
+    """Test DateIndex range lookups by ISO date and datetime strings."""
+    index = DateIndex("issue_date")
+    index.build({
+        "b": {"issue_date": "2024-02-01"},
+        "a": {"issue_date": "2024-01-15T09:30:00"},
+        "c": {"issue_date": "2024-03-01"},
+        "x": {"issue_date": "not a date"}
+    })
+    
+    assert len(index) == 3
+    assert index.range("2024-01-15", "2024-02-01") == ["a", "b"]
+    assert index.range(start="2024-02-01") == ["b", "c"]
+    assert index.count(end="2024-01-31") == 1
+    
+    with pytest.raises(ValueError):
+        index.range("soon")
+
+
+def test_between_filters_by_date_range(many_invoices):
+    """Test between= range filtering through the date index."""
+    result = many_invoices._list_records(
+        "invoices",
+        between={"issue_date": ("2024-01-02", "2024-01-03")}
+    )
+    
+    assert sorted(r["id"] for r in result["records"]) == ["inv-2", "inv-3", "inv-4", "inv-5"]
+    
+    open_ended = many_invoices._top_records(
+        "invoices", 10, "-issue_date",
+        between={"issue_date": ("2024-01-04", None)}
+    )
+    
+    assert [r["id"] for r in open_ended] == ["inv-6"]
+    
+    invalid = many_invoices._list_records("invoices", between={"issue_date": ("soon", None)})
+    
+    assert "error" in invalid
+
+
+def test_date_index_tracks_updates_and_deletes(many_invoices):
+    """Test that the date index follows record mutations."""
+    january_2 = {"issue_date": ("2024-01-02", "2024-01-02")}
+    assert len(many_invoices._list_records("invoices", between=january_2)["records"]) == 2
+    
+    many_invoices._update_record("invoices", "inv-6", {"issue_date": "2024-01-02"})
+    many_invoices._delete_record("invoices", "inv-2")
+    many_invoices._update_record("invoices", "inv-undated", {"issue_date": "2024-01-02"})
+    
+    result = many_invoices._list_records("invoices", between=january_2)
+    
+    assert sorted(r["id"] for r in result["records"]) == ["inv-3", "inv-6", "inv-undated"]
+
+
+def test_batch_commits_once(server, monkeypatch):
+    """Test that tool calls in a batch see each other's writes and commit together."""
+    commits = []
+    records_changed = server._storage.records_changed
+    
+    def counting_records_changed(data, changes):
+        commits.append(list(changes))
+        return records_changed(data, changes)
+    
+    monkeypatch.setattr(server._storage, "record_changed", lambda *args: pytest.fail("saved per call"))
+    monkeypatch.setattr(server._storage, "records_changed", counting_records_changed)
+    
+    with server.batch():
+        server.call_tool("add_contact", {"contact_id": "c-1", "email": "a@example.com"})
+        server.call_tool("add_contact", {"contact_id": "c-2", "email": "b@example.com"})
+        assert server.call_tool("count_contacts", {}) == {"count": 2}
+    
+    assert commits == [[("contacts", "c-1"), ("contacts", "c-2")]]
+    assert len(SampleServer()._get_collection("contacts")) == 2
+
+
+def test_call_tool_rejects_unknown_tool(server):
+    """Test that only declared tools can be called."""
+    with pytest.raises(KeyError):
+        server.call_tool("_save_data", {})
+
+
+def test_health_check_does_not_write_the_store(invoices, monkeypatch):
+    """Test that health_check reports counts and file stats without saving."""
+    monkeypatch.setattr(invoices._storage, "save", lambda *args: pytest.fail("saved"))
+    monkeypatch.setattr(invoices._storage, "record_changed", lambda *args: pytest.fail("saved"))
+    files_before = {path: path.stat().st_mtime_ns for path in invoices._storage.files() if path.exists()}
+    
+    health = invoices.health_check()
+    
+    assert health["healthy"] is True
+    assert health["collections"]["invoices"] == 3
+    assert health["storage"]["size_bytes"] > 0
+    assert health["storage"]["modified"] is not None
+    assert health["last_save"]["success"] is True
+    assert health["write_check_ms"] >= 0
+    assert {path: path.stat().st_mtime_ns for path in files_before} == files_before
+    assert not list(invoices.data_path.parent.glob(".*.health"))
+
+
+def test_health_check_reports_failed_save(server, monkeypatch):
+    """Test that a failed last save marks the server unhealthy."""
+    monkeypatch.setattr(server._storage, "record_changed", lambda *args: False)
+    server._create_record("invoices", "inv-1", {"client_id": "acme", "status": "draft"})
+    
+    health = server.health_check()
+    
+    assert health["healthy"] is False
+    assert health["last_save"]["success"] is False
+
+
+def test_stats_count_unloaded_collections(invoices):
+    """Test that collection counts do not load lazily stored collections."""
+    from core.storage.base import LazyCollections
+    
+    fresh = SampleServer()
+    stats = fresh.get_stats()
+    
+    assert stats["collections"]["invoices"] == 3
+    if isinstance(fresh._data, LazyCollections):
+        assert not fresh._data.is_loaded("invoices")
+
+
+@pytest.fixture
+def write_behind(temp_data_dir, monkeypatch):
+    """Return a factory for sample servers in a write-behind mode."""
+    from core import config
+    
+    def make(mode: str, interval_ms: float = 50, max_pending: int = 100) -> SampleServer:
+        monkeypatch.setattr(config.Config, "WRITE_MODE", mode)
+        monkeypatch.setattr(config.Config, "WRITE_BEHIND_INTERVAL_MS", interval_ms)
+        monkeypatch.setattr(config.Config, "WRITE_BEHIND_MAX_PENDING", max_pending)
+        return SampleServer()
+    
+    return make
+
+
+def _record_writes(server, monkeypatch) -> list:
+    """Log the record batches reaching the storage engine."""
+    writes = []
+    records_changed = server._storage.records_changed
+    
+    def logging_records_changed(data, changes):
+        writes.append(list(changes))
+        return records_changed(data, changes)
+    
+    monkeypatch.setattr(server._storage, "record_changed", lambda *args: pytest.fail("written synchronously"))
+    monkeypatch.setattr(server._storage, "records_changed", logging_records_changed)
+    return writes
+
+
+def test_group_mode_coalesces_writes(write_behind, monkeypatch):
+    """Test that group mode writes a burst of mutations once, after the interval."""
+    import time
+    
+    server = write_behind("group", interval_ms=200)
+    writes = _record_writes(server, monkeypatch)
+    
+    for i in range(5):
+        server.call_tool("add_contact", {"contact_id": f"c-{i}", "email": f"{i}@example.com"})
+    assert writes == []
+    
+    deadline = time.monotonic() + 5
+    while not writes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    
+    assert writes == [[("contacts", f"c-{i}") for i in range(5)]]
+    assert server.health_check()["last_save"]["success"] is True
+
+
+def test_deferred_mode_writes_on_flush_or_max_pending(write_behind, monkeypatch):
+    """Test that deferred mode only writes when asked or when too many records are dirty."""
+    import time
+    from core.storage.write_behind import flush_all
+    
+    server = write_behind("deferred", interval_ms=1, max_pending=3)
+    writes = _record_writes(server, monkeypatch)
+    
+    server.add_contact("c-1", "a@example.com")
+    time.sleep(0.05)
+    assert writes == []
+    
+    flush_all()
+    assert writes == [[("contacts", "c-1")]]
+    
+    for i in range(2, 5):
+        server.add_contact(f"c-{i}", f"{i}@example.com")
+    assert server.flush()
+    assert sum(len(batch) for batch in writes) == 4
+    assert len(SampleServer()._get_collection("contacts")) == 4
+
+
+def test_rollback_keeps_buffered_mutations(write_behind):
+    """Test that a rolled back transaction does not discard earlier buffered writes."""
+    server = write_behind("deferred")
+    server.add_contact("c-1", "a@example.com")
+    
+    with pytest.raises(RuntimeError):
+        with server.transaction():
+            server.add_contact("c-2", "b@example.com")
+            raise RuntimeError("abort")
+    
+    assert list(server._get_collection("contacts")) == ["c-1"]
+    assert list(SampleServer()._get_collection("contacts")) == ["c-1"]
+
+
+def test_failed_flush_keeps_mutations_buffered(write_behind, monkeypatch):
+    """Test that a failed write-behind flush is retried by the next one."""
+    server = write_behind("deferred")
+    server.add_contact("c-1", "a@example.com")
+    
+    records_changed = server._storage.records_changed
+    monkeypatch.setattr(server._storage, "records_changed", lambda *args: False)
+    assert server.flush() is False
+    assert server.health_check()["healthy"] is False
+    
+    monkeypatch.setattr(server._storage, "records_changed", records_changed)
+    assert server.flush() is True
+    assert list(SampleServer()._get_collection("contacts")) == ["c-1"]
+
+
+class GatedServer(SampleServer):
+    """Sample server with a tool that pauses halfway through its writes."""
+    
+    TOOLS = SampleServer.TOOLS + ("add_pair",)
+    
+    def add_pair(self, started, release) -> dict:
+        self._create_record("contacts", "c-1", {"email": "a@example.com"})
+        started.set()
+        release.wait(5)
+        return self._create_record("contacts", "c-2", {"email": "b@example.com"})
+
+
+def test_flush_waits_for_direct_tool_calls(write_behind, monkeypatch):
+    """Test that a flush never writes a tool call called directly halfway through."""
+    import threading
+    
+    write_behind("deferred")
+    server = GatedServer()
+    started, release = threading.Event(), threading.Event()
+    
+    call = threading.Thread(target=server.add_pair, args=(started, release))
+    call.start()
+    started.wait(5)
+    flush = threading.Thread(target=server.flush)
+    flush.start()
+    flush.join(0.1)
+    
+    assert flush.is_alive()
+    release.set()
+    call.join(5)
+    flush.join(5)
+    
+    assert sorted(SampleServer()._get_collection("contacts")) == ["c-1", "c-2"]
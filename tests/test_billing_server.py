@@ -6,6 +6,7 @@ import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from decimal import Decimal
+from datetime import date
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -79,6 +80,40 @@ def test_create_invoice_basic(billing_server):
     assert result["invoice"]["subtotal"] == 8000.0
 
 
+def test_invoice_numbers_are_sequential(billing_server):
+    """Test that invoice numbers come from the yearly counter without gaps."""
+    year = date.today().year
+    items = [{"description": "Work", "quantity": 1, "rate": 100.0}]
+    
+    # Numbers issued before counters existed seed the counter
+    billing_server._create_record("invoices", "inv-legacy", {"invoice_number": f"{year}-0041"})
+    
+    numbers = [
+        billing_server.create_invoice("client-1", "Client", items)["invoice_number"]
+        for _ in range(3)
+    ]
+    
+    assert numbers == [f"{year}-0042", f"{year}-0043", f"{year}-0044"]
+    assert billing_server._get_collection("sequences")[f"invoice-{year}"]["value"] == 44
+
+
+def test_failed_invoice_does_not_consume_a_number(billing_server, monkeypatch):
+    """Test that an invoice that is not created leaves no gap in the numbers."""
+    year = date.today().year
+    items = [{"description": "Work", "quantity": 1, "rate": 100.0}]
+    billing_server.create_invoice("client-1", "Client", items)
+    
+    real_create = billing_server._create_record
+    monkeypatch.setattr(
+        billing_server, "_create_record",
+        lambda name, record_id, data: {"error": "rejected"} if name == "invoices" else real_create(name, record_id, data)
+    )
+    assert billing_server.create_invoice("client-1", "Client", items) == {"error": "rejected"}
+    
+    monkeypatch.setattr(billing_server, "_create_record", real_create)
+    assert billing_server.create_invoice("client-1", "Client", items)["invoice_number"] == f"{year}-0002"
+
+
 def test_create_invoice_with_tax(billing_server):
     """Test creating an invoice with tax."""
     items = [
@@ -178,6 +213,21 @@ def test_list_invoices(billing_server):
     assert result["count"] == 3
 
 
+def test_list_invoices_pages_only_on_request(billing_server):
+    """Test that list_invoices returns every invoice unless a limit is given."""
+    with billing_server.transaction():
+        for i in range(120):
+            billing_server._create_record("invoices", f"inv-{i:03d}", {"issue_date": "2024-03-05"})
+    
+    everything = billing_server.list_invoices()
+    assert everything["count"] == 120
+    assert everything["next_cursor"] is None
+    
+    page = billing_server.list_invoices(limit=50)
+    assert page["count"] == 50
+    assert page["next_cursor"] is not None
+
+
 def test_list_invoices_by_status(billing_server):
     """Test filtering invoices by status."""
     items = [{"description": "Item", "quantity": 1, "rate": 100.0}]
@@ -291,6 +341,16 @@ def test_get_revenue_report(billing_server):
     assert result["total_revenue"] == 3000.0
 
 
+def test_revenue_report_months_from_parsed_dates(billing_server):
+    """Test that invoices dated in compact ISO form land in the right month."""
+    billing_server._create_record("invoices", "inv-a", {"issue_date": "2024-03-05", "total": 100.0})
+    billing_server._create_record("invoices", "inv-b", {"issue_date": "20240320", "total": 50.0})
+    
+    result = billing_server.get_revenue_report(period="all")
+    
+    assert result["by_month"] == {"2024-03": 150.0}
+
+
 def test_get_profit_margin(billing_server):
     """Test calculating profit margin."""
     # Create revenue
@@ -160,6 +160,38 @@ def test_log_communication(client_server):
     assert result.get("status") == "logged"
 
 
+def test_get_communications_reports_total_across_pages(client_server):
+    """Test that total_available counts every match, not just the page."""
+    client_id = client_server.create_client(
+        name="Busy Client",
+        email="busy@example.com"
+    )["client_id"]
+    
+    for i in range(5):
+        client_server.log_communication(
+            client_id=client_id,
+            comm_type="email",
+            subject=f"Update {i}"
+        )
+    client_server.log_communication(
+        client_id=client_id,
+        comm_type="call",
+        subject="Check-in"
+    )
+    
+    page = client_server.get_communications(client_id=client_id, comm_type="email", limit=2)
+    
+    assert page["count"] == 2
+    assert page["total_available"] == 5
+    assert page["next_cursor"] is not None
+    
+    rest = client_server.get_communications(
+        client_id=client_id, comm_type="email", limit=2, cursor=page["next_cursor"]
+    )
+    assert rest["count"] == 2
+    assert "total_available" not in rest
+
+
 def test_schedule_meeting(client_server):
     """Test scheduling a meeting."""
     # Create a client
@@ -270,3 +302,16 @@ def test_server_health_check(client_server):
     
     assert "healthy" in health
     assert health["server"] == "client"
+
+
+def test_search_clients(client_server):
+    """Test searching clients by name and company prefixes."""
+    client_server.create_client(name="Jane Smith", email="jane@acme.com", company="Acme Corp")
+    
+    result = client_server.search_clients("acm")
+    
+    assert result["count"] == 1
+    assert result["clients"][0]["name"] == "Jane Smith"
+    
+    assert client_server.search_clients("jane corp")["count"] == 1
+    assert client_server.search_clients("jane globex")["count"] == 0
@@ -0,0 +1,114 @@
+"""
+Tests for data file codecs
+"""
+
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.codecs import CODECS, MSGPACK_MAGIC, Codec, decode, get_codec
+from core.utils import load_json, save_json
+
+
+SAMPLE = {
+    "invoices": {
+        "inv-1": {"id": "inv-1", "total": 1250.5, "line_items": [{"description": "Café work"}]}
+    },
+    "empty": {}
+}
+
+
+@pytest.mark.parametrize("name", [name for name, codec in CODECS.items() if codec.available()])
+def test_codec_round_trip(name):
+    """Test that every available codec decodes what it encodes."""
+    codec = get_codec(name)
+    
+    assert decode(codec.encode(SAMPLE)) == SAMPLE
+
+
+def test_compact_is_smaller_than_indented():
+    """Test that compact JSON drops the indentation."""
+    indented = get_codec("json").encode(SAMPLE)
+    compact = get_codec("compact").encode(SAMPLE)
+    
+    assert len(compact) < len(indented)
+    assert b"\n" not in compact
+
+
+def test_unsupported_types_written_as_strings():
+    """Test that values like datetimes are stringified by every codec."""
+    when = datetime(2024, 3, 1, 9, 30)
+    
+    for name in ("json", "compact", "orjson"):
+        assert decode(get_codec(name).encode({"at": when})) == {"at": str(when)}
+
+
+def test_unknown_codec_rejected():
+    """Test that an unknown codec name raises."""
+    with pytest.raises(ValueError):
+        get_codec("xml")
+
+
+def test_missing_dependency_falls_back_to_compact(monkeypatch):
+    """Test that a codec without its dependency degrades to compact JSON."""
+    from core import codecs
+    monkeypatch.setattr(codecs, "msgpack", None)
+    
+    assert get_codec("msgpack").name == "compact"
+
+
+def test_binary_file_detected_by_header(tmp_path):
+    """Test that load_json reads msgpack files written by save_json."""
+    pytest.importorskip("msgpack")
+    path = tmp_path / "sample_data.json"
+    
+    assert save_json(path, SAMPLE, codec="msgpack")
+    assert path.read_bytes().startswith(MSGPACK_MAGIC)
+    assert load_json(path) == SAMPLE
+
+
+def test_codec_must_implement_encode():
+    """Test that a codec without encode() cannot be instantiated."""
+    class Incomplete(Codec):
+        name = "incomplete"
+    
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_save_json_with_codec(tmp_path):
+    """Test that save_json writes the requested codec and load_json reads it."""
+    path = tmp_path / "sample_data.json"
+    
+    assert save_json(path, SAMPLE, codec="compact")
+    
+    assert path.read_bytes() == get_codec("compact").encode(SAMPLE)
+    assert load_json(path) == SAMPLE
+
+
+def test_convert_file(tmp_path):
+    """Test converting a data file between codecs in place."""
+    from core.storage.convert import convert_file
+    
+    path = tmp_path / "sample_data.json"
+    save_json(path, SAMPLE)
+    
+    result = convert_file(path, "compact")
+    
+    assert result["success"]
+    assert result["bytes_after"] < result["bytes_before"]
+    assert load_json(path) == SAMPLE
+
+
+def test_convert_file_keeps_unreadable_file(tmp_path):
+    """Test that a corrupt file is left untouched by the converter."""
+    from core.storage.convert import convert_file
+    
+    path = tmp_path / "sample_data.json"
+    path.write_text('{"invoices": ')
+    
+    assert "error" in convert_file(path, "compact")
+    assert path.read_text() == '{"invoices": '
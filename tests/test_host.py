@@ -0,0 +1,160 @@
+"""
+Tests for the multi-server host
+"""
+
+import asyncio
+import json
+import os
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.mcp import billing_server, career_server, work_server
+from core.mcp.host import SERVERS, ServerHost
+from core.mcp.stdio_server import StdioServer
+
+
+@pytest.fixture
+def host(tmp_path, monkeypatch):
+    """Create a host over a temporary data directory and vault."""
+    from core import config
+    monkeypatch.setattr(config.Config, "DATA_DIR", tmp_path / "data")
+    
+    tasks_dir = str(tmp_path / "vault" / "03-Tasks")
+    monkeypatch.setattr(work_server, "TASKS_DIR", tasks_dir)
+    monkeypatch.setattr(work_server, "TASKS_FILE", os.path.join(tasks_dir, "tasks.yaml"))
+    monkeypatch.setattr(work_server, "HOURS_FILE", os.path.join(tasks_dir, "hours.yaml"))
+    monkeypatch.setattr(work_server, "SEQUENCES_FILE", os.path.join(tasks_dir, "sequences.yaml"))
+    monkeypatch.setattr(work_server, "HOURS_DIR", os.path.join(tasks_dir, "hours"))
+    monkeypatch.setattr(work_server, "ROLLUPS_FILE", os.path.join(tasks_dir, "hours_rollups.json"))
+    
+    # Fresh module-level singletons
+    monkeypatch.setattr(billing_server, "_server_instance", None)
+    monkeypatch.setattr(career_server, "_server_instance", None)
+    
+    return ServerHost()
+
+
+def test_tools_listed_without_starting_servers(host):
+    """Test that every namespace's tools are registered lazily."""
+    tools = host.tools()
+    
+    assert "work_create_task" in tools
+    assert "billing_create_invoice" in tools
+    assert "career_add_skill" in tools
+    assert len(tools) == sum(len(host.tool_names(ns)) for ns in SERVERS)
+    assert not any(server["started"] for server in host.get_info()["servers"].values())
+
+
+def test_tool_call_starts_only_its_server(host):
+    """Test that a call starts its server, shared with the module functions."""
+    tools = host.tools()
+    
+    result = tools["career_add_skill"](skill_name="Python", category="programming", proficiency_level=4)
+    
+    assert "error" not in result
+    started = [ns for ns, server in host.get_info()["servers"].items() if server["started"]]
+    assert started == ["career"]
+    assert host.server("career") is career_server._get_server()
+    assert career_server.get_skills_inventory()["summary"]["total_skills"] == 1
+
+
+def test_tool_schema_drops_self(host):
+    """Test that method-backed tools describe only their real parameters."""
+    server = StdioServer("freelance-dev", "0.1.0", host.tools())
+    
+    response = asyncio.run(server.handle({"jsonrpc": "2.0", "id": 1, "method": "tools/list"}))
+    schemas = {tool["name"]: tool for tool in response["result"]["tools"]}
+    
+    properties = schemas["billing_get_invoice"]["inputSchema"]["properties"]
+    assert list(properties) == ["invoice_id"]
+
+
+def test_served_over_stdio(host):
+    """Test calls to two servers through one StdioServer."""
+    server = StdioServer("freelance-dev", "0.1.0", host.tools())
+    
+    async def call(request_id, name, arguments):
+        return await server.handle({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/call",
+            "params": {"name": name, "arguments": arguments}
+        })
+    
+    async def run():
+        return await asyncio.gather(
+            call(1, "work_create_task", {"title": "Host task", "billable": False}),
+            call(2, "billing_list_invoices", {})
+        )
+    
+    responses = asyncio.run(run())
+    
+    assert all(not r["result"]["isError"] for r in responses)
+    assert json.loads(responses[0]["result"]["content"][0]["text"])["task_id"].startswith("task-")
+
+
+def test_batch_spans_servers(host):
+    """Test a batch touching two servers through the host's batch context."""
+    server = StdioServer("freelance-dev", "0.1.0", host.tools(), batch=host.batch)
+    
+    def call(request_id, name, arguments):
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/call",
+            "params": {"name": name, "arguments": arguments}
+        }
+    
+    responses = asyncio.run(server.handle_batch([
+        call(1, "career_add_skill", {"skill_name": "Go", "category": "programming", "proficiency_level": 3}),
+        call(2, "career_get_skills_inventory", {}),
+        call(3, "work_create_task", {"title": "Batched", "billable": False})
+    ]))
+    
+    assert all(not r["result"]["isError"] for r in responses)
+    inventory = json.loads(responses[1]["result"]["content"][0]["text"])
+    assert inventory["summary"]["total_skills"] == 1
+    assert "Batched" in open(work_server.TASKS_FILE).read()
+    assert sorted(ns for ns, s in host.get_info()["servers"].items() if s["started"]) == ["career", "work"]
+
+
+def test_unknown_namespace_rejected():
+    """Test that hosting a server that does not exist fails early."""
+    with pytest.raises(ValueError):
+        ServerHost(["work", "payroll"])
+
+
+def test_package_import_is_lazy():
+    """Test that importing core.mcp loads no server module or configuration."""
+    import subprocess
+    
+    code = (
+        "import sys, core.mcp; "
+        "print(sorted(m for m in sys.modules if m.startswith(('core.', 'dotenv', 'yaml'))))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    
+    assert output.strip() == "['core.mcp']"
+
+
+def test_get_all_servers_starts_nothing(host):
+    """Test that server metadata comes from the classes, not instances."""
+    from core import config
+    from core.mcp import get_all_servers
+    
+    servers = get_all_servers()
+    
+    assert set(servers) == set(SERVERS)
+    assert "create_invoice" in servers["billing"]["tools"]
+    assert servers["career"]["name"] == "career-server"
+    assert billing_server._server_instance is None
+    assert not config.Config.DATA_DIR.exists()
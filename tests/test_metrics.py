@@ -0,0 +1,103 @@
+"""
+Tests for per-tool call metrics
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.metrics import instrument, record_io, record_save, registry
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    """Start every test with empty statistics."""
+    registry.reset()
+    yield
+    registry.reset()
+
+
+@pytest.fixture
+def temp_data_dir(tmp_path, monkeypatch):
+    """Create a temporary data directory for testing."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    
+    from core import config
+    monkeypatch.setattr(config.Config, "DATA_DIR", data_dir)
+    
+    yield data_dir
+
+
+def test_latency_percentiles_and_errors():
+    """Test call counts, error counting and nearest-rank percentiles."""
+    def tool(fail: bool = False) -> dict:
+        return {"error": "bad"} if fail else {"ok": True}
+    
+    timed = instrument("test", tool)
+    for _ in range(9):
+        timed()
+    timed(fail=True)
+    
+    stats = registry.snapshot("test")["tool"]
+    assert stats["calls"] == 10
+    assert stats["errors"] == 1
+    assert 0 <= stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+
+def test_io_counts_for_nested_calls():
+    """Test that I/O is attributed to every tool call running in the thread."""
+    inner = instrument("test", lambda: record_io(read=10) or {}, "inner")
+    
+    def outer_tool() -> dict:
+        record_io(written=5)
+        record_save()
+        return inner()
+    
+    instrument("test", outer_tool, "outer")()
+    
+    stats = registry.snapshot("test")
+    assert (stats["outer"]["bytes_read"], stats["outer"]["bytes_written"], stats["outer"]["saves"]) == (10, 5, 1)
+    assert (stats["inner"]["bytes_read"], stats["inner"]["bytes_written"], stats["inner"]["saves"]) == (10, 0, 0)
+
+
+def test_raising_tool_counts_as_error():
+    """Test that an exception is recorded before it propagates."""
+    def broken() -> dict:
+        raise RuntimeError("boom")
+    
+    with pytest.raises(RuntimeError):
+        instrument("test", broken)()
+    
+    assert registry.snapshot("test")["broken"]["errors"] == 1
+
+
+def test_server_get_stats_reports_tool_io(temp_data_dir):
+    """Test that server tool methods are instrumented and exposed by get_stats()."""
+    from core.mcp.client_server import ClientServer
+    
+    server = ClientServer()
+    server.create_client(name="Ada", email="ada@example.com")
+    
+    stats = server.get_stats()["tools"]["create_client"]
+    assert stats["calls"] == 1
+    assert stats["saves"] >= 1
+    assert stats["bytes_written"] > 0
+
+
+def test_prometheus_export(tmp_path, monkeypatch):
+    """Test the text format and the throttled metrics file."""
+    from core import config
+    metrics_file = tmp_path / "metrics.prom"
+    monkeypatch.setattr(config.Config, "METRICS_FILE", str(metrics_file))
+    monkeypatch.setattr(config.Config, "METRICS_INTERVAL", 0)
+    
+    instrument("billing", lambda: {}, "list_invoices")()
+    
+    text = metrics_file.read_text()
+    assert "# TYPE freelance_tool_calls_total counter" in text
+    assert 'freelance_tool_calls_total{server="billing",tool="list_invoices"} 1' in text
+    assert 'freelance_tool_latency_seconds{server="billing",tool="list_invoices",quantile="0.99"}' in text
+    assert 'freelance_tool_latency_seconds_count{server="billing",tool="list_invoices"} 1' in text
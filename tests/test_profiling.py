@@ -0,0 +1,133 @@
+"""
+Tests for opt-in tool call profiling
+"""
+
+import os
+import pstats
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import profiling
+from core.config import Config
+from core.metrics import instrument, registry
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    """Send profiles to a temporary directory with profiling switched off."""
+    directory = tmp_path / "profiles"
+    monkeypatch.setattr(Config, "PROFILE_DIR", str(directory))
+    monkeypatch.setattr(Config, "PROFILE_TOOLS", "")
+    monkeypatch.setattr(Config, "PROFILE_SAMPLE_PERCENT", 0.0)
+    monkeypatch.setattr(Config, "PROFILE_MAX_MB", 50.0)
+    registry.reset()
+    yield directory
+    registry.reset()
+
+
+def busy_tool() -> dict:
+    """Allocate and compute a little so the profile has content."""
+    data = [str(i) * 10 for i in range(5000)]
+    return {"count": len(data)}
+
+
+def test_targeted_tool_writes_profile_and_memory_report(profile_dir, monkeypatch):
+    """Test that a tool named in PROFILE_TOOLS leaves a loadable .prof and a memory report."""
+    monkeypatch.setattr(Config, "PROFILE_TOOLS", "busy_tool")
+    
+    assert instrument("test", busy_tool)() == {"count": 5000}
+    
+    prof_files = list(profile_dir.glob("*-test-busy_tool.prof"))
+    memory_files = list(profile_dir.glob("*-test-busy_tool.memory.txt"))
+    assert len(prof_files) == 1 and len(memory_files) == 1
+    
+    stats = pstats.Stats(str(prof_files[0]))
+    assert any(name == "busy_tool" for _, _, name in stats.stats)
+    report = memory_files[0].read_text()
+    assert report.startswith("test.busy_tool took")
+    assert "test_profiling.py" in report
+
+
+def test_server_qualified_target(profile_dir, monkeypatch):
+    """Test that 'server.tool' only profiles that server's tool."""
+    monkeypatch.setattr(Config, "PROFILE_TOOLS", "other.busy_tool, test.busy_tool")
+    
+    instrument("test", busy_tool)()
+    instrument("third", busy_tool)()
+    
+    assert len(list(profile_dir.glob("*.prof"))) == 1
+    assert profiling.should_profile("other", "busy_tool")
+    assert not profiling.should_profile("third", "busy_tool")
+
+
+def test_off_by_default(profile_dir):
+    """Test that nothing is profiled without targets or sampling."""
+    instrument("test", busy_tool)()
+    
+    assert not profile_dir.exists()
+
+
+def test_sampling(profile_dir, monkeypatch):
+    """Test that PROFILE_SAMPLE_PERCENT=100 profiles every call."""
+    monkeypatch.setattr(Config, "PROFILE_SAMPLE_PERCENT", 100.0)
+    
+    for _ in range(3):
+        instrument("test", busy_tool)()
+    
+    assert len(list(profile_dir.glob("*.prof"))) == 3
+
+
+def test_nested_calls_share_one_profile(profile_dir, monkeypatch):
+    """Test that a profiled tool calling another tool produces one profile."""
+    monkeypatch.setattr(Config, "PROFILE_SAMPLE_PERCENT", 100.0)
+    inner = instrument("test", busy_tool)
+    
+    instrument("test", lambda: inner(), "outer")()
+    
+    assert [path.name.split("-")[-1] for path in profile_dir.glob("*.prof")] == ["outer.prof"]
+
+
+def test_rotation_deletes_oldest_files(profile_dir, monkeypatch):
+    """Test that old profiles are deleted once the directory exceeds PROFILE_MAX_MB."""
+    profile_dir.mkdir()
+    for i in range(3):
+        path = profile_dir / f"old-{i}.prof"
+        path.write_bytes(b"x" * 1024)
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+    (profile_dir / "keep.json").write_bytes(b"x" * 4096)
+    monkeypatch.setattr(Config, "PROFILE_MAX_MB", 2.5 / 1024)
+    
+    profiling.rotate()
+    
+    assert sorted(path.name for path in profile_dir.iterdir()) == ["keep.json", "old-1.prof", "old-2.prof"]
+
+
+def test_write_failure_does_not_fail_the_call(profile_dir, monkeypatch):
+    """Test that a profile that cannot be written is logged and the result returned."""
+    profile_dir.parent.mkdir(parents=True, exist_ok=True)
+    profile_dir.write_text("not a directory")
+    monkeypatch.setattr(Config, "PROFILE_TOOLS", "busy_tool")
+    
+    assert instrument("test", busy_tool)() == {"count": 5000}
+    assert registry.snapshot("test")["busy_tool"]["errors"] == 0
+
+
+def test_start_failure_does_not_disable_profiling(profile_dir, monkeypatch):
+    """Test that a profiler failing to start is undone and later calls are profiled."""
+    monkeypatch.setattr(Config, "PROFILE_TOOLS", "busy_tool")
+    real_enable = profiling.cProfile.Profile.enable
+    
+    def failing_enable(self):
+        raise ValueError("Another profiling tool is already active")
+    
+    monkeypatch.setattr(profiling.cProfile.Profile, "enable", failing_enable)
+    assert instrument("test", busy_tool)() == {"count": 5000}
+    assert profiling._tracemalloc_users == 0
+    assert not list(profile_dir.glob("*.prof"))
+    
+    monkeypatch.setattr(profiling.cProfile.Profile, "enable", real_enable)
+    instrument("test", busy_tool)()
+    assert len(list(profile_dir.glob("*-test-busy_tool.prof"))) == 1
@@ -0,0 +1,182 @@
+"""
+Tests for the asyncio stdio JSON-RPC server
+"""
+
+import asyncio
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.mcp.stdio_server import INTERNAL_ERROR, INVALID_PARAMS, INVALID_REQUEST, METHOD_NOT_FOUND, StdioServer
+
+
+def echo(text: str, repeat: Optional[int] = 1) -> dict:
+    """Echo text back.
+    
+    Args:
+        text: Text to echo
+    """
+    return {"text": text * repeat}
+
+
+def fail() -> dict:
+    """Always return an error."""
+    return {"error": "nope"}
+
+
+def run_server(server: StdioServer, requests: list) -> list[dict]:
+    """Feed requests to the server and collect the responses in write order."""
+    lines = [json.dumps(r) if not isinstance(r, str) else r for r in requests]
+    output = []
+    
+    async def read_line() -> str:
+        return lines.pop(0) + "\n" if lines else ""
+    
+    asyncio.run(server.serve(read_line, output.append))
+    return [json.loads(line) for line in output]
+
+
+def run_batch(server: StdioServer, batch: list) -> list:
+    """Send one batch and return the decoded response array."""
+    responses = run_server(server, [batch])
+    assert len(responses) == 1
+    return responses[0]
+
+
+def call(request_id: int, name: str, **arguments) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": name, "arguments": arguments}
+    }
+
+
+def test_initialize_and_list_tools():
+    """Test the handshake and the generated tool schemas."""
+    server = StdioServer("test-server", "1.0", {"echo": echo})
+    responses = run_server(server, [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+    ])
+    
+    assert len(responses) == 2
+    by_id = {r["id"]: r for r in responses}
+    assert by_id[1]["result"]["serverInfo"] == {"name": "test-server", "version": "1.0"}
+    
+    tool = by_id[2]["result"]["tools"][0]
+    assert tool["name"] == "echo"
+    assert tool["description"] == "Echo text back."
+    assert tool["inputSchema"]["properties"] == {"text": {"type": "string"}, "repeat": {"type": "integer"}}
+    assert tool["inputSchema"]["required"] == ["text"]
+
+
+def test_tool_call_results_and_errors():
+    """Test tool results, error dicts and bad requests."""
+    server = StdioServer("test-server", "1.0", {"echo": echo, "fail": fail})
+    responses = run_server(server, [
+        call(1, "echo", text="ab", repeat=2),
+        call(2, "fail"),
+        call(3, "missing"),
+        call(4, "echo", wrong=1),
+        {"jsonrpc": "2.0", "id": 5, "method": "resources/list"},
+        "not json",
+    ])
+    by_id = {r["id"]: r for r in responses}
+    
+    assert json.loads(by_id[1]["result"]["content"][0]["text"]) == {"text": "abab"}
+    assert by_id[1]["result"]["isError"] is False
+    assert by_id[2]["result"]["isError"] is True
+    assert by_id[3]["error"]["code"] == INVALID_PARAMS
+    assert by_id[4]["error"]["code"] == INVALID_PARAMS
+    assert by_id[5]["error"]["code"] == METHOD_NOT_FOUND
+    assert by_id[None]["error"]["code"] == -32700
+
+
+def test_slow_tool_does_not_block_others():
+    """Test that responses are written as tools finish, not in request order."""
+    answered = threading.Event()
+    
+    def slow() -> dict:
+        """Wait until the fast call has been answered."""
+        return {"done": answered.wait(timeout=5)}
+    
+    def fast() -> dict:
+        """Return immediately."""
+        return {"done": True}
+    
+    lines = [json.dumps(call(1, "slow")), json.dumps(call(2, "fast"))]
+    output = []
+    
+    async def read_line() -> str:
+        return lines.pop(0) + "\n" if lines else ""
+    
+    def write_line(line: str) -> None:
+        output.append(json.loads(line))
+        if output[-1]["id"] == 2:
+            answered.set()
+    
+    server = StdioServer("test-server", "1.0", {"slow": slow, "fast": fast}, max_workers=2)
+    asyncio.run(server.serve(read_line, write_line))
+    
+    assert [r["id"] for r in output] == [2, 1]
+    assert json.loads(output[1]["result"]["content"][0]["text"]) == {"done": True}
+
+
+def test_batch_runs_calls_in_one_context():
+    """Test that a batch's tool calls share one batch context and keep request order."""
+    entered = []
+    calls = []
+    
+    @contextmanager
+    def batch(names):
+        entered.append(names)
+        yield
+        calls.append("commit")
+    
+    def record(text: str) -> dict:
+        """Record a call."""
+        calls.append(text)
+        return {"text": text}
+    
+    server = StdioServer("test-server", "1.0", {"record": record, "echo": echo}, batch=batch)
+    responses = run_batch(server, [
+        call(1, "record", text="a"),
+        {"jsonrpc": "2.0", "id": 2, "method": "ping"},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        call(3, "record", text="b"),
+        call(4, "echo", wrong=1),
+    ])
+    
+    assert [r["id"] for r in responses] == [1, 2, 3, 4]
+    assert responses[1]["result"] == {}
+    assert responses[3]["error"]["code"] == INVALID_PARAMS
+    assert entered == [["record", "record", "echo"]]
+    assert calls == ["a", "b", "commit"]
+
+
+def test_batch_commit_failure_fails_every_call():
+    """Test that a batch that cannot commit reports an error for each call."""
+    @contextmanager
+    def batch(names):
+        yield
+        raise IOError("disk full")
+    
+    server = StdioServer("test-server", "1.0", {"echo": echo}, batch=batch)
+    responses = run_batch(server, [call(1, "echo", text="a"), call(2, "echo", text="b")])
+    
+    assert [r["error"]["code"] for r in responses] == [INTERNAL_ERROR, INTERNAL_ERROR]
+
+
+def test_empty_batch_is_invalid():
+    """Test that an empty array is rejected."""
+    server = StdioServer("test-server", "1.0", {"echo": echo})
+    responses = run_server(server, ["[]"])
+    
+    assert responses[0]["error"]["code"] == INVALID_REQUEST
@@ -0,0 +1,421 @@
+"""
+Tests for storage engines behind BaseMCPServer
+"""
+
+import json
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.mcp.base_server import BaseMCPServer
+from core.storage import JournaledStorage, get_storage_engine
+
+
+class SampleServer(BaseMCPServer):
+    """Minimal concrete server for exercising the base class."""
+    
+    def __init__(self):
+        super().__init__("sample")
+    
+    def get_info(self) -> dict:
+        return {"name": "sample-server", "tools": []}
+
+
+@pytest.fixture
+def temp_data_dir(tmp_path, monkeypatch):
+    """Create a temporary data directory for testing."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    
+    # Patch Config to use temp directory
+    from core import config
+    monkeypatch.setattr(config.Config, "DATA_DIR", data_dir)
+    
+    yield data_dir
+
+
+@pytest.fixture
+def journal_server(temp_data_dir, monkeypatch):
+    """Create a server using journaled storage."""
+    from core import config
+    monkeypatch.setattr(config.Config, "STORAGE_BACKEND", "journal")
+    monkeypatch.setattr(config.Config, "JOURNAL_COMPACT_THRESHOLD", 5)
+    
+    return SampleServer()
+
+
+def test_unknown_backend_rejected(temp_data_dir):
+    """Test that an unknown backend name raises."""
+    with pytest.raises(ValueError):
+        get_storage_engine("carrier-pigeon", temp_data_dir / "x.json")
+
+
+def test_journal_appends_without_rewriting_snapshot(journal_server):
+    """Test that record writes go to the journal, not the snapshot."""
+    journal_server._create_record("items", "item-1", {"name": "First"})
+    journal_server._create_record("items", "item-2", {"name": "Second"})
+    
+    assert not journal_server.data_path.exists()
+    
+    journal_path = journal_server._storage.journal_path
+    lines = journal_path.read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["op"] == "put"
+
+
+def test_journal_replayed_on_load(journal_server):
+    """Test that a new server instance sees journaled mutations."""
+    journal_server._create_record("items", "item-1", {"name": "First"})
+    journal_server._create_record("items", "item-2", {"name": "Second"})
+    journal_server._update_record("items", "item-1", {"name": "Renamed"})
+    journal_server._delete_record("items", "item-2")
+    journal_server._storage.close()
+    
+    reloaded = SampleServer()
+    
+    items = reloaded._get_collection("items")
+    assert list(items) == ["item-1"]
+    assert items["item-1"]["name"] == "Renamed"
+
+
+def test_journal_compacts_at_threshold(journal_server):
+    """Test that the journal is folded into the snapshot at the threshold."""
+    for i in range(5):
+        journal_server._create_record("items", f"item-{i}", {"n": i})
+    
+    assert journal_server.data_path.exists()
+    assert not journal_server._storage.journal_path.exists()
+    assert journal_server._storage.pending_entries == 0
+    
+    snapshot = json.loads(journal_server.data_path.read_text())
+    assert len(snapshot["items"]) == 5
+
+
+def test_journal_failed_compaction_keeps_the_change(journal_server, monkeypatch):
+    """Test that a change is reported as saved once it is in the journal."""
+    from core.storage.json_store import JSONStorage
+    real_save = JSONStorage.save
+    monkeypatch.setattr(JSONStorage, "save", lambda self, data: False)
+    
+    results = [journal_server._create_record("items", f"item-{i}", {"n": i}) for i in range(5)]
+    
+    assert all(result.get("success") for result in results)
+    assert journal_server._storage.pending_entries == 5
+    assert len(JournaledStorage(journal_server.data_path).read()["items"]) == 5
+    
+    monkeypatch.setattr(JSONStorage, "save", real_save)
+    journal_server._create_record("items", "item-5", {"n": 5})
+    assert journal_server._storage.pending_entries == 0
+
+
+def test_count_records_defaults_to_loading_the_store(temp_data_dir):
+    """Test that backends without a cheaper count still count records."""
+    storage = JournaledStorage(temp_data_dir / "sample_data.json")
+    storage.save({"items": {"a": {"id": "a"}, "b": {"id": "b"}}})
+    
+    assert storage.count_records("items") == 2
+    assert storage.count_records("missing") == 0
+
+
+def test_journal_ignores_torn_tail(temp_data_dir):
+    """Test that a partially written final line is skipped on replay."""
+    data_path = temp_data_dir / "sample_data.json"
+    journal_path = data_path.with_suffix(".journal")
+    journal_path.write_text(
+        '{"op":"put","collection":"items","id":"a","record":{"id":"a"}}\n'
+        '{"op":"put","collection":"items","id":"b","rec'
+    )
+    
+    data = JournaledStorage(data_path).load()
+    
+    assert list(data["items"]) == ["a"]
+    assert journal_path.read_text().endswith("}}\n")
+
+
+def test_journal_rejects_corrupt_line_before_valid_entries(temp_data_dir):
+    """Test that only the last journal line may be unreadable."""
+    data_path = temp_data_dir / "sample_data.json"
+    journal_path = data_path.with_suffix(".journal")
+    journal_path.write_text(
+        '{"op":"put","collection":"items","id":"a","record":{"id":"a"}}\n'
+        '{"op":"put","collection":"items","id":"b","rec\n'
+        '{"op":"put","collection":"items","id":"c","record":{"id":"c"}}\n'
+    )
+    
+    with pytest.raises(ValueError):
+        JournaledStorage(data_path).load()
+
+
+def test_journal_failed_append_leaves_no_partial_line(temp_data_dir):
+    """Test that a write failing partway is cut back off the journal."""
+    storage = JournaledStorage(temp_data_dir / "sample_data.json")
+    data = {"items": {"a": {"id": "a"}}}
+    assert storage.record_changed(data, "items", "a")
+    
+    class FailingFile:
+        """Journal handle that writes a few bytes and then fails."""
+        
+        def __init__(self, real):
+            self.real = real
+        
+        def fileno(self):
+            return self.real.fileno()
+        
+        def write(self, line):
+            self.real.write(line[:10])
+            raise OSError("disk full")
+        
+        def close(self):
+            self.real.close()
+    
+    storage._journal_file = FailingFile(storage._journal_file)
+    data["items"]["b"] = {"id": "b"}
+    assert not storage.record_changed(data, "items", "b")
+    
+    storage._journal_file = storage._journal_file.real
+    data["items"]["c"] = {"id": "c"}
+    assert storage.record_changed(data, "items", "c")
+    storage.close()
+    
+    assert list(JournaledStorage(storage.data_path).load()["items"]) == ["a", "c"]
+
+
+def test_journal_read_does_not_repair(temp_data_dir):
+    """Test that read() skips a torn tail without truncating the file."""
+    data_path = temp_data_dir / "sample_data.json"
+    journal_path = data_path.with_suffix(".journal")
+    contents = (
+        '{"op":"put","collection":"items","id":"a","record":{"id":"a"}}\n'
+        '{"op":"put","collection":"items","id":"b","rec'
+    )
+    journal_path.write_text(contents)
+    
+    assert list(JournaledStorage(data_path).read()["items"]) == ["a"]
+    assert journal_path.read_text() == contents
+
+
+@pytest.fixture
+def sqlite_server(temp_data_dir, monkeypatch):
+    """Create a server using SQLite storage."""
+    from core import config
+    monkeypatch.setattr(config.Config, "STORAGE_BACKEND", "sqlite")
+    
+    return SampleServer()
+
+
+def test_sqlite_round_trip(sqlite_server):
+    """Test that SQLite-backed records survive a restart."""
+    sqlite_server._create_record("items", "item-1", {"name": "First"})
+    sqlite_server._create_record("items", "item-2", {"name": "Second"})
+    sqlite_server._update_record("items", "item-1", {"name": "Renamed"})
+    sqlite_server._delete_record("items", "item-2")
+    sqlite_server._storage.close()
+    
+    reloaded = SampleServer()
+    
+    items = reloaded._get_collection("items")
+    assert list(items) == ["item-1"]
+    assert items["item-1"]["name"] == "Renamed"
+    assert not reloaded.data_path.exists()
+
+
+def test_sqlite_loads_collections_lazily(sqlite_server):
+    """Test that only accessed collections are read from the database."""
+    sqlite_server._create_record("items", "item-1", {"name": "First"})
+    sqlite_server._create_record("notes", "note-1", {"text": "Hello"})
+    sqlite_server._storage.close()
+    
+    reloaded = SampleServer()
+    
+    assert "notes" in reloaded._data
+    assert not reloaded._data.is_loaded("notes")
+    
+    reloaded._read_record("items", "item-1")
+    
+    assert reloaded._data.is_loaded("items")
+    assert not reloaded._data.is_loaded("notes")
+
+
+def test_sqlite_imports_existing_json(temp_data_dir, monkeypatch):
+    """Test that switching to SQLite picks up existing JSON data."""
+    from core import config
+    monkeypatch.setattr(config.Config, "STORAGE_BACKEND", "json")
+    
+    legacy = SampleServer()
+    legacy._create_record("items", "item-1", {"name": "Legacy"})
+    
+    monkeypatch.setattr(config.Config, "STORAGE_BACKEND", "sqlite")
+    migrated = SampleServer()
+    
+    assert migrated._read_record("items", "item-1")["record"]["name"] == "Legacy"
+
+
+def test_sqlite_retries_failed_import(temp_data_dir):
+    """Test that an unreadable JSON file leaves no database behind to block a retry."""
+    from core.storage import SQLiteStorage
+    
+    data_path = temp_data_dir / "sample_data.json"
+    data_path.write_text('{"items": {"a": ')
+    
+    with pytest.raises(ValueError):
+        SQLiteStorage(data_path)
+    assert not data_path.with_suffix(".db").exists()
+    
+    data_path.write_text(json.dumps({"items": {"a": {"id": "a"}}}))
+    storage = SQLiteStorage(data_path)
+    
+    assert list(storage.load()["items"]) == ["a"]
+    storage.close()
+
+
+def test_migrate_json_to_sqlite(temp_data_dir):
+    """Test the explicit migration helper."""
+    from core.storage import migrate_json_to_sqlite
+    
+    data_path = temp_data_dir / "sample_data.json"
+    data_path.write_text(json.dumps({"items": {"a": {"id": "a"}, "b": {"id": "b"}}}))
+    
+    result = migrate_json_to_sqlite(data_path)
+    
+    assert result["success"]
+    assert result["collections"] == {"items": 2}
+    assert "error" in migrate_json_to_sqlite(data_path)
+
+
+def test_per_server_backend_override(temp_data_dir, monkeypatch):
+    """Test that a server-specific backend overrides the default."""
+    from core import config
+    monkeypatch.setattr(config.Config, "STORAGE_BACKEND_OVERRIDES", {"sample": "sqlite"})
+    
+    server = SampleServer()
+    
+    assert type(server._storage).__name__ == "SQLiteStorage"
+
+
+def test_journal_transaction_is_one_entry(journal_server):
+    """Test that a transaction is journaled as one all-or-nothing batch."""
+    with journal_server.transaction():
+        journal_server._create_record("items", "item-1", {"name": "First"})
+        journal_server._create_record("items", "item-2", {"name": "Second"})
+        journal_server._delete_record("items", "item-1")
+    
+    lines = journal_server._storage.journal_path.read_text().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["op"] == "batch"
+    
+    journal_server._storage.close()
+    assert list(SampleServer()._get_collection("items")) == ["item-2"]
+
+
+@pytest.fixture
+def split_server(temp_data_dir, monkeypatch):
+    """Create a server using split-file storage."""
+    from core import config
+    monkeypatch.setattr(config.Config, "STORAGE_BACKEND", "split")
+    
+    return SampleServer()
+
+
+def test_split_writes_one_file_per_collection(split_server):
+    """Test that a record write only rewrites its own collection file."""
+    split_server._create_record("items", "item-1", {"name": "First"})
+    split_server._create_record("notes", "note-1", {"text": "Hello"})
+    
+    collections_dir = split_server._storage.collections_dir
+    notes_mtime = (collections_dir / "notes.json").stat().st_mtime_ns
+    
+    split_server._update_record("items", "item-1", {"name": "Renamed"})
+    
+    assert sorted(p.name for p in collections_dir.iterdir()) == ["items.json", "notes.json"]
+    assert (collections_dir / "notes.json").stat().st_mtime_ns == notes_mtime
+    assert not split_server.data_path.exists()
+
+
+def test_split_loads_collections_lazily(split_server):
+    """Test that only accessed collection files are read."""
+    split_server._create_record("items", "item-1", {"name": "First"})
+    split_server._create_record("notes", "note-1", {"text": "Hello"})
+    
+    reloaded = SampleServer()
+    
+    assert "notes" in reloaded._data
+    assert not reloaded._data.is_loaded("notes")
+    
+    assert reloaded._read_record("items", "item-1")["record"]["name"] == "First"
+    
+    assert reloaded._data.is_loaded("items")
+    assert not reloaded._data.is_loaded("notes")
+
+
+def test_split_imports_existing_json(temp_data_dir, monkeypatch):
+    """Test that switching to split storage picks up existing JSON data."""
+    from core import config
+    monkeypatch.setattr(config.Config, "STORAGE_BACKEND", "json")
+    
+    legacy = SampleServer()
+    legacy._create_record("items", "item-1", {"name": "Legacy"})
+    
+    monkeypatch.setattr(config.Config, "STORAGE_BACKEND", "split")
+    migrated = SampleServer()
+    
+    assert (migrated._storage.collections_dir / "items.json").exists()
+    assert migrated._read_record("items", "item-1")["record"]["name"] == "Legacy"
+
+
+def test_split_retries_failed_import(temp_data_dir):
+    """Test that an unreadable JSON file leaves no directory behind to block a retry."""
+    from core.storage import SplitFileStorage
+    
+    data_path = temp_data_dir / "sample_data.json"
+    data_path.write_text('{"items": {"a": ')
+    
+    with pytest.raises(ValueError):
+        SplitFileStorage(data_path)
+    assert not data_path.with_suffix("").exists()
+    
+    data_path.write_text(json.dumps({"items": {"a": {"id": "a"}}}))
+    
+    assert list(SplitFileStorage(data_path).load()["items"]) == ["a"]
+
+
+def test_split_batch_is_all_or_nothing(temp_data_dir, monkeypatch):
+    """Test that a multi-collection write that fails to commit changes no file."""
+    from core.storage import SplitFileStorage, split_store
+    
+    storage = SplitFileStorage(temp_data_dir / "sample_data.json")
+    data = {"invoices": {"i": {"status": "sent"}}, "payments": {}}
+    assert storage.save(data)
+    
+    monkeypatch.setattr(split_store, "save_json", lambda *args, **kwargs: False)
+    data["invoices"]["i"]["status"] = "paid"
+    data["payments"]["p"] = {"invoice_id": "i"}
+    assert not storage.records_changed(data, [("invoices", "i"), ("payments", "p")])
+    
+    reloaded = SplitFileStorage(storage.data_path).load()
+    assert reloaded["invoices"]["i"]["status"] == "sent"
+    assert reloaded["payments"] == {}
+    assert not list(storage.collections_dir.glob("*.staged"))
+
+
+def test_split_recovers_interrupted_commit(temp_data_dir):
+    """Test that reopening finishes a listed commit and drops unlisted staged files."""
+    from core.storage import SplitFileStorage
+    
+    storage = SplitFileStorage(temp_data_dir / "sample_data.json")
+    assert storage.save({"invoices": {"i": {"status": "sent"}}, "payments": {}})
+    
+    # Crash after the commit file was written and one file was renamed
+    directory = storage.collections_dir
+    (directory / "invoices.json").write_text(json.dumps({"i": {"status": "paid"}}))
+    (directory / "payments.json.staged").write_text(json.dumps({"p": {"invoice_id": "i"}}))
+    (directory / "notes.json.staged").write_text(json.dumps({"n": {}}))
+    (directory / ".commit").write_text(json.dumps(["invoices", "payments"]))
+    
+    data = SplitFileStorage(storage.data_path).load()
+    
+    assert data["invoices"]["i"]["status"] == "paid"
+    assert list(data["payments"]) == ["p"]
+    assert "notes" not in data
+    assert sorted(path.name for path in directory.iterdir()) == ["invoices.json", "payments.json"]
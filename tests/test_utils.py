@@ -0,0 +1,45 @@
+"""
+Tests for shared utility functions
+"""
+
+import re
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.utils import generate_id
+
+
+def test_generate_id_is_unique_and_sorted_within_a_second():
+    """Test that IDs created in a burst never collide and keep creation order."""
+    ids = [generate_id("inv") for _ in range(10000)]
+    
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+
+
+def test_generate_id_format():
+    """Test ID layout with and without the date component."""
+    assert re.fullmatch(r"inv-\d{8}-[0-9A-HJKMNP-TV-Z]{26}", generate_id("inv"))
+    assert re.fullmatch(r"skill-[0-9A-HJKMNP-TV-Z]{26}", generate_id("skill", date_part=False))
+
+
+def test_setup_logging_is_idempotent(tmp_path):
+    """Test that repeated setup adds no handlers and each record is written once."""
+    from core.utils import setup_logging, stop_logging
+    
+    log_file = tmp_path / "test.log"
+    for _ in range(3):
+        logger = setup_logging("test.idempotent", log_file, "INFO")
+    
+    assert len(logger.handlers) == 1
+    
+    logger.info("saved %s records", 3)
+    logger.debug("not %s", "written")
+    setup_logging("test.other", None, "INFO").info("other logger")
+    stop_logging()
+    
+    lines = log_file.read_text().splitlines()
+    assert len(lines) == 1
+    assert lines[0].endswith("test.idempotent - INFO - saved 3 records")
@@ -2,11 +2,12 @@
 Tests for Work Server - Task Management MCP Server
 """
 
+import json
 import os
 import pytest
 import tempfile
 import yaml
-from datetime import date
+from datetime import date, timedelta
 from pathlib import Path
 
 # Import work server functions
@@ -30,6 +31,9 @@ def temp_vault(monkeypatch, tmp_path):
     work_server.TASKS_DIR = os.path.join(str(vault_path), "03-Tasks")
     work_server.TASKS_FILE = os.path.join(work_server.TASKS_DIR, "tasks.yaml")
     work_server.HOURS_FILE = os.path.join(work_server.TASKS_DIR, "hours.yaml")
+    work_server.SEQUENCES_FILE = os.path.join(work_server.TASKS_DIR, "sequences.yaml")
+    work_server.HOURS_DIR = os.path.join(work_server.TASKS_DIR, "hours")
+    work_server.ROLLUPS_FILE = os.path.join(work_server.TASKS_DIR, "hours_rollups.json")
     
     # Ensure directories exist
     work_server._ensure_dirs()
@@ -42,22 +46,19 @@ def temp_vault(monkeypatch, tmp_path):
 @pytest.fixture
 def clean_tasks(temp_vault):
     """Ensure clean task storage for each test."""
-    tasks_file = work_server.TASKS_FILE
-    hours_file = work_server.HOURS_FILE
+    storage_files = [work_server.TASKS_FILE, work_server.HOURS_FILE, work_server.SEQUENCES_FILE]
     
     # Clear any existing data
-    if os.path.exists(tasks_file):
-        os.remove(tasks_file)
-    if os.path.exists(hours_file):
-        os.remove(hours_file)
+    for path in storage_files:
+        if os.path.exists(path):
+            os.remove(path)
     
     yield
     
     # Cleanup
-    if os.path.exists(tasks_file):
-        os.remove(tasks_file)
-    if os.path.exists(hours_file):
-        os.remove(hours_file)
+    for path in storage_files:
+        if os.path.exists(path):
+            os.remove(path)
 
 
 def test_create_task_basic(clean_tasks):
@@ -79,6 +80,23 @@ def test_create_task_basic(clean_tasks):
     assert result["task"]["tag"] == "[BILLABLE]"
 
 
+def test_task_ids_use_daily_counter(clean_tasks):
+    """Test that task numbers continue from the stored counter."""
+    today = date.today().strftime("%Y%m%d")
+    first = work_server.create_task("First", billable=False)
+    second = work_server.create_task("Second", billable=False)
+    
+    assert first["task_id"] == f"task-{today}-001"
+    assert second["task_id"] == f"task-{today}-002"
+    
+    # Numbers are not reused even if the latest task disappears
+    tasks = work_server._load_tasks()
+    del tasks[second["task_id"]]
+    work_server._save_tasks(tasks)
+    
+    assert work_server.create_task("Third", billable=False)["task_id"] == f"task-{today}-003"
+
+
 def test_create_task_requires_client_for_billable(clean_tasks):
     """Test that billable tasks require a client."""
     result = work_server.create_task(
@@ -132,6 +150,18 @@ def test_create_task_duplicate_detection(clean_tasks):
     assert "duplicate" in result["error"].lower()
 
 
+def test_duplicate_allowed_after_completion(clean_tasks):
+    """Test that only open tasks take part in duplicate detection."""
+    first = work_server.create_task("Deploy", billable=True, client="ClientA")
+    work_server.complete_task(first["task_id"])
+    
+    second = work_server.create_task("deploy", billable=True, client="ClientA")
+    assert "task_id" in second
+    
+    reopened = work_server.update_task(first["task_id"], status="active")
+    assert "error" in reopened
+
+
 def test_list_tasks_empty(clean_tasks):
     """Test listing tasks when none exist."""
     result = work_server.list_tasks()
@@ -276,6 +306,178 @@ def test_get_billable_summary_by_client(clean_tasks):
     assert "ClientB" not in summary["by_client"]
 
 
+def test_get_billable_summary_period_bounds(clean_tasks):
+    """Test that hours land in monthly ledger files and are summed by period."""
+    task = work_server.create_task("Backfill", billable=True, client="ClientA")
+    today = date.today()
+    last_month = today.replace(day=1) - timedelta(days=1)
+    
+    work_server.log_hours(task["task_id"], 2.0, work_date=today.isoformat())
+    work_server.log_hours(task["task_id"], 3.0, work_date=last_month.isoformat())
+    work_server.log_hours(task["task_id"], 4.0, work_date=last_month.replace(day=1).isoformat())
+    
+    assert sorted(os.listdir(work_server.HOURS_DIR)) == [
+        f"hours-{last_month:%Y-%m}.jsonl",
+        f"hours-{today:%Y-%m}.jsonl"
+    ]
+    
+    assert work_server.get_billable_summary(period="current_month")["total_billable_hours"] == 2.0
+    assert work_server.get_billable_summary(period="last_month")["total_billable_hours"] == 7.0
+    assert work_server.get_billable_summary(period="all")["total_billable_hours"] == 9.0
+    assert work_server.list_tasks()["tasks"][task["task_id"]]["logged_hours"] == 9.0
+
+
+def test_hours_yaml_migrates_to_ledger(clean_tasks):
+    """Test that entries in a legacy hours.yaml move to the ledger once."""
+    task = work_server.create_task("Legacy", billable=True, client="ClientA")
+    today = date.today().isoformat()
+    with open(work_server.HOURS_FILE, "w") as f:
+        yaml.safe_dump({"entries": [
+            {"task_id": task["task_id"], "hours": 5.0, "work_date": today,
+             "client": "ClientA", "billable": True}
+        ]}, f)
+    
+    result = work_server.log_hours(task["task_id"], 1.0)
+    
+    assert result["total_hours_on_task"] == 6.0
+    assert not os.path.exists(work_server.HOURS_FILE)
+    assert work_server.get_billable_summary(period="current_month")["total_billable_hours"] == 6.0
+
+
+def test_billable_rollups_follow_the_ledger(clean_tasks):
+    """Test that rollups are maintained by log_hours and rebuilt after outside edits."""
+    task_a = work_server.create_task("Build", billable=True, client="ClientA")
+    task_b = work_server.create_task("Review", billable=True, client="ClientA")
+    work_server.log_hours(task_a["task_id"], 2.0)
+    work_server.log_hours(task_b["task_id"], 3.0)
+    
+    summary = work_server.get_billable_summary(period="current_quarter")
+    assert summary["by_client"]["ClientA"]["hours"] == 5.0
+    assert summary["by_client"]["ClientA"]["unique_tasks"] == 2
+    assert summary["entry_count"] == 2
+    
+    # An entry appended by hand is picked up on the next call
+    today = date.today().isoformat()
+    with open(os.path.join(work_server.HOURS_DIR, f"hours-{today[:7]}.jsonl"), "a") as f:
+        f.write(json.dumps({"task_id": task_a["task_id"], "hours": 1.5, "work_date": today,
+                            "client": "ClientA", "billable": True}) + "\n")
+    
+    assert work_server.get_billable_summary(period="all")["total_billable_hours"] == 6.5
+    
+    os.remove(work_server.ROLLUPS_FILE)
+    assert work_server.rebuild_rollups()["entries"] == 3
+    assert work_server.get_billable_summary()["total_billable_hours"] == 6.5
+
+
+def test_log_hours_rejects_invalid_date(clean_tasks):
+    """Test that log_hours validates the work date."""
+    task = work_server.create_task("Dated", billable=False)
+    
+    result = work_server.log_hours(task["task_id"], 1.0, work_date="yesterday")
+    
+    assert "error" in result
+
+
+def test_log_hours_normalizes_basic_iso_dates(clean_tasks):
+    """Test that compact and week dates are stored as YYYY-MM-DD."""
+    task = work_server.create_task("Compact", billable=True, client="ClientA")
+    today = date.today()
+    
+    work_server.log_hours(task["task_id"], 1.0, work_date=today.strftime("%Y%m%d"))
+    year, week, weekday = today.isocalendar()
+    work_server.log_hours(task["task_id"], 2.0, work_date=f"{year}-W{week:02d}-{weekday}")
+    
+    assert os.listdir(work_server.HOURS_DIR) == [f"hours-{today:%Y-%m}.jsonl"]
+    assert work_server.get_billable_summary(period="current_month")["total_billable_hours"] == 3.0
+
+
+def test_task_store_cached_until_file_changes(clean_tasks, monkeypatch):
+    """Test that tasks.yaml is parsed once and again only after an outside change."""
+    work_server.create_task("Cached", billable=False)
+    
+    parses = []
+    real_load = work_server.yaml.load
+    monkeypatch.setattr(work_server.yaml, "load", lambda *a, **kw: parses.append(1) or real_load(*a, **kw))
+    
+    work_server.list_tasks()
+    work_server.list_tasks()
+    assert parses == []
+    
+    # Another process rewrites the file
+    with open(work_server.TASKS_FILE, "w") as f:
+        yaml.safe_dump({"task-x": {"title": "External", "status": "active"}}, f)
+    
+    assert list(work_server.list_tasks()["tasks"]) == ["task-x"]
+    assert parses == [1]
+
+
+def test_update_task_error_leaves_task_unchanged(clean_tasks):
+    """Test that a rejected update does not half-apply to the cached task."""
+    task_id = work_server.create_task("Stable", billable=False, priority="P2")["task_id"]
+    
+    result = work_server.update_task(task_id, priority="P1", status="unknown")
+    
+    assert "error" in result
+    assert work_server.list_tasks()["tasks"][task_id]["priority"] == "P2"
+
+
+def test_concurrent_writers_lose_nothing(clean_tasks):
+    """Test that tasks and hours written from many threads are all kept."""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    def create_and_log(i):
+        task_id = work_server.create_task(f"Task {i}", client="Acme", priority="P2")["task_id"]
+        work_server.log_hours(task_id, 1.0)
+        return task_id
+    
+    with ThreadPoolExecutor(8) as pool:
+        task_ids = list(pool.map(create_and_log, range(40)))
+    
+    assert len(set(task_ids)) == 40
+    assert set(work_server.list_tasks()["tasks"]) == set(task_ids)
+    assert work_server.get_billable_summary(period="all")["entry_count"] == 40
+
+
+def test_batch_writes_tasks_once(clean_tasks):
+    """Test that a batch defers tasks.yaml writes and keeps its index current."""
+    first = work_server.create_task("Before", billable=False, priority="P2")["task_id"]
+    signature = work_server._file_signature(work_server.TASKS_FILE)
+    
+    with work_server.batch():
+        task_id = work_server.create_task("Review", client="Acme", priority="P2")["task_id"]
+        work_server.log_hours(task_id, 2.0)
+        work_server.complete_task(task_id)
+        again = work_server.create_task("Review", client="Acme", priority="P2")
+        
+        assert "error" not in again
+        assert work_server._file_signature(work_server.TASKS_FILE) == signature
+    
+    tasks = yaml.safe_load(open(work_server.TASKS_FILE))
+    assert set(tasks) == {first, task_id, again["task_id"]}
+    assert tasks[task_id]["status"] == "completed"
+    assert work_server.get_billable_summary(period="all")["total_billable_hours"] == 2.0
+
+
+def test_failed_batch_writes_nothing(clean_tasks):
+    """Test that a batch that raises leaves tasks, hours and rollups as they were."""
+    first = work_server.create_task("Before", billable=True, client="Acme")["task_id"]
+    work_server.log_hours(first, 1.0)
+    tasks_before = open(work_server.TASKS_FILE).read()
+    
+    with pytest.raises(RuntimeError):
+        with work_server.batch():
+            work_server.create_task("Doomed", billable=True, client="Acme")
+            work_server.log_hours(first, 2.0)
+            work_server.log_hours(first, 3.0, work_date="2020-01-15")
+            raise RuntimeError("abort")
+    
+    assert open(work_server.TASKS_FILE).read() == tasks_before
+    assert list(work_server.list_tasks()["tasks"]) == [first]
+    assert os.listdir(work_server.HOURS_DIR) == [f"hours-{date.today():%Y-%m}.jsonl"]
+    assert work_server.get_billable_summary(period="all")["total_billable_hours"] == 1.0
+    assert "error" not in work_server.create_task("Doomed", billable=True, client="Acme")
+
+
 def test_update_task(clean_tasks):
     """Test updating task fields."""
     # Create a task
@@ -315,6 +517,20 @@ def test_update_task_to_p0_respects_limit(clean_tasks):
     assert "max" in result["error"].lower()
 
 
+def test_get_stats_counts_tool_io(clean_tasks):
+    """Test that work tools record calls, bytes and saves."""
+    from core.metrics import registry
+    registry.reset()
+    
+    task_id = work_server.create_task("Measured", client="Acme", priority="P2")["task_id"]
+    work_server.log_hours(task_id, 1.0)
+    
+    tools = work_server.get_stats()["tools"]
+    assert tools["create_task"]["calls"] == 1
+    assert tools["create_task"]["saves"] == 2
+    assert tools["log_hours"]["bytes_written"] > 0
+
+
 def test_get_server_info():
     """Test getting server information."""
     info = work_server.get_server_info()